@@ -1,4 +1,8 @@
-from .mapping import Attr, ExpandedType, JsonMappedModel  # NOQA
+from .mapping import Attr, ExpandedType, JsonMappedModel, TaggedUnion  # NOQA
+from .mapping import RawJson  # NOQA
 from .transmute import register_type, remove_type  # NOQA
 from .transmute import AlchemizeError, AbstractBaseTransmuter, JsonTransmuter  # NOQA
+from .binary import MsgPackTransmuter  # NOQA
+from .cache import DecodeCache  # NOQA
 from .helpers import JsonListModel, JsonModel  # NOQA
+from .helpers import JsonColumnarListModel, JsonLazyListModel  # NOQA
@@ -0,0 +1,349 @@
+"""
+Copyright 2014 John Vrbanac
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import array
+import collections
+
+import six
+
+from alchemize.helpers import NUMERIC_TYPECODES, _array_value
+from alchemize.mapping import (
+    MAPPING_CACHES,
+    RawJson,
+    _get_chain_value,
+    _get_leaf_type,
+    construct_model,
+    get_item_type,
+    get_key_path_index,
+    is_mapped_model,
+)
+from alchemize.transmute import AlchemizeError, JsonTransmuter
+
+ColumnPath = collections.namedtuple(
+    'ColumnPath',
+    ['path', 'keys', 'chain', 'typecode', 'through_items']
+)
+
+COLUMN_PLANS = {}
+MAPPING_CACHES.append(COLUMN_PLANS)
+
+
+def get_column_plan(model_type, paths, sep='/'):
+    """Returns the memoized plan of a set of key paths of a model type
+
+    :param model_type: A type that extends the JsonMappedModel base.
+    :param paths: Key paths as returned by get_key_paths.
+    :param sep: Separator used to join the keys together
+    :return: List of :class:`ColumnPath` tuples, with the JSON keys and
+        chain of Attr objects of each path, and if the path goes through a
+        list (or dict) of models.
+    """
+    paths = tuple(paths)
+    plan = COLUMN_PLANS.get((model_type, paths, sep))
+
+    if plan is None:
+        index = get_key_path_index(model_type, sep)
+        plan = []
+
+        for path in paths:
+            chain = index[path]
+            leaf_type = chain[-1].type
+            plan.append(ColumnPath(
+                path,
+                tuple(path.split(sep)[1:]),
+                chain,
+                NUMERIC_TYPECODES.get(leaf_type)
+                if isinstance(leaf_type, type) else None,
+                any(isinstance(attr.type, (list, dict))
+                    for attr in chain[:-1]),
+            ))
+
+        COLUMN_PLANS[(model_type, paths, sep)] = plan
+
+    return plan
+
+
+def _map_item_values(value, attr_type, func):
+    """Maps a function over the items of a (nested) list or dict type."""
+    if value is None:
+        return None
+
+    elif isinstance(attr_type, dict):
+        if not isinstance(value, dict):
+            return None
+
+        item_type = get_item_type(attr_type)
+        return dict(
+            (key, _map_item_values(item, item_type, func))
+            for key, item in value.items()
+        )
+
+    elif isinstance(attr_type, list) and len(attr_type) == 1:
+        if not isinstance(value, list):
+            return None
+
+        return [_map_item_values(item, attr_type[0], func) for item in value]
+
+    return func(value)
+
+
+def _get_row_value(row, keys, chain):
+    for idx, key in enumerate(keys):
+        if not isinstance(row, dict):
+            return None
+
+        row = row.get(key)
+        attr_type = chain[idx].type
+
+        # Paths through lists (or dicts) of objects resolve for each item
+        if idx < len(keys) - 1 and isinstance(attr_type, (list, dict)):
+            rest_keys = keys[idx + 1:]
+            rest_chain = chain[idx + 1:]
+            return _map_item_values(
+                row,
+                attr_type,
+                lambda item: _get_row_value(item, rest_keys, rest_chain)
+            )
+
+    return row
+
+
+def _read_column(column, key, name, raw):
+    if raw:
+        return [item.get(key) if isinstance(item, dict) else None
+                for item in column]
+
+    return [getattr(item, name, None) for item in column]
+
+
+def _to_array(column, typecode, value_type):
+    try:
+        return array.array(typecode, [
+            _array_value(typecode, value_type, value) for value in column
+        ])
+    except (TypeError, OverflowError):
+        return column
+
+
+def pluck(items, model_type, paths, sep='/', arrays=False):
+    """Extracts one column of values per key path from a batch of records
+
+    Records can either be models or decoded JSON objects (dicts), which are
+    read as-is. Paths that go through a list (or dict) of models hold a list
+    (or dict) with a value for each of the items.
+
+    :param items: Sequence of models or decoded JSON objects
+    :param model_type: The mapped model type of the records
+    :param paths: Key paths as returned by get_key_paths
+    :param sep: Separator used to join the keys together
+    :param arrays: Boolean value to return ``array.array`` columns for
+        ``int`` and ``float`` attributes. Columns fall back to a list when a
+        value doesn't exactly match the mapped type (e.g. ``None``), while
+        whole numbers are stored as floats in ``float`` columns.
+    :return: Ordered dictionary of key paths to their column of values
+
+    .. note::
+
+        Values plucked from decoded JSON objects are in their JSON form
+        (e.g. a string for a ``UUID`` attribute), which
+        :func:`from_columns` converts back.
+    """
+    plan = get_column_plan(model_type, paths, sep)
+    items = items if isinstance(items, list) else list(items)
+    raw = bool(items) and isinstance(items[0], dict)
+    columns = collections.OrderedDict()
+    parents = {}
+
+    for path, keys, chain, typecode, through_items in plan:
+        if through_items and raw:
+            column = [_get_row_value(item, keys, chain) for item in items]
+
+        elif through_items:
+            column = [_get_chain_value(item, chain, None) for item in items]
+
+        else:
+            # PERF: Paths are read a column at a time, and the columns of
+            # child models are shared by the paths below them.
+            column = items
+            for depth in range(len(chain) - 1):
+                parent = parents.get(chain[:depth + 1])
+                if parent is None:
+                    parent = parents[chain[:depth + 1]] = _read_column(
+                        column, keys[depth], chain[depth].name, raw
+                    )
+                column = parent
+
+            column = _read_column(column, keys[-1], chain[-1].name, raw)
+
+        if arrays and typecode:
+            column = _to_array(column, typecode, chain[-1].type)
+
+        columns[path] = column
+
+    return columns
+
+
+def _get_converter(attr, transmuter, coerce_values):
+    """Returns a function that converts the values of a leaf attribute the
+    same way that the transmuter decodes them, or None if there's nothing
+    to convert.
+    """
+    leaf_type = _get_leaf_type(attr.type)
+    expanded = transmuter.__type_registry__.snapshot().lookup(leaf_type)
+    should_coerce = coerce_values if attr.coerce is None else attr.coerce
+
+    if leaf_type is RawJson:
+        def convert(value):
+            if isinstance(value, RawJson):
+                return value
+            return RawJson.from_value(value)
+
+    elif expanded:
+        def convert(value):
+            if expanded.check_type(value):
+                return value
+            return expanded.deserialize(leaf_type, value)
+
+    elif should_coerce and isinstance(leaf_type, type):
+        convert = leaf_type
+
+    # Same as with array columns, whole numbers are converted to floats
+    elif leaf_type is float:
+        def convert(value):
+            if type(value) in six.integer_types:
+                return float(value)
+            return value
+
+    else:
+        return None
+
+    if isinstance(attr.type, (list, dict)):
+        return lambda value: _map_item_values(value, attr.type, convert)
+
+    return convert
+
+
+def _fill_items(existing, attr_type, value, chain, created, convert):
+    """Sets a value through a (list or dict of) child models, which are
+    created when they're missing.
+    """
+    if isinstance(attr_type, dict):
+        existing = existing if isinstance(existing, dict) else {}
+        item_type = get_item_type(attr_type)
+
+        for key, item in value.items():
+            if item is not None:
+                existing[key] = _fill_items(existing.get(key), item_type,
+                                            item, chain, created, convert)
+
+        return existing
+
+    elif isinstance(attr_type, list):
+        existing = existing if isinstance(existing, list) else []
+
+        if len(existing) < len(value):
+            existing.extend([None] * (len(value) - len(existing)))
+
+        for idx, item in enumerate(value):
+            if item is not None:
+                existing[idx] = _fill_items(existing[idx], attr_type[0],
+                                            item, chain, created, convert)
+
+        return existing
+
+    if existing is None:
+        existing = construct_model(attr_type)
+        created.append(existing)
+
+    _set_row_value(existing, chain, value, created, convert)
+    return existing
+
+
+def _set_row_value(model, chain, value, created, convert):
+    attr = chain[0]
+
+    if len(chain) == 1:
+        setattr(model, attr.name, convert(value) if convert else value)
+        return
+
+    child = getattr(model, attr.name, None)
+    result = _fill_items(child, attr.type, value, chain[1:], created,
+                         convert)
+    if result is not child:
+        setattr(model, attr.name, result)
+
+
+def from_columns(columns, model_type, sep='/', coerce_values=False,
+                 transmuter=JsonTransmuter):
+    """Builds a batch of models from columns of values
+
+    This is the reverse of :func:`pluck`. Child models along the key paths
+    are created as needed, while ``None`` values are left unset. Values in
+    their JSON form are converted the same way that the transmuter decodes
+    them, and whole numbers are stored as floats in ``float`` attributes.
+
+    :param columns: Dictionary of key paths to their column of values
+    :param model_type: The mapped model type to build
+    :param sep: Separator used to join the keys together
+    :param coerce_values: Boolean value to coerce values with their mapped
+        type.
+    :param transmuter: The transmuter whose types are used to convert
+        the values.
+    :return: List of models
+    """
+    plan = get_column_plan(model_type, columns, sep)
+    lengths = set(len(column) for column in columns.values())
+
+    if len(lengths) > 1:
+        raise AlchemizeError('All columns must have the same length')
+
+    for entry in plan:
+        for attr in entry.chain[:-1]:
+            if not is_mapped_model(_get_leaf_type(attr.type)):
+                raise AlchemizeError(
+                    'Unable to build the models of "{0}"'.format(entry.path)
+                )
+
+    models = [construct_model(model_type) for _ in range(lengths.pop())
+              ] if lengths else []
+    created = []
+
+    for path, _, chain, _, _ in plan:
+        column = columns[path]
+        convert = _get_converter(chain[-1], transmuter, coerce_values)
+
+        # PERF: Top-level paths are assigned without walking the chain
+        if len(chain) == 1:
+            name = chain[0].name
+            for model, value in zip(models, column):
+                if value is not None:
+                    setattr(model, name, convert(value) if convert else value)
+            continue
+
+        for model, value in zip(models, column):
+            if value is not None:
+                _set_row_value(model, chain, value, created, convert)
+
+    # Children are always created after their parents, so walking backwards
+    # guarantees that children are ready before their parent.
+    for obj in reversed(created):
+        if type(obj).__fast_construct__:
+            obj.__post_decode__()
+
+    if model_type.__fast_construct__:
+        for model in models:
+            model.__post_decode__()
+
+    return models
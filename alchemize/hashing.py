@@ -0,0 +1,299 @@
+"""
+Copyright 2014 John Vrbanac
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import hashlib
+import operator
+import weakref
+from itertools import chain
+
+import six
+
+from alchemize.mapping import (
+    MAPPING_CACHES,
+    BaseMappedModel,
+    RawJson,
+    _unfrozen_type,
+    get_mapping_fingerprint,
+    get_normalized_map,
+)
+from alchemize.transmute import TYPE_REGISTRY
+
+# Values of these types are canonical as they are
+SIMPLE_TYPES = frozenset(
+    (type(None), bool, float, six.binary_type)
+    + six.integer_types
+    + six.string_types
+    + (six.text_type,)
+)
+
+FINGERPRINT_PLANS = {}
+FROZEN_FINGERPRINTS = {}
+MAPPING_CACHES.extend((FINGERPRINT_PLANS, FROZEN_FINGERPRINTS))
+
+
+def _get_fingerprint_plan(model_type):
+    """Returns the attribute names of a model in the order of its sorted
+    keys, a function that reads them as a tuple (which raises an
+    AttributeError when one of them isn't set) and the tag that its content
+    starts with.
+    """
+    plan = FINGERPRINT_PLANS.get(model_type)
+
+    if plan is None:
+        key_map = get_normalized_map(model_type)
+        names = []
+
+        for key in sorted(key_map):
+            if key_map[key].name not in names:
+                names.append(key_map[key].name)
+
+        if len(names) > 1:
+            getter = operator.attrgetter(*names)
+        else:
+            def getter(model, names=names):
+                return tuple([getattr(model, name) for name in names])
+
+        plan = FINGERPRINT_PLANS[model_type] = (
+            names,
+            getter,
+            'M' + get_mapping_fingerprint(model_type),
+        )
+
+    return plan
+
+
+class _ModelEnd(object):
+    """Marks the end of a model's content on the stack."""
+    __slots__ = ('model', 'key', 'start')
+
+    def __init__(self, model, key, start):
+        self.model = model
+        self.key = key
+        self.start = start
+
+
+def _append_items(tag, items, parts, stack):
+    """Appends the repr of a list of values, with ``Ellipsis`` in place of
+    the values that aren't simple, which are pushed onto the stack so that
+    their content follows in order. Returns if any of them were pushed.
+    """
+    if SIMPLE_TYPES.issuperset(map(type, items)):
+        parts.append(tag + repr(items))
+        return False
+
+    stack.extend(reversed([
+        item for item in items if type(item) not in SIMPLE_TYPES
+    ]))
+
+    marked = [
+        item if type(item) in SIMPLE_TYPES else Ellipsis for item in items
+    ]
+    parts.append(tag + repr(
+        tuple(marked) if type(items) is tuple else marked
+    ))
+    return True
+
+
+def _append_rows(items, parts):
+    """Appends a list of models of the same type that only hold simple
+    values in one go, or returns False if the list doesn't qualify.
+    """
+    if not items or not isinstance(items[0], BaseMappedModel):
+        return False
+
+    item_types = set(map(type, items))
+    if len(item_types) != 1:
+        return False
+
+    model_type = item_types.pop()
+    if (not issubclass(model_type, BaseMappedModel)
+            or model_type.__frozen__):
+        return False
+
+    _, getter, tag = (FINGERPRINT_PLANS.get(model_type)
+                      or _get_fingerprint_plan(model_type))
+
+    try:
+        rows = list(map(getter, items))
+    except AttributeError:
+        return False
+
+    if not SIMPLE_TYPES.issuperset(map(type, chain.from_iterable(rows))):
+        return False
+
+    parts.append('L' + repr([Ellipsis] * len(rows)))
+    parts.extend([tag + repr(row) for row in rows])
+    return True
+
+
+def _sorted_items(value):
+    try:
+        return sorted(value.items())
+    except TypeError:
+        return sorted(value.items(), key=lambda item: repr(item[0]))
+
+
+def _get_memo(model):
+    entry = FROZEN_FINGERPRINTS.get(id(model))
+    if entry is not None and entry[0]() is model:
+        return entry[1]
+
+
+def _set_memo(model, memo):
+    # Kept out of the model itself, so it's never copied or pickled along
+    key = id(model)
+
+    try:
+        ref = weakref.ref(model,
+                          lambda _: FROZEN_FINGERPRINTS.pop(key, None))
+    except TypeError:
+        return
+
+    FROZEN_FINGERPRINTS[key] = (ref, memo)
+
+
+def _end_model(model, key, start, parts, spans):
+    spans[key] = (start, len(parts))
+
+    if model.__frozen__:
+        _set_memo(model, [parts, start, len(parts), None])
+
+
+def _walk_content(root, parts, lookup):
+    """Appends the content of a model and its children to a list of text
+    parts, without recursion.
+
+    Child models are written in place. Models that appear more than once
+    reuse the parts of their first appearance, and frozen models reuse the
+    parts that they were first written with (``[parts, start, end,
+    digest]``), so neither is walked again.
+    """
+    append = parts.append
+    stack = [root]
+    spans = {}
+    opened = {}
+
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+
+        if value_type is _ModelEnd:
+            del opened[value.key]
+            _end_model(value.model, value.key, value.start, parts, spans)
+
+        elif value_type in SIMPLE_TYPES:
+            append(repr(value))
+
+        elif isinstance(value, BaseMappedModel):
+            key = id(value)
+            span = spans.get(key)
+
+            if span is not None:
+                parts.extend(parts[span[0]:span[1]])
+                continue
+
+            elif key in opened:
+                # References back to a model that contains itself
+                append('@{0}'.format(len(opened) - opened[key]))
+                continue
+
+            if value.__frozen__:
+                memo = _get_memo(value)
+                if memo is not None:
+                    parts.extend(memo[0][memo[1]:memo[2]])
+                    continue
+
+                value_type = _unfrozen_type(value_type)
+
+            names, getter, tag = (FINGERPRINT_PLANS.get(value_type)
+                                  or _get_fingerprint_plan(value_type))
+
+            try:
+                values = getter(value)
+            except AttributeError:
+                values = tuple([getattr(value, name, None) for name in names])
+
+            # The end of the model is pushed below its nested values, but
+            # models without any end right away.
+            start = len(parts)
+            stack.append(None)
+            depth = len(stack) - 1
+
+            if _append_items(tag, values, parts, stack):
+                stack[depth] = _ModelEnd(value, key, start)
+                opened[key] = len(opened)
+            else:
+                stack.pop()
+                _end_model(value, key, start, parts, spans)
+
+        elif isinstance(value, list):
+            # PERF: Lists of plain child models are written as rows
+            if not _append_rows(value, parts):
+                _append_items('L', value, parts, stack)
+
+        elif value_type is tuple:
+            _append_items('L', list(value), parts, stack)
+
+        elif isinstance(value, dict):
+            items = []
+            for item in _sorted_items(value):
+                items.extend(item)
+
+            _append_items('D', items, parts, stack)
+
+        elif isinstance(value, RawJson):
+            stack.append(value.value)
+
+        else:
+            # Other types are hashed by their serialized form where possible,
+            # as their repr isn't guaranteed to cover all of their content.
+            expanded = lookup(value)
+            if expanded:
+                append('X' + repr(value_type.__name__))
+                stack.append(expanded.serialize(value))
+            else:
+                append('O' + repr((value_type.__name__, repr(value))))
+
+
+def _digest(parts):
+    return hashlib.sha256(''.join(parts).encode('utf-8')).hexdigest()
+
+
+def fingerprint(model):
+    """Returns a hash of the content of a model
+
+    Mapped values are hashed in the order of their sorted keys, without
+    encoding the model. Models with equal content have the same fingerprint,
+    regardless of the order of dict keys. The content of the model and its
+    children is fed into a single hash, while child models that appear more
+    than once and frozen models are only walked once.
+
+    :param model: Mapped Model instance
+    :return: Hex string fingerprint
+    """
+    memo = _get_memo(model) if model.__frozen__ else None
+
+    if memo is None:
+        parts = []
+        _walk_content(model, parts, TYPE_REGISTRY.snapshot().lookup)
+
+        memo = _get_memo(model) if model.__frozen__ else None
+        if memo is None:
+            return _digest(parts)
+
+    if memo[3] is None:
+        memo[3] = _digest(memo[0][memo[1]:memo[2]])
+
+    return memo[3]
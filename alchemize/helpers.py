@@ -1,4 +1,18 @@
-from alchemize import JsonMappedModel, JsonTransmuter
+import array
+import json
+
+import six
+from six.moves import collections_abc
+
+from alchemize import ExpandedType, JsonMappedModel, JsonTransmuter
+from alchemize.binary import MsgPackTransmuter
+from alchemize.mapping import (
+    clone,
+    get_mapping_fingerprint,
+    get_normalized_map,
+    is_mapped_model,
+)
+from alchemize.transmute import AlchemizeError, register_type
 
 
 class JsonModel(JsonMappedModel):
@@ -32,6 +46,18 @@ class JsonModel(JsonMappedModel):
         """Converts the model into a dictionary."""
         return self.transmute_to(serialize_all=serialize_all)
 
+    def as_msgpack(self, serialize_all=False):
+        """Converts the model into MessagePack compatible bytes."""
+        return MsgPackTransmuter.transmute_to(
+            self,
+            serialize_all=serialize_all
+        )
+
+    @classmethod
+    def from_msgpack(cls, data, **transmute_options):
+        """Creates a new instance of the model from MessagePack bytes."""
+        return MsgPackTransmuter.transmute_from(data, cls, **transmute_options)
+
     @classmethod
     def from_json(cls, data, **transmute_options):
         """Creates a new instance of the model from a JSON string."""
@@ -42,6 +68,13 @@ class JsonModel(JsonMappedModel):
         """Creates a new instance of the model from a dictionary."""
         return cls.transmute_from(data, **transmute_options)
 
+    def clone(self, deep=False):
+        """Creates a copy of the model's mapped attributes.
+
+        See :func:`alchemize.mapping.clone` for details.
+        """
+        return clone(self, deep=deep)
+
     def update(self, **attrs):
         """Updates object attributes with specified kwarg values."""
         for key, val in attrs.items():
@@ -71,6 +104,65 @@ class JsonListModel(JsonModel):
         self.collection = []
         super(JsonListModel, self).__init__(**attrs)
 
+    def __post_decode__(self):
+        if not hasattr(self, 'collection'):
+            self.collection = []
+
+    @classmethod
+    def _get_collection_mapping(cls):
+        for key, attr in get_normalized_map(cls).items():
+            if (attr.name == 'collection'
+                    and isinstance(attr.type, list)
+                    and is_mapped_model(attr.type[0])):
+                return key, attr
+
+        raise AlchemizeError(
+            'The list model requires a [Model] mapping to "collection"'
+        )
+
+    @classmethod
+    def _transmute_from_rows(cls, data, **options):
+        """Transmutes everything but the collection, which is returned in
+        its decoded JSON form along with its mapping attribute.
+        """
+        decoder = options.pop('decoder', None) or json
+        decoder_kwargs = options.pop('decoder_kwargs', None) or {}
+        key, attr = cls._get_collection_mapping()
+
+        json_dict = data
+        if isinstance(data, six.string_types):
+            json_dict = decoder.loads(data, **decoder_kwargs)
+
+        # Compact data holds the values of the mapping by their position
+        compact = options.get('compact', False)
+        wrapped_name = None if compact else cls.__wrapped_attr_name__
+
+        if compact:
+            values = list(JsonTransmuter._unwrap_compact(
+                json_dict, cls, decoder, decoder_kwargs
+            ))
+            key = sorted(get_normalized_map(cls)).index(key)
+            rows = values[key]
+        else:
+            if wrapped_name:
+                json_dict = json_dict.get(wrapped_name)
+
+            values = dict(json_dict)
+            rows = values.get(key)
+
+        if rows is not None:
+            values[key] = []
+
+        if compact:
+            json_dict = [get_mapping_fingerprint(cls), values]
+        elif wrapped_name:
+            json_dict = {wrapped_name: values}
+        else:
+            json_dict = values
+
+        model = JsonTransmuter.transmute_from(json_dict, cls, **options)
+        return model, rows, attr
+
     def __iter__(self):
         """Iterates the collection."""
         for item in self.collection:
@@ -105,3 +197,521 @@ class JsonListModel(JsonModel):
     def extend(self, items):
         """Appends multiple items to the collection."""
         return self.collection.extend(items)
+
+
+class _ListModelTransmuter(object):
+    """Decodes list models through their own transmute_from, so that a
+    DecodeCache is consulted before their payload is parsed.
+    """
+
+    @staticmethod
+    def transmute_from(data, mapped_model_type, **options):
+        return mapped_model_type.transmute_from(data, **options)
+
+
+def _numeric_typecodes():
+    typecodes = getattr(array, 'typecodes', 'l')
+    int_code = 'q' if 'q' in typecodes else 'l'
+
+    codes = {float: 'd'}
+    for int_type in six.integer_types:
+        codes[int_type] = int_code
+
+    return codes
+
+
+NUMERIC_TYPECODES = _numeric_typecodes()
+INTEGER_LIMITS = dict(
+    (code, 1 << (array.array(code).itemsize * 8 - 1))
+    for code in set(NUMERIC_TYPECODES.values())
+    if code != 'd'
+)
+
+
+def _array_value(typecode, value_type, val):
+    """Returns a value in the form that's stored in an array of a numeric
+    type. Whole numbers are stored as floats in float arrays.
+
+    Raises a TypeError or an OverflowError for values that don't match the
+    type of the array, or that are out of its range.
+    """
+    if type(val) is not value_type:
+        if typecode == 'd' and type(val) in six.integer_types:
+            return float(val)
+
+        raise TypeError('Unable to store {0!r} in the array'.format(val))
+
+    limit = INTEGER_LIMITS.get(typecode)
+    if limit and not -limit <= val < limit:
+        raise OverflowError('{0!r} is out of range'.format(val))
+
+    return val
+
+
+class ColumnarCollection(collections_abc.MutableSequence):
+    """Sequence of child models stored as one column per mapped attribute.
+
+    Numeric attributes (``int`` and ``float``) are held in ``array.array``
+    columns and every other attribute in a plain list. Values are kept in
+    their JSON form and row models are only materialized on access, so
+    changing a returned row does not update the collection; assign the row
+    back to its index instead. Rows of child types with a
+    ``__wrapped_attr_name__`` are unwrapped when they're stored and wrapped
+    again when they're built or encoded.
+
+    .. note::
+
+        A numeric column falls back to a plain list as soon as it receives
+        a value that doesn't exactly match its mapped type (e.g. ``None``)
+        or that is out of the range of the array. Whole numbers in ``float``
+        columns are stored as floats.
+
+    """
+
+    def __init__(self, child_type, coerce_values=False):
+        self.child_type = child_type
+        self.coerce_values = coerce_values
+        self._wrapped_name = child_type.__wrapped_attr_name__
+        self._length = 0
+        self._keys = []
+        self._columns = {}
+
+        for key, attr in get_normalized_map(child_type).items():
+            typecode = None
+            if isinstance(attr.type, type):
+                typecode = NUMERIC_TYPECODES.get(attr.type)
+
+            self._keys.append((key, attr))
+            self._columns[key] = array.array(typecode) if typecode else []
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._build_row(i) for i in range(*idx.indices(len(self)))]
+
+        return self._build_row(self._normalize_index(idx))
+
+    def __setitem__(self, idx, val):
+        if isinstance(idx, slice):
+            items = list(self)
+            items[idx] = val
+            self.clear()
+            self.extend(items)
+            return
+
+        row = self._model_to_row(val)
+        idx = self._normalize_index(idx)
+
+        for key, attr in self._keys:
+            column, col_val = self._prepare(key, attr, row.get(key))
+            column[idx] = col_val
+
+    def __delitem__(self, idx):
+        if isinstance(idx, slice):
+            count = len(range(*idx.indices(len(self))))
+        else:
+            idx = self._normalize_index(idx)
+            count = 1
+
+        for column in self._columns.values():
+            del column[idx]
+
+        self._length -= count
+
+    def insert(self, idx, val):
+        row = self._model_to_row(val)
+
+        for key, attr in self._keys:
+            column, col_val = self._prepare(key, attr, row.get(key))
+            column.insert(idx, col_val)
+
+        self._length += 1
+
+    def append(self, val):
+        self._append_values(self._model_to_row(val))
+
+    def append_row(self, row):
+        """Appends a decoded JSON object (dict) to the columns."""
+        self._append_values(self._unwrap_row(row))
+
+    def clear(self):
+        for column in self._columns.values():
+            del column[:]
+
+        self._length = 0
+
+    def column(self, key):
+        """Returns the storage column for the specified JSON key."""
+        return self._columns[key]
+
+    def copy(self):
+        """Returns a copy of the collection with copies of its columns."""
+        result = ColumnarCollection(self.child_type, self.coerce_values)
+        result._length = self._length
+        result._columns = dict(
+            (key, column[:]) for key, column in self._columns.items()
+        )
+
+        return result
+
+    __copy__ = copy
+
+    def to_rows(self, serialize_all=False, assign_all=False, compact=False):
+        """Returns the collection in its JSON form (list of dicts).
+
+        Rows in compact form (see :ref:`compact-mode`) are encoded from
+        their row models.
+        """
+        if compact:
+            return [
+                JsonTransmuter.transmute_to(
+                    item,
+                    to_string=False,
+                    coerce_values=False,
+                    serialize_all=serialize_all,
+                    compact=True
+                )[1]
+                for item in self
+            ]
+
+        keys = [
+            (key, self._columns[key])
+            for key, attr in self._keys
+            if serialize_all or attr.serialize
+        ]
+        wrapped_name = self._wrapped_name
+        rows = []
+
+        for idx in range(len(self)):
+            row = {}
+            for key, column in keys:
+                val = column[idx]
+                if assign_all or val is not None:
+                    row[key] = val
+
+            rows.append({wrapped_name: row} if wrapped_name else row)
+
+        return rows
+
+    def _normalize_index(self, idx):
+        if idx < 0:
+            idx += len(self)
+
+        if not 0 <= idx < len(self):
+            raise IndexError('collection index out of range')
+
+        return idx
+
+    def _build_row(self, idx):
+        row = dict(
+            (key, self._columns[key][idx])
+            for key, attr in self._keys
+        )
+
+        if self._wrapped_name:
+            row = {self._wrapped_name: row}
+
+        return JsonTransmuter.transmute_from(
+            row,
+            self.child_type,
+            coerce_values=self.coerce_values
+        )
+
+    def _model_to_row(self, model):
+        return self._unwrap_row(JsonTransmuter.transmute_to(
+            model,
+            to_string=False,
+            coerce_values=False,
+            serialize_all=True
+        ))
+
+    def _append_values(self, row):
+        for key, attr in self._keys:
+            column, col_val = self._prepare(key, attr, row.get(key))
+            column.append(col_val)
+
+        self._length += 1
+
+    def _unwrap_row(self, row):
+        if row and self._wrapped_name:
+            row = row.get(self._wrapped_name)
+
+        return row or {}
+
+    def _prepare(self, key, attr, val):
+        column = self._columns[key]
+
+        if isinstance(column, array.array):
+            should_coerce = self.coerce_values
+            if attr.coerce is not None:
+                should_coerce = attr.coerce
+
+            if should_coerce and val is not None:
+                val = attr.type(val)
+
+            try:
+                val = _array_value(column.typecode, attr.type, val)
+            except (TypeError, OverflowError):
+                column = self._columns[key] = list(column)
+
+        return column, val
+
+
+class ColumnarCollectionType(ExpandedType):
+    """Encodes columnar collections straight from their columns."""
+    cls = ColumnarCollection
+    transmute_options = True
+
+    @classmethod
+    def serialize(cls, value, serialize_all=False, assign_all=False,
+                  compact=False, **options):
+        return value.to_rows(serialize_all=serialize_all,
+                             assign_all=assign_all,
+                             compact=compact)
+
+
+register_type(ColumnarCollectionType)
+
+
+class JsonColumnarListModel(JsonListModel):
+    """A list model that stores its collection in columns rather than as a
+    list of child model instances.
+
+    This significantly reduces the memory footprint of large, homogeneous
+    collections. It uses the same mapping as the :class:`JsonListModel`.
+
+    **Mapping Usage**::
+
+        'my-items': Attr('collection', [ChildModel])
+
+    .. note::
+
+        Child items are materialized on every access. See
+        :class:`ColumnarCollection` for more details.
+
+    """
+
+    @property
+    def collection(self):
+        return self._columnar_collection
+
+    @collection.setter
+    def collection(self, items):
+        if isinstance(items, ColumnarCollection):
+            self._columnar_collection = items
+            return
+
+        key, attr = self._get_collection_mapping()
+        self._columnar_collection = ColumnarCollection(attr.type[0])
+        self._columnar_collection.extend(items or [])
+
+    @classmethod
+    def transmute_from(cls, data, cache=None, **options):
+        if cache is not None:
+            return cache.decode(_ListModelTransmuter, data, cls, **options)
+
+        model, rows, attr = cls._transmute_from_rows(data, **options)
+
+        child_type = attr.type[0]
+        coerce_values = options.get('coerce_values', False)
+        columns = ColumnarCollection(child_type, coerce_values=coerce_values)
+
+        # Compact rows are positional, so they're converted through models
+        if options.get('compact'):
+            columns.extend(
+                JsonTransmuter.transmute_from(
+                    [get_mapping_fingerprint(child_type), row],
+                    child_type,
+                    coerce_values=coerce_values,
+                    compact=True
+                )
+                for row in rows or []
+            )
+        else:
+            for row in rows or []:
+                columns.append_row(row)
+
+        model.collection = columns
+        return model
+
+
+class _Pending(object):
+    """Marks items of a LazyCollection that haven't been decoded yet."""
+
+    def __reduce__(self):
+        # Pickled by reference, so it's still the same marker once loaded
+        return '_PENDING'
+
+
+_PENDING = _Pending()
+
+
+class LazyCollection(collections_abc.MutableSequence):
+    """Sequence of child models that are decoded on first access.
+
+    The collection holds on to the decoded JSON rows and only transmutes a
+    row into its child model when it's retrieved. Converted items are
+    memoized, while the length of the collection is available without
+    converting anything.
+    """
+
+    def __init__(self, child_type, rows=None, **transmute_options):
+        self.child_type = child_type
+        self.transmute_options = transmute_options
+        self._rows = list(rows or [])
+        self._items = [_PENDING] * len(self._rows)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [
+                self._get_item(i)
+                for i in range(*idx.indices(len(self)))
+            ]
+
+        return self._get_item(idx)
+
+    def __setitem__(self, idx, val):
+        if isinstance(idx, slice):
+            val = list(val)
+            self._rows[idx] = [None] * len(val)
+
+        self._items[idx] = val
+
+    def __delitem__(self, idx):
+        del self._rows[idx]
+        del self._items[idx]
+
+    def insert(self, idx, val):
+        self._rows.insert(idx, None)
+        self._items.insert(idx, val)
+
+    def copy(self):
+        """Returns a copy of the collection, which shares the items that
+        are already decoded.
+        """
+        result = LazyCollection(self.child_type, **self.transmute_options)
+        result._rows = list(self._rows)
+        result._items = list(self._items)
+
+        return result
+
+    __copy__ = copy
+
+    def is_decoded(self, idx):
+        """Checks if the item at the specified index has been decoded."""
+        return self._items[idx] is not _PENDING
+
+    def to_rows(self, serialize_all=False, assign_all=False,
+                coerce_values=False, compact=False):
+        """Returns the collection in its JSON form (list of dicts), or in
+        compact form (see :ref:`compact-mode`).
+
+        Pending items are converted without being memoized.
+        """
+        rows = []
+
+        for row, item in zip(self._rows, self._items):
+            if item is _PENDING:
+                item = self._decode(row)
+
+            row = JsonTransmuter.transmute_to(
+                item,
+                to_string=False,
+                serialize_all=serialize_all,
+                assign_all=assign_all,
+                coerce_values=coerce_values,
+                compact=compact
+            )
+            rows.append(row[1] if compact and row is not None else row)
+
+        return rows
+
+    def _get_item(self, idx):
+        item = self._items[idx]
+
+        if item is _PENDING:
+            item = self._items[idx] = self._decode(self._rows[idx])
+            self._rows[idx] = None
+
+        return item
+
+    def _decode(self, row):
+        # Compact rows are missing the fingerprint that wraps compact data
+        if self.transmute_options.get('compact'):
+            row = [get_mapping_fingerprint(self.child_type), row]
+
+        return JsonTransmuter.transmute_from(
+            row,
+            self.child_type,
+            **self.transmute_options
+        )
+
+
+class LazyCollectionType(ExpandedType):
+    """Encodes lazy collections without memoizing pending items."""
+    cls = LazyCollection
+    transmute_options = True
+
+    @classmethod
+    def serialize(cls, value, serialize_all=False, assign_all=False,
+                  coerce_values=False, compact=False):
+        return value.to_rows(serialize_all=serialize_all,
+                             assign_all=assign_all,
+                             coerce_values=coerce_values,
+                             compact=compact)
+
+
+register_type(LazyCollectionType)
+
+
+class JsonLazyListModel(JsonListModel):
+    """A list model that defers the transmutation of its child items until
+    they are accessed.
+
+    This is useful when only a portion of a large collection is used, as
+    only the accessed items are ever converted into child models. It uses
+    the same mapping as the :class:`JsonListModel`.
+
+    **Mapping Usage**::
+
+        'my-items': Attr('collection', [ChildModel])
+
+    .. note::
+
+        Items are only deferred when the list model itself is transmuted
+        (e.g. ``from_json``). A list model that is nested in another model
+        is decoded along with its parent, so its collection holds items that
+        are already decoded.
+
+    """
+
+    @property
+    def collection(self):
+        return self._lazy_collection
+
+    @collection.setter
+    def collection(self, items):
+        if isinstance(items, LazyCollection):
+            self._lazy_collection = items
+            return
+
+        key, attr = self._get_collection_mapping()
+        self._lazy_collection = LazyCollection(attr.type[0])
+        self._lazy_collection.extend(items or [])
+
+    @classmethod
+    def transmute_from(cls, data, cache=None, **options):
+        if cache is not None:
+            return cache.decode(_ListModelTransmuter, data, cls, **options)
+
+        model, rows, attr = cls._transmute_from_rows(data, **options)
+        options.pop('decoder', None)
+        options.pop('decoder_kwargs', None)
+
+        model.collection = LazyCollection(attr.type[0], rows, **options)
+        return model
@@ -13,6 +13,13 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import collections
+import copy
+import hashlib
+import json
+
+import six
+from six.moves import collections_abc, copyreg
 
 
 class Attr(object):
@@ -34,8 +41,14 @@ class Attr(object):
 
 
 class ExpandedType(object):
-    """Custom Expanded Type Definition (Unstable Feature)"""
+    """Custom Expanded Type Definition (Unstable Feature)
+
+    Types that set ``transmute_options`` receive the ``serialize_all``,
+    ``assign_all``, ``coerce_values`` and ``compact`` options of
+    ``transmute_to`` as keyword arguments of :meth:`serialize`.
+    """
     cls = None
+    transmute_options = False
 
     @classmethod
     def check_type(cls, inst):
@@ -55,9 +68,193 @@ class ExpandedType(object):
         pass
 
 
+class TaggedUnion(object):
+    """Discriminated Union Definition
+
+    Maps the value of a discriminator key to the mapped model type that
+    should be used for the object.
+
+    **Mapping Usage**::
+
+        'event': Attr('event', TaggedUnion('type', {
+            'click': ClickEvent,
+            'view': ViewEvent,
+        })),
+        'events': Attr('events', [TaggedUnion('type', {...})]),
+
+    :param key: JSON key that holds the discriminator value
+    :param types: Dictionary of discriminator values to mapped model types
+    :param strict: Boolean value to raise an ``AlchemizeError`` when
+        decoding an object with an unknown discriminator value. Otherwise,
+        such objects are decoded as ``None``.
+    """
+    def __init__(self, key, types, strict=True):
+        self.key = key
+        self.types = dict(types)
+        self.strict = strict
+        self.tags = dict(
+            (model_type, tag) for tag, model_type in self.types.items()
+        )
+        self._injects_tag = {}
+
+    def get_tag(self, model):
+        """Returns the discriminator value for a model instance."""
+        model_type = type(model)
+        tag = self.tags.get(model_type)
+
+        # Support subclasses of the mapped model types
+        if tag is None:
+            tag = next(
+                (self.tags[sub_class] for sub_class in model_type.mro()
+                 if sub_class in self.tags),
+                None
+            )
+
+        return tag
+
+    def injects_tag(self, model_type):
+        """Checks if the discriminator needs to be added to the serialized
+        form of a model type (i.e. the key isn't part of its mapping).
+        """
+        injects = self._injects_tag.get(model_type)
+
+        if injects is None:
+            injects = self._injects_tag[model_type] = (
+                self.key not in get_normalized_map(model_type)
+            )
+
+        return injects
+
+
+class RawJson(object):
+    """Opaque JSON document that is passed through without being mapped.
+
+    Attributes mapped to ``RawJson`` keep the document as-is. Its text is
+    spliced verbatim into the output of ``transmute_to(to_string=True)``,
+    so documents that are created from text are never parsed or re-encoded.
+    Documents that are decoded from data keep the parsed value instead, and
+    are only encoded when their text is needed.
+
+    **Mapping Usage**::
+
+        'payload': Attr('payload', RawJson),
+
+    :param text: JSON text of the document.
+    """
+    __slots__ = ('_text', '_value')
+
+    def __init__(self, text):
+        if isinstance(text, six.binary_type):
+            text = text.decode('utf-8')
+
+        self._text = text
+        self._value = _MISSING
+
+    @classmethod
+    def from_value(cls, value):
+        """Creates a document from an already parsed value."""
+        raw = cls.__new__(cls)
+        raw._text = None
+        raw._value = value
+        return raw
+
+    @property
+    def text(self):
+        """The JSON text of the document."""
+        if self._text is None:
+            self._text = json.dumps(self._value)
+
+        return self._text
+
+    @property
+    def value(self):
+        """The parsed value of the document."""
+        if self._value is _MISSING:
+            self._value = json.loads(self._text)
+
+        return self._value
+
+    def __eq__(self, other):
+        if not isinstance(other, RawJson):
+            return NotImplemented
+
+        if self._text is not None and self._text == other._text:
+            return True
+
+        return self.value == other.value
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return RawJson, (self.text,)
+
+    def __repr__(self):
+        return 'RawJson({0!r})'.format(self.text)
+
+
 class BaseMappedModel(object):
     __wrapped_attr_name__ = None
     __mapping__ = {}
+    __fast_construct__ = False
+    __frozen__ = False
+    __merge_key__ = None
+
+    def __post_decode__(self):
+        """Hook that is called once a fast constructed model is populated.
+
+        Fast construction skips ``__init__``, so any initialization logic
+        required by your model should be implemented here instead.
+        """
+        pass
+
+    def __reduce__(self):
+        """Pickles the mapped attributes as a tuple of values in the order
+        of the (sorted) mapping keys along with the mapping fingerprint,
+        instead of a dictionary with the attribute names of every instance.
+        Frozen models are restored as regular models.
+
+        Models that define their own ``__getstate__``, ``__setstate__`` or
+        ``__reduce_ex__`` are pickled with their state as usual instead.
+        """
+        model_type = _unfrozen_type(type(self))
+
+        if _has_custom_pickling(model_type):
+            getstate = getattr(self, '__getstate__', None)
+            state = getstate() if getstate else dict(self.__dict__)
+            return copyreg.__newobj__, (model_type,), state
+
+        values, state = _get_pickle_values(self)
+
+        return _restore_model, (
+            model_type,
+            get_mapping_fingerprint(model_type),
+            values,
+            state,
+        )
+
+    def __copy__(self):
+        # Lists of models are pickled by value, so shallow copies can't
+        # go through __reduce__.
+        if self.__frozen__:
+            return self
+
+        model_type = type(self)
+        model = model_type.__new__(model_type)
+        state = getattr(self, '__dict__', None)
+
+        if state:
+            model.__dict__.update(state)
+
+        for name, bulk, _ in _get_pickle_plan(model_type)[0]:
+            value = getattr(self, name, _Unset)
+            if not bulk and value is not _Unset:
+                setattr(model, name, value)
+
+        return model
 
     @classmethod
     def __get_full_mapping__(cls):
@@ -82,6 +279,20 @@ class JsonMappedModel(BaseMappedModel):
 
         'json_attr_name': Attr('python_attr_name', StorageType)
 
+    **Fast Construction**
+
+    Setting ``__fast_construct__ = True`` on a model allows for transmuters
+    to allocate instances without calling ``__init__`` and populate the
+    mapped attributes directly through the instance ``__dict__`` (or
+    ``setattr`` for properties and ``__slots__``). Use ``__post_decode__``
+    for any initialization logic the model depends on.
+
+    **Merge Key**
+
+    When transmuting into an existing list of models, items are matched up
+    by their position. Setting ``__merge_key__`` to one of the (JSON) keys of
+    the mapping matches items up by the value of that key instead.
+
     **Mapping Types**::
 
         __mapping__ = {
@@ -113,10 +324,327 @@ def get_normalized_map(model):
     return key_map
 
 
+def construct_model(model_type):
+    """Creates a new, empty instance of a mapped model type."""
+    if model_type.__fast_construct__:
+        return model_type.__new__(model_type)
+
+    return model_type()
+
+
+def supports_bulk_assignment(model_type, attr_name):
+    """Checks if an attribute can be assigned through the instance __dict__
+    without bypassing a descriptor (e.g. properties or __slots__).
+    """
+    class_dicts = [vars(sub_class) for sub_class in model_type.mro()]
+
+    if not any('__dict__' in class_dict for class_dict in class_dicts):
+        return False
+
+    for class_dict in class_dicts:
+        if attr_name in class_dict:
+            return not hasattr(class_dict[attr_name], '__set__')
+
+    return True
+
+
+_MISSING = object()
+
+MODEL_DEFAULTS = {}
+
+
+def get_model_defaults(model_type):
+    """Returns the class-level defaults of a model's mapped attributes as
+    a dictionary keyed by attribute name. Attributes without a default, or
+    that are backed by a descriptor, are left out. Tables are built once
+    per model type.
+    """
+    defaults = MODEL_DEFAULTS.get(model_type)
+    if defaults is not None:
+        return defaults
+
+    class_dicts = [vars(sub_class) for sub_class in model_type.mro()]
+    defaults = {}
+
+    for attr in get_normalized_map(model_type).values():
+        for class_dict in class_dicts:
+            if attr.name in class_dict:
+                value = class_dict[attr.name]
+                if not hasattr(value, '__get__'):
+                    defaults[attr.name] = value
+                break
+
+    MODEL_DEFAULTS[model_type] = defaults
+    return defaults
+
+
+MAPPING_FINGERPRINTS = {}
+# Fingerprints of mappings that aren't part of a cycle, which are used in
+# place of their description within other mappings.
+MAPPING_TOKENS = {}
+
+
+def _iter_type_models(attr_type):
+    """Yields the mapped models that are referenced by a mapping type."""
+    if is_mapped_model(attr_type):
+        yield attr_type
+
+    elif isinstance(attr_type, list):
+        for item in attr_type:
+            for model in _iter_type_models(item):
+                yield model
+
+    elif is_container_type(attr_type):
+        for model in _iter_type_models(get_item_type(attr_type)):
+            yield model
+
+    elif isinstance(attr_type, TaggedUnion):
+        for tag in sorted(attr_type.types):
+            for model in _iter_type_models(attr_type.types[tag]):
+                yield model
+
+
+def _describe_type(attr_type, tokens):
+    if is_mapped_model(attr_type):
+        return tokens[attr_type]
+
+    elif isinstance(attr_type, list):
+        return '[{0}]'.format(
+            ','.join(_describe_type(item, tokens) for item in attr_type)
+        )
+
+    elif is_container_type(attr_type):
+        return 'dict({0})'.format(
+            _describe_type(get_item_type(attr_type), tokens)
+        )
+
+    elif isinstance(attr_type, TaggedUnion):
+        return 'union({0}|{1})'.format(attr_type.key, ','.join(
+            '{0}={1}'.format(tag, _describe_type(attr_type.types[tag], tokens))
+            for tag in sorted(attr_type.types)
+        ))
+
+    return getattr(attr_type, '__name__', repr(attr_type))
+
+
+def _describe_mapping(model_type):
+    """Describes the keys and types of a mapping.
+
+    Nested mappings are described by their own fingerprint, unless they're
+    part of a cycle. Those are described in full instead, with recursive
+    references pointing back by the number of levels (e.g. ``@0`` for the
+    mapping itself), so a description never depends on the order in which
+    mappings are fingerprinted.
+    """
+    # PERF: Mappings are walked with an explicit stack, so long chains of
+    # nested mappings can't exhaust the recursion limit.
+    path = [model_type]
+    positions = {model_type: 0}
+    stack = [(get_normalized_map(model_type), {}, [len(path)])]
+
+    while True:
+        key_map, tokens, lowest = stack[-1]
+        depth = len(path) - 1
+        child = None
+
+        for key in sorted(key_map):
+            for model in _iter_type_models(key_map[key].type):
+                if model in tokens:
+                    continue
+
+                if model in positions:
+                    index = positions[model]
+                    tokens[model] = '@{0}'.format(depth - index)
+                    lowest[0] = min(lowest[0], index)
+
+                elif model in MAPPING_TOKENS:
+                    tokens[model] = '#' + MAPPING_TOKENS[model]
+
+                else:
+                    child = model
+                    break
+
+            if child is not None:
+                break
+
+        if child is not None:
+            positions[child] = len(path)
+            path.append(child)
+            stack.append((get_normalized_map(child), {}, [len(path)]))
+            continue
+
+        description = '{{{0}}}'.format(','.join(
+            '{0}:{1}'.format(key, _describe_type(key_map[key].type, tokens))
+            for key in sorted(key_map)
+        ))
+
+        model = path.pop()
+        del positions[model]
+        stack.pop()
+        token = description
+
+        if lowest[0] > depth:
+            MAPPING_TOKENS[model] = _hash_description(description)
+            token = '#' + MAPPING_TOKENS[model]
+
+        if not stack:
+            return description
+
+        stack[-1][1][model] = token
+        stack[-1][2][0] = min(stack[-1][2][0], lowest[0])
+
+
+def _hash_description(description):
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()[:16]
+
+
+def get_mapping_fingerprint(model):
+    """Returns a stable fingerprint of a model's resolved mapping.
+
+    The fingerprint covers the (sorted) keys and types of the model and all
+    of its nested models, so it changes whenever the layout of the encoded
+    data would change.
+
+    :param model: Mapped Model instance or class
+    :return: Hex string fingerprint
+    """
+    model_type = model if isinstance(model, type) else type(model)
+    fingerprint = MAPPING_FINGERPRINTS.get(model_type)
+
+    if fingerprint is None:
+        fingerprint = MAPPING_TOKENS.get(model_type)
+
+    if fingerprint is None:
+        fingerprint = _hash_description(_describe_mapping(model_type))
+
+    MAPPING_FINGERPRINTS[model_type] = fingerprint
+    return fingerprint
+
+
 def is_mapped_model(obj):
     return isinstance(obj, type) and issubclass(obj, BaseMappedModel)
 
 
+def is_container_type(attr_type):
+    """Checks if a mapping type is a dict of values (``{str: Type}``) or a
+    list of such containers (e.g. ``[[Type]]``).
+    """
+    if isinstance(attr_type, dict):
+        return len(attr_type) == 1
+
+    return (isinstance(attr_type, list) and len(attr_type) == 1
+            and isinstance(attr_type[0], (list, dict)))
+
+
+def get_item_type(attr_type):
+    """Returns the item type of a list or dict mapping type."""
+    if isinstance(attr_type, dict):
+        return next(iter(attr_type.values()))
+
+    return attr_type[0]
+
+
+def _get_leaf_type(attr_type):
+    """Returns the innermost item type of (nested) list and dict types."""
+    while isinstance(attr_type, (list, dict)) and len(attr_type) == 1:
+        attr_type = get_item_type(attr_type)
+
+    return attr_type
+
+
+def _map_container(value, func):
+    if isinstance(value, list):
+        return [_map_container(item, func) for item in value]
+
+    elif isinstance(value, dict):
+        return dict(
+            (key, _map_container(item, func))
+            for key, item in value.items()
+        )
+
+    return func(value)
+
+
+def _iter_container(value):
+    """Yields the (non-None) leaf values of nested lists and dicts."""
+    stack = [value]
+
+    while stack:
+        value = stack.pop()
+
+        if isinstance(value, list):
+            stack.extend(reversed(value))
+
+        elif isinstance(value, dict):
+            stack.extend(reversed(list(value.values())))
+
+        elif value is not None:
+            yield value
+
+
+KEY_PATH_INDEXES = {}
+
+
+def _get_path_models(attr_type):
+    attr_type = _get_leaf_type(attr_type)
+
+    if is_mapped_model(attr_type):
+        return [attr_type]
+
+    elif isinstance(attr_type, TaggedUnion):
+        return [attr_type.types[tag] for tag in sorted(attr_type.types)]
+
+    return []
+
+
+def _walk_key_paths(model, sep, prefix, chain, seen):
+    for key, attr in get_normalized_map(model).items():
+        full_key_name = '{pre}{sep}{key}'.format(
+            pre=prefix,
+            sep=sep,
+            key=key
+        )
+        attr_chain = chain + (attr,)
+        child_models = _get_path_models(attr.type)
+
+        # Recursive mappings are walked one level deep, below which the
+        # attributes that refer back to them are leaves of the path.
+        walked = [model for model in child_models if seen.count(model) < 2]
+
+        if not walked or len(walked) < len(child_models):
+            yield full_key_name, attr_chain
+
+        for child_model in walked:
+            for entry in _walk_key_paths(child_model, sep, full_key_name,
+                                         attr_chain, seen + (child_model,)):
+                yield entry
+
+
+def get_key_path_index(model, sep='/'):
+    """Returns the memoized key path index of a model
+
+    :param model: Mapped Model instance or class
+    :param sep: Separator used to join the keys together
+
+    :return: Dictionary of key paths to their chain of Attr objects
+    """
+    if model is None:
+        return {}
+
+    model_type = model if isinstance(model, type) else type(model)
+    index = KEY_PATH_INDEXES.get((model_type, sep))
+
+    if index is None:
+        index = KEY_PATH_INDEXES[(model_type, sep)] = collections.OrderedDict()
+
+        # Union variants can share paths, in which case the first one wins
+        for path, chain in _walk_key_paths(model_type, sep, '', (),
+                                           (model_type,)):
+            index.setdefault(path, chain)
+
+    return index
+
+
 def get_key_paths(model, sep='/', prefix=''):
     """Walks a model class and returns a list of all key paths
 
@@ -126,36 +654,575 @@ def get_key_paths(model, sep='/', prefix=''):
 
     :return: List of key paths
     """
-    key_list = []
+    return [prefix + path for path in get_key_path_index(model, sep)]
 
-    for key, attr in get_normalized_map(model).items():
-        full_key_name = '{pre}{sep}{key}'.format(
-            pre=prefix,
-            sep=sep,
-            key=key
-        )
 
-        if is_mapped_model(attr.type):
-            key_list.extend(
-                get_key_paths(
-                    attr.type,
-                    sep=sep,
-                    prefix=full_key_name
-                )
-            )
+def _get_chain_value(value, chain, default):
+    last_idx = len(chain) - 1
+
+    for idx, attr in enumerate(chain):
+        if value is None:
+            return default
+
+        value = getattr(value, attr.name, None)
 
-        elif (isinstance(attr.type, list)
-                and len(attr.type) == 1
-                and is_mapped_model(attr.type[0])):
-            key_list.extend(
-                get_key_paths(
-                    attr.type[0],
-                    sep=sep,
-                    prefix=full_key_name
-                )
+        # Paths through lists (or dicts) of models resolve for each item
+        if idx < last_idx and isinstance(value, (list, dict)):
+            rest = chain[idx + 1:]
+            return _map_container(
+                value,
+                lambda item: _get_chain_value(item, rest, default)
             )
 
+    return default if value is None else value
+
+
+def get_path(model, path, sep='/', default=None):
+    """Retrieves the value of a key path from a model instance
+
+    Paths that go through a list (or dict) of models return a list (or dict)
+    with a value for each of the items.
+
+    :param model: Mapped Model instance
+    :param path: Key path as returned by get_key_paths
+    :param sep: Separator used to join the keys together
+    :param default: Value to use when an attribute along the path is unset
+
+    :return: The value of the attribute at the key path
+    """
+    return _get_chain_value(model, get_key_path_index(model, sep)[path],
+                            default)
+
+
+def _set_chain_value(value, chain, new_value):
+    for idx, attr in enumerate(chain[:-1]):
+        child = getattr(value, attr.name, None)
+
+        if isinstance(child, (list, dict)):
+            for item in _iter_container(child):
+                _set_chain_value(item, chain[idx + 1:], new_value)
+            return
+
+        elif child is None:
+            # There is nothing to set on an unset list of models
+            if not is_mapped_model(attr.type):
+                return
+
+            child = construct_model(attr.type)
+            setattr(value, attr.name, child)
+
+        value = child
+
+    setattr(value, chain[-1].name, new_value)
+
+
+def set_path(model, path, value, sep='/'):
+    """Sets the value of a key path on a model instance
+
+    Missing child models along the path are created, while paths that go
+    through a list (or dict) of models set the value on each of the items.
+
+    :param model: Mapped Model instance
+    :param path: Key path as returned by get_key_paths
+    :param value: Value to set
+    :param sep: Separator used to join the keys together
+    """
+    _set_chain_value(model, get_key_path_index(model, sep)[path], value)
+
+
+# Values of these types are shared between a model and its clones
+IMMUTABLE_TYPES = (
+    (type(None), bool, float, complex, tuple, frozenset, six.binary_type,
+     RawJson)
+    + six.integer_types
+    + six.string_types
+)
+IMMUTABLE_TYPE_SET = frozenset(IMMUTABLE_TYPES)
+
+CLONE_PLANS = {}
+
+
+def _get_clone_plan(model_type):
+    plan = CLONE_PLANS.get(model_type)
+
+    if plan is None:
+        plan = CLONE_PLANS[model_type] = []
+
+        for attr in get_normalized_map(model_type).values():
+            # Lists of models and containers of models are handled alike
+            item_type = _get_leaf_type(attr.type)
+            is_list = item_type is not attr.type
+            is_model = (is_mapped_model(item_type)
+                        or isinstance(item_type, TaggedUnion))
+
+            plan.append((
+                attr.name,
+                is_model,
+                is_list,
+                supports_bulk_assignment(model_type, attr.name)
+            ))
+
+    return plan
+
+
+def _clone_value(value, deep):
+    if isinstance(value, list):
+        if deep and not all(isinstance(item, IMMUTABLE_TYPES)
+                            for item in value):
+            return copy.deepcopy(value)
+        return list(value)
+
+    elif isinstance(value, dict) and not deep:
+        return dict(value)
+
+    # Other sequences (e.g. the collections of the list model helpers) are
+    # copied through their copy protocol.
+    elif isinstance(value, collections_abc.MutableSequence) and not deep:
+        return copy.copy(value)
+
+    elif isinstance(value, IMMUTABLE_TYPES):
+        return value
+
+    return copy.deepcopy(value) if deep else value
+
+
+def _clone_container(value, stack, deep):
+    if isinstance(value, dict):
+        return dict(
+            (key, _clone_container(item, stack, deep))
+            for key, item in value.items()
+        )
+
+    elif isinstance(value, list):
+        return [_clone_container(item, stack, deep) for item in value]
+
+    return _clone_child(value, stack) if deep else value
+
+
+def _clone_child(child, stack):
+    if not isinstance(child, BaseMappedModel) or child.__frozen__:
+        return child
+
+    child_clone = construct_model(type(child))
+    stack.append((child, child_clone))
+    return child_clone
+
+
+def clone(model, deep=False):
+    """Copies the mapped attributes of a model into a new instance
+
+    Unlike ``copy.deepcopy``, only the mapped attributes are copied and
+    immutable values are shared with the clone. Lists, dicts and other
+    mutable sequences (through ``copy.copy``) are copied, while child models
+    and other values are shared unless a deep clone is requested. Frozen
+    child models (``__frozen__``) are always shared.
+
+    :param model: Mapped Model instance
+    :param deep: Clone child models (and mutable values) recursively
+
+    :return: The cloned model
+    """
+    if model is None or model.__frozen__:
+        return model
+
+    immutable_types = IMMUTABLE_TYPE_SET
+    result = construct_model(type(model))
+    stack = [(model, result)]
+    fast_constructed = []
+
+    while stack:
+        source, target = stack.pop()
+        model_type = type(source)
+        plan = CLONE_PLANS.get(model_type) or _get_clone_plan(model_type)
+        target_dict = getattr(target, '__dict__', None)
+
+        if model_type.__fast_construct__:
+            fast_constructed.append(target)
+
+        for name, is_model, is_list, bulk in plan:
+            value = getattr(source, name, _MISSING)
+            if value is _MISSING:
+                continue
+
+            # PERF: Most values are immutable, so they're checked first
+            if type(value) in immutable_types:
+                pass
+
+            elif is_model and is_list and type(value) is list:
+                if deep:
+                    value = [
+                        _clone_container(item, stack, deep)
+                        if isinstance(item, (list, dict))
+                        else _clone_child(item, stack)
+                        for item in value
+                    ]
+                else:
+                    value = [
+                        _clone_container(item, stack, deep)
+                        if isinstance(item, (list, dict)) else item
+                        for item in value
+                    ]
+
+            elif is_model and is_list and isinstance(value, dict):
+                value = _clone_container(value, stack, deep)
+
+            elif is_model and not is_list:
+                if deep:
+                    value = _clone_child(value, stack)
+
+            else:
+                value = _clone_value(value, deep)
+
+            if target_dict is not None and bulk:
+                target_dict[name] = value
+            else:
+                setattr(target, name, value)
+
+    # Same as with transmuters, children are ready before their parents
+    for obj in reversed(fast_constructed):
+        obj.__post_decode__()
+
+    return result
+
+
+class _Unset(object):
+    """Marks attributes that aren't set in pickled models. Classes are
+    pickled by reference, so it only takes up a few bytes.
+    """
+    pass
+
+
+PICKLE_PLANS = {}
+CUSTOM_PICKLING = {}
+PICKLING_HOOKS = ('__getstate__', '__setstate__', '__reduce_ex__')
+
+
+def _has_custom_pickling(model_type):
+    """Checks if a model type (or one of its bases) defines its own
+    pickling hooks, which positional pickling would bypass.
+    """
+    custom = CUSTOM_PICKLING.get(model_type)
+
+    if custom is None:
+        custom = False
+        for base in model_type.__mro__:
+            if base is BaseMappedModel:
+                break
+
+            if any(name in vars(base) for name in PICKLING_HOOKS):
+                custom = True
+                break
+
+        CUSTOM_PICKLING[model_type] = custom
+
+    return custom
+
+
+def _get_pickle_plan(model_type):
+    """Returns the ``(name, bulk, is_model_list)`` fields of a model in the
+    order of its sorted keys, along with their names and if all of them can
+    be assigned through the instance __dict__.
+    """
+    plan = PICKLE_PLANS.get(model_type)
+
+    if plan is None:
+        key_map = get_normalized_map(model_type)
+        fields = []
+
+        for key in sorted(key_map):
+            attr = key_map[key]
+            if any(name == attr.name for name, _, _ in fields):
+                continue
+
+            fields.append((
+                attr.name,
+                supports_bulk_assignment(model_type, attr.name),
+                (isinstance(attr.type, list) and len(attr.type) == 1
+                 and is_mapped_model(attr.type[0])),
+            ))
+
+        plan = PICKLE_PLANS[model_type] = (
+            fields,
+            tuple(name for name, _, _ in fields),
+            all(bulk for _, bulk, _ in fields),
+        )
+
+    return plan
+
+
+class _ModelRows(object):
+    """Pickles a list of models of the same type as rows of values, so
+    the type and fingerprint are only stored once for the whole list.
+    """
+
+    def __init__(self, model_type, rows):
+        self.model_type = model_type
+        self.rows = rows
+
+    def __reduce__(self):
+        return _restore_model_rows, (
+            self.model_type,
+            get_mapping_fingerprint(self.model_type),
+            self.rows,
+        )
+
+
+def _pack_models(models):
+    model_type = None
+    rows = []
+
+    for model in models:
+        if model is None:
+            rows.append(None)
+            continue
+
+        elif model_type is None:
+            model_type = _unfrozen_type(type(model))
+            if _has_custom_pickling(model_type):
+                return models
+
+        if _unfrozen_type(type(model)) is not model_type:
+            return models
+
+        values, state = _get_pickle_values(model)
+        if state:
+            return models
+
+        rows.append(values)
+
+    return _ModelRows(model_type, rows) if model_type else models
+
+
+def _get_pickle_values(model):
+    """Returns the values of a model as a tuple, or a list when some of
+    them are unset, along with any unmapped instance state.
+    """
+    state = dict(getattr(model, '__dict__', {}))
+    values = []
+    has_unset = False
+
+    for name, bulk, is_model_list in _get_pickle_plan(type(model))[0]:
+        if bulk:
+            value = state.pop(name, _Unset)
+        else:
+            value = getattr(model, name, _Unset)
+
+        if value is _Unset:
+            has_unset = True
+
+        elif is_model_list and type(value) in (list, FrozenList):
+            value = _pack_models(value)
+
+        values.append(value)
+
+    return values if has_unset else tuple(values), state or None
+
+
+def _check_pickle_fingerprint(model_type, fingerprint):
+    expected = get_mapping_fingerprint(model_type)
+    if fingerprint != expected:
+        # Imported here, as the transmute module depends on this module
+        from alchemize.transmute import SchemaMismatchError
+        raise SchemaMismatchError(expected, fingerprint)
+
+
+def _populate_model(model_type, plan, values, state):
+    fields, names, all_bulk = plan
+    model = model_type.__new__(model_type)
+    model_dict = getattr(model, '__dict__', None)
+
+    if state:
+        model_dict.update(state)
+
+    # PERF: Values are only a tuple when all of them are set
+    if all_bulk and model_dict is not None and type(values) is tuple:
+        model_dict.update(zip(names, values))
+        return model
+
+    for (name, bulk, _), value in zip(fields, values):
+        if value is _Unset:
+            continue
+
+        elif model_dict is not None and bulk:
+            model_dict[name] = value
+
+        else:
+            setattr(model, name, value)
+
+    return model
+
+
+def _restore_model(model_type, fingerprint, values, state):
+    """Restores a mapped model that was pickled through its __reduce__."""
+    _check_pickle_fingerprint(model_type, fingerprint)
+
+    return _populate_model(model_type, _get_pickle_plan(model_type), values,
+                           state)
+
+
+def _restore_model_rows(model_type, fingerprint, rows):
+    """Restores a list of models that was pickled as rows of values."""
+    _check_pickle_fingerprint(model_type, fingerprint)
+    plan = _get_pickle_plan(model_type)
+    _, names, all_bulk = plan
+    new_model = model_type.__new__
+    models = []
+
+    for values in rows:
+        if values is None:
+            models.append(None)
+
+        # PERF: Inlined fast path of _populate_model
+        elif all_bulk and type(values) is tuple:
+            model = new_model(model_type)
+            model.__dict__.update(zip(names, values))
+            models.append(model)
+
         else:
-            key_list.append(full_key_name)
+            models.append(_populate_model(model_type, plan, values, None))
+
+    return models
+
+
+FROZEN_TYPES = {}
 
-    return key_list
+
+def _frozen_setattr(self, name, value=None):
+    raise AttributeError(
+        'Unable to modify {0}, as it is frozen'.format(type(self).__name__)
+    )
+
+
+def _unfrozen_type(model_type):
+    return getattr(model_type, '__unfrozen_type__', model_type)
+
+
+def _frozen_container(self, *args, **kwargs):
+    raise TypeError(
+        'Unable to modify {0}, as it is frozen'.format(type(self).__name__)
+    )
+
+
+class FrozenList(list):
+    """Read-only list that holds the list values of frozen models. Copies
+    and pickles of it are plain lists, same as the models are unfrozen.
+    """
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _frozen_container
+    __setslice__ = __delslice__ = _frozen_container
+    append = extend = insert = pop = remove = _frozen_container
+    reverse = sort = clear = _frozen_container
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+class FrozenDict(dict):
+    """Read-only dict that holds the dict values of frozen models. Copies
+    and pickles of it are plain dicts, same as the models are unfrozen.
+    """
+    __setitem__ = __delitem__ = _frozen_container
+    clear = pop = popitem = setdefault = update = _frozen_container
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+def _freeze_value(value, stack):
+    """Returns a read-only copy of (nested) lists and dicts, while their
+    child models are added to the stack to be frozen.
+    """
+    if isinstance(value, BaseMappedModel):
+        stack.append(value)
+
+    elif isinstance(value, list) and not isinstance(value, FrozenList):
+        return FrozenList([_freeze_value(item, stack) for item in value])
+
+    elif isinstance(value, dict) and not isinstance(value, FrozenDict):
+        return FrozenDict(
+            (key, _freeze_value(item, stack)) for key, item in value.items()
+        )
+
+    return value
+
+
+def _get_frozen_type(model_type):
+    frozen_type = FROZEN_TYPES.get(model_type)
+
+    if frozen_type is None:
+        # Without any slots of its own, the frozen type has the same layout
+        # as the model type, which allows for instances to switch over.
+        frozen_type = FROZEN_TYPES[model_type] = type(model_type)(
+            model_type.__name__,
+            (model_type,),
+            {
+                '__slots__': (),
+                '__module__': model_type.__module__,
+                '__frozen__': True,
+                '__unfrozen_type__': model_type,
+                '__setattr__': _frozen_setattr,
+                '__delattr__': _frozen_setattr,
+            }
+        )
+
+    return frozen_type
+
+
+def freeze(model):
+    """Freezes a model and all of its child models in place
+
+    Frozen models raise an AttributeError when their attributes are set or
+    deleted, which allows for them to be shared safely (e.g. by clone or a
+    decode cache). Lists and dicts that are stored in the instance
+    ``__dict__`` are replaced with a read-only :class:`FrozenList` or
+    :class:`FrozenDict`, which raise a TypeError when they're changed. Other
+    mutable values are left as they are.
+
+    :param model: Mapped Model instance
+
+    :return: The frozen model
+    """
+    stack = [model]
+
+    while stack:
+        current = stack.pop()
+        if current.__frozen__:
+            continue
+
+        model_type = type(current)
+        plan = CLONE_PLANS.get(model_type) or _get_clone_plan(model_type)
+        current_dict = getattr(current, '__dict__', None)
+
+        for name, _, _, bulk in plan:
+            value = getattr(current, name, None)
+            frozen_value = _freeze_value(value, stack)
+
+            if frozen_value is not value and bulk and current_dict is not None:
+                current_dict[name] = frozen_value
+
+        current.__class__ = _get_frozen_type(model_type)
+
+    return model
+
+
+# Caches that are derived from the mappings of model types. Modules with
+# caches of their own add them to this list.
+MAPPING_CACHES = [
+    MODEL_DEFAULTS,
+    MAPPING_FINGERPRINTS,
+    MAPPING_TOKENS,
+    KEY_PATH_INDEXES,
+    CLONE_PLANS,
+    PICKLE_PLANS,
+    CUSTOM_PICKLING,
+]
+
+
+def clear_mapping_caches():
+    """Clears every cache that is derived from the mappings of model types,
+    so they're rebuilt from the current mappings.
+
+    Fingerprints and key paths of a model cover its nested models as well,
+    so the caches are cleared for all model types at once.
+    """
+    for cache in MAPPING_CACHES:
+        cache.clear()
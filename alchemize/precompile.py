@@ -0,0 +1,55 @@
+"""
+Copyright 2014 John Vrbanac
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from alchemize.mapping import get_mapping_fingerprint
+from alchemize.transmute import JsonTransmuter
+
+
+def iter_mapped_models(base_types):
+    """Yields every loaded subclass of the specified base types."""
+    seen = set()
+    stack = list(base_types)
+
+    while stack:
+        model_type = stack.pop()
+
+        for sub_class in model_type.__subclasses__():
+            if sub_class not in seen:
+                seen.add(sub_class)
+                stack.append(sub_class)
+                yield sub_class
+
+
+def precompile_models(transmuter=JsonTransmuter, models=None):
+    """Prepares the transmutation plans and mapping fingerprints of mapped
+    models ahead of time, so that the first requests after startup don't
+    have to.
+
+    :param transmuter: The transmuter to prepare the plans for.
+    :param models: The model types to prepare. Defaults to every loaded
+        subclass of the transmuter's supported base mappings.
+    :returns: The list of prepared model types.
+    """
+    if models is None:
+        models = iter_mapped_models(transmuter.__supported_base_mappings__)
+
+    models = list(models)
+
+    for model_type in models:
+        transmuter.get_model_plan(model_type)
+        transmuter.get_model_plan(model_type, compact=True)
+        get_mapping_fingerprint(model_type)
+
+    return models
@@ -0,0 +1,356 @@
+"""
+Copyright 2014 John Vrbanac
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Profiles transmuting a model with a sample payload::
+
+    python -m alchemize.profile myapp.models.User user.json -n 1000
+"""
+from __future__ import absolute_import, division
+
+import argparse
+import cProfile
+import gc
+import importlib
+import os
+import pstats
+import sys
+from timeit import default_timer
+
+import six
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+from alchemize.binary import MsgPackTransmuter
+from alchemize.mapping import Attr
+
+OPERATIONS = ('from', 'to')
+
+
+def import_object(path):
+    """Imports an object by its dotted path (e.g. ``package.module.Name``
+    or ``package.module:Name``).
+    """
+    if ':' in path:
+        module_name, _, name = path.partition(':')
+    else:
+        module_name, _, name = path.rpartition('.')
+
+    if not module_name:
+        raise ImportError('"{0}" is not a dotted path'.format(path))
+
+    obj = importlib.import_module(module_name)
+    for attr_name in name.split('.'):
+        obj = getattr(obj, attr_name)
+
+    return obj
+
+
+class TimedPlan(object):
+    """Transmutation plan that measures the time spent on each of its
+    attributes, as the transmuter iterates over it.
+    """
+
+    def __init__(self, model_type, plan, timings):
+        self.model_type = model_type
+        self.plan = plan
+        self.timings = timings
+
+    def __len__(self):
+        return len(self.plan)
+
+    def __iter__(self):
+        timings = self.timings
+        timer = default_timer
+
+        for entry in self.plan:
+            start = timer()
+            yield entry
+            elapsed = timer() - start
+
+            key = (self.model_type, entry[1].name)
+            stats = timings.get(key)
+            if stats is None:
+                stats = timings[key] = [0, 0.0]
+
+            stats[0] += 1
+            stats[1] += elapsed
+
+
+def measure_timer_overhead(samples=10000):
+    """Returns the time that a TimedPlan adds to each attribute."""
+    timings = {}
+    attr = Attr('overhead', None)
+
+    for _ in TimedPlan(None, [(None, attr, None, None)] * samples, timings):
+        pass
+
+    count, elapsed = timings[(None, attr.name)]
+    return elapsed / count
+
+
+def make_timed_transmuter(transmuter, timings):
+    """Creates a subclass of a transmuter that records the time spent per
+    model type and attribute into ``timings``.
+    """
+    def get_model_plan(cls, mapped_model_type, compact=False):
+        plans = cls.get_model_plans(compact)
+        plan = plans.get(mapped_model_type)
+
+        if plan is None:
+            plan = plans[mapped_model_type] = TimedPlan(
+                mapped_model_type,
+                transmuter.get_model_plan(mapped_model_type, compact),
+                timings
+            )
+
+        return plan
+
+    return type('Timed' + transmuter.__name__, (transmuter,), {
+        'get_model_plan': classmethod(get_model_plan),
+    })
+
+
+def get_operations(transmuter, model_type, payload):
+    """Returns the functions that run each of the profiled operations."""
+    model = transmuter.transmute_from(payload, model_type)
+
+    return {
+        'from': lambda: transmuter.transmute_from(payload, model_type),
+        'to': lambda: transmuter.transmute_to(model),
+    }
+
+
+def measure_throughput(func, iterations):
+    gc.collect()
+    start = default_timer()
+
+    for _ in range(iterations):
+        func()
+
+    return default_timer() - start
+
+
+def measure_allocations(func):
+    """Returns the peak memory, retained memory and number of retained
+    memory blocks of a single run, or None when tracemalloc isn't available.
+    """
+    if tracemalloc is None:
+        return None
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        start_blocks = _count_blocks()
+        start, _ = tracemalloc.get_traced_memory()
+
+        result = func()
+
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = _count_blocks() - start_blocks
+    finally:
+        tracemalloc.stop()
+
+    del result
+    return peak - start, current - start, blocks
+
+
+def _count_blocks():
+    snapshot = tracemalloc.take_snapshot()
+    return sum(stat.count for stat in snapshot.statistics('filename'))
+
+
+def measure_breakdown(transmuter, model_type, payload, operation,
+                      iterations):
+    """Returns the number of calls and time spent per ``(model_type,
+    attribute name)``, without the overhead of measuring it.
+    """
+    timings = {}
+    timed = make_timed_transmuter(transmuter, timings)
+    func = get_operations(timed, model_type, payload)[operation]
+
+    # Plans are built on the first run, which shouldn't be measured
+    func()
+    timings.clear()
+
+    for _ in range(iterations):
+        func()
+
+    overhead = measure_timer_overhead()
+    for stats in timings.values():
+        stats[1] = max(stats[1] - overhead * stats[0], 0.0)
+
+    return timings
+
+
+def measure_hotspots(func, iterations, top, out):
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    for _ in range(iterations):
+        func()
+
+    profiler.disable()
+
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats('tottime').print_stats(top)
+
+
+def _model_name(model_type):
+    return getattr(model_type, '__qualname__', model_type.__name__)
+
+
+def report_breakdown(timings, iterations, out):
+    models = {}
+    for (model_type, name), (count, elapsed) in timings.items():
+        models.setdefault(model_type, []).append((name, count, elapsed))
+
+    total = sum(elapsed for _, elapsed in timings.values()) or 1.0
+    model_totals = sorted(
+        ((sum(entry[2] for entry in entries), model_type)
+         for model_type, entries in models.items()),
+        key=lambda entry: entry[0],
+        reverse=True
+    )
+
+    out.write('{0:<40}{1:>12}{2:>14}{3:>8}\n'.format(
+        'model / attribute', 'calls/iter', 'usec/iter', 'share'
+    ))
+
+    for model_total, model_type in model_totals:
+        out.write('{0:<40}{1:>12}{2:>14.1f}{3:>7.1f}%\n'.format(
+            _model_name(model_type), '',
+            model_total * 1e6 / iterations, model_total * 100 / total
+        ))
+
+        entries = sorted(models[model_type], key=lambda entry: entry[2],
+                         reverse=True)
+        for name, count, elapsed in entries:
+            out.write('  {0:<38}{1:>12.1f}{2:>14.1f}{3:>7.1f}%\n'.format(
+                name, count / iterations,
+                elapsed * 1e6 / iterations, elapsed * 100 / total
+            ))
+
+
+def profile(model_type, payload, transmuter, operations=OPERATIONS,
+            iterations=100, top=20, out=sys.stdout):
+    """Profiles transmuting a payload into a model type and back, and
+    writes the report to ``out``.
+
+    The report covers the throughput of each operation, the time spent per
+    model type and attribute, the memory that a single run allocates and
+    the top cProfile hotspots.
+
+    :param model_type: The mapped model type to profile.
+    :param payload: Sample payload of the model type.
+    :param transmuter: The transmuter to profile.
+    :param operations: The operations to profile, out of ``'from'`` and
+        ``'to'``.
+    :param iterations: Number of iterations of each operation.
+    :param top: Number of cProfile hotspots to report.
+    :param out: File-like object to write the report to.
+    """
+    funcs = get_operations(transmuter, model_type, payload)
+
+    for operation in operations:
+        func = funcs[operation]
+        func()
+
+        out.write('== transmute_{0} ({1}, {2} iterations) ==\n\n'.format(
+            operation, _model_name(model_type), iterations
+        ))
+
+        elapsed = measure_throughput(func, iterations)
+        out.write('throughput: {0:.1f} ops/sec, {1:.1f} usec/op'.format(
+            iterations / elapsed, elapsed * 1e6 / iterations
+        ))
+        if operation == 'from':
+            out.write(', {0:.2f} MiB/sec'.format(
+                len(payload) * iterations / elapsed / (1024 * 1024)
+            ))
+        out.write('\n')
+
+        allocations = measure_allocations(func)
+        if allocations:
+            out.write('allocations: {0} bytes peak, {1} bytes and {2} '
+                      'blocks retained\n'.format(*allocations))
+
+        out.write('\n')
+        report_breakdown(
+            measure_breakdown(transmuter, model_type, payload, operation,
+                              iterations),
+            iterations,
+            out
+        )
+
+        out.write('\n')
+        measure_hotspots(func, iterations, top, out)
+
+
+def load_payload(path, transmuter):
+    with open(path, 'rb') as payload_file:
+        payload = payload_file.read()
+
+    if issubclass(transmuter, MsgPackTransmuter):
+        return payload
+
+    return payload.decode('utf-8')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='alchemize-profile',
+        description='Profiles transmuting a model with a sample payload.'
+    )
+    parser.add_argument('model',
+                        help='Dotted path of the mapped model type')
+    parser.add_argument('payload', help='Path of a sample payload file')
+    parser.add_argument('-n', '--iterations', type=int, default=100,
+                        help='Number of iterations per operation')
+    parser.add_argument('-t', '--transmuter',
+                        default='alchemize.JsonTransmuter',
+                        help='Dotted path of the transmuter to use')
+    parser.add_argument('-o', '--operation', action='append',
+                        dest='operations', choices=OPERATIONS,
+                        help='Only profile the specified operation(s)')
+    parser.add_argument('--top', type=int, default=20,
+                        help='Number of cProfile hotspots to report')
+    args = parser.parse_args(argv)
+
+    # Models are usually imported from the current project
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    try:
+        model_type = import_object(args.model)
+        transmuter = import_object(args.transmuter)
+    except (ImportError, AttributeError) as err:
+        parser.error(six.text_type(err))
+
+    profile(
+        model_type,
+        load_payload(args.payload, transmuter),
+        transmuter,
+        operations=args.operations or OPERATIONS,
+        iterations=args.iterations,
+        top=args.top
+    )
+
+
+if __name__ == '__main__':
+    main()
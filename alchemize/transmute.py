@@ -13,12 +13,32 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
+import collections
+import datetime
+import decimal
 import json
+import re
+import threading
 import uuid
 import six
 from abc import ABCMeta, abstractmethod
-
-from alchemize.mapping import ExpandedType, JsonMappedModel, get_normalized_map
+from six.moves import collections_abc
+
+from alchemize.mapping import (
+    FROZEN_TYPES,
+    ExpandedType,
+    JsonMappedModel,
+    RawJson,
+    TaggedUnion,
+    clear_mapping_caches,
+    construct_model,
+    get_item_type,
+    get_mapping_fingerprint,
+    get_model_defaults,
+    get_normalized_map,
+    is_container_type,
+    supports_bulk_assignment,
+)
 
 
 NON_CONVERSION_TYPES = [
@@ -33,17 +53,209 @@ NON_CONVERSION_TYPES = [
     six.string_types
 ]
 
-EXPANDED_TYPES = []
+# Attribute classifications used by transmutation plans
+ATTR_MODEL = 1
+ATTR_MODEL_LIST = 2
+ATTR_STANDARD = 3
+ATTR_STANDARD_LIST = 4
+ATTR_EXPANDED = 5
+ATTR_EXPANDED_LIST = 6
+ATTR_UNION = 7
+ATTR_UNION_LIST = 8
+ATTR_CONTAINER = 9
+ATTR_RAW = 10
+
+# Node kinds of compiled container types, next to the ATTR_* leaf kinds
+CONTAINER_LIST = 11
+CONTAINER_DICT = 12
+
+LIST_KINDS = frozenset([
+    ATTR_MODEL_LIST,
+    ATTR_STANDARD_LIST,
+    ATTR_EXPANDED_LIST,
+    ATTR_UNION_LIST,
+])
+
+# Kinds whose values hold child models, which are assigned once populated
+DEFERRED_KINDS = frozenset([
+    ATTR_MODEL,
+    ATTR_MODEL_LIST,
+    ATTR_UNION,
+    ATTR_UNION_LIST,
+    ATTR_CONTAINER,
+])
+
+# Plans are keyed by model type and aren't rebuilt when a mapping changes
+MODEL_PLANS = {}
+CONTAINER_SPECS = {}
+MISSING = object()
+DEFAULT_CHECK_TYPE = six.get_method_function(ExpandedType.check_type)
+
+
+class TypeSnapshot(object):
+    """Immutable set of expanded types as registered at a point in time.
+
+    Lookups are memoized by type when all of the types rely on the default
+    ``ExpandedType.check_type`` implementation.
+    """
+
+    def __init__(self, types=()):
+        self.types = tuple(types)
+        self._type_matches = {}
+        self._instance_matches = {}
+        self._memoize = all(
+            six.get_method_function(item.check_type) is DEFAULT_CHECK_TYPE
+            for item in self.types
+        )
+
+    def lookup(self, current_value):
+        """Returns the first expanded type that matches the value or type."""
+        if not self._memoize:
+            return self._find(current_value)
+
+        if isinstance(current_value, type):
+            cache, key = self._type_matches, current_value
+        else:
+            cache, key = self._instance_matches, type(current_value)
+
+        try:
+            return cache[key]
+        except KeyError:
+            match = cache[key] = self._find(current_value)
+            return match
+
+    def _find(self, current_value):
+        find_exp_type = (
+            item
+            for item in self.types
+            if item.check_type(current_value)
+        )
+
+        return next(find_exp_type, None)
+
+
+class TypeRegistry(object):
+    """Registry of expanded types (unstable feature).
+
+    Changes to the registry replace its snapshot instead of modifying it,
+    so transmutations in progress keep using the snapshot that they started
+    with and never need to acquire a lock.
+
+    Fallback types are always looked up after the regular types, which
+    allows for the built-in types to be overridden.
+
+    A registry with a parent also looks up the types that are currently
+    registered with its parent, after its own regular types.
+    """
+
+    def __init__(self, types=(), fallback_types=(), parent=None):
+        self._lock = threading.Lock()
+        self._types = tuple(types)
+        self._fallback_types = tuple(fallback_types)
+        self._parent = parent
+        self._parent_snapshot = None
+        self._update_snapshot()
+
+    @property
+    def types(self):
+        """Tuple of the currently registered expanded types."""
+        return self.snapshot().types
+
+    def snapshot(self):
+        """Returns the current (immutable) snapshot of the registry."""
+        parent = self._parent
+        if parent is not None and (parent.snapshot()
+                                   is not self._parent_snapshot):
+            with self._lock:
+                self._update_snapshot()
+
+        return self._snapshot
+
+    def register(self, custom_type, fallback=False):
+        """Adds a custom expanded type."""
+        with self._lock:
+            if fallback:
+                self._fallback_types += (custom_type,)
+            else:
+                self._types += (custom_type,)
+
+            self._update_snapshot()
+
+    def remove(self, custom_type):
+        """Removes a custom expanded type."""
+        with self._lock:
+            if custom_type in self._types:
+                types = list(self._types)
+                types.remove(custom_type)
+                self._types = tuple(types)
+            else:
+                types = list(self._fallback_types)
+                types.remove(custom_type)
+                self._fallback_types = tuple(types)
+
+            self._update_snapshot()
+
+    def copy(self):
+        """Creates a new registry with the same registered types.
+
+        Types that are registered with this registry afterwards (e.g. by
+        modules that are imported later on) aren't part of the copy. Use
+        :meth:`derive` to keep them.
+        """
+        return TypeRegistry(self._types, self._fallback_types, self._parent)
+
+    def derive(self):
+        """Creates an empty registry that has this registry as its parent.
+
+        Types registered with the new registry take precedence over the
+        types of this registry, including the ones registered later on,
+        while this registry is left unaffected.
+        """
+        return TypeRegistry(parent=self)
+
+    def _update_snapshot(self):
+        types = self._types
+
+        if self._parent is not None:
+            self._parent_snapshot = self._parent.snapshot()
+            types += self._parent_snapshot.types
+
+        self._snapshot = TypeSnapshot(types + self._fallback_types)
+
+
+class RegisteredTypes(collections_abc.Sequence):
+    """Read-only view of the types that are currently registered with a
+    registry.
+    """
+
+    def __init__(self, registry):
+        self._registry = registry
+
+    def __getitem__(self, index):
+        return self._registry.types[index]
+
+    def __len__(self):
+        return len(self._registry.types)
+
+    def __repr__(self):
+        return repr(list(self._registry.types))
+
+
+TYPE_REGISTRY = TypeRegistry()
+
+# Kept for backwards compatibility. Types can no longer be added or removed
+# through it, which is done with register_type() and remove_type() instead.
+EXPANDED_TYPES = RegisteredTypes(TYPE_REGISTRY)
 
 
 def register_type(custom_type):
     """Adds a custom expanded type (unstable feature)."""
-    EXPANDED_TYPES.append(custom_type)
+    TYPE_REGISTRY.register(custom_type)
 
 
 def remove_type(custom_type):
     """Removes a custom expanded type (unstable feature)."""
-    EXPANDED_TYPES.remove(custom_type)
+    TYPE_REGISTRY.remove(custom_type)
 
 
 try:
@@ -80,6 +292,276 @@ class UUIDType(ExpandedType):
 register_type(UUIDType)
 
 
+# Parsed values of the built-in types are cached by type and input, as the
+# same timestamps tend to appear over and over again. Caches are cleared
+# once they're full, which keeps them bounded without any bookkeeping.
+PARSE_CACHES = {}
+PARSE_CACHE_SIZE = 4096
+
+ISO_DATETIME = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d+))?)?'
+    r'(Z|[+-]\d{2}:?\d{2})?$'
+)
+ISO_DATE = re.compile(r'(\d{4})-(\d{2})-(\d{2})$')
+ISO_TIME = re.compile(
+    r'(\d{2}):(\d{2})(?::(\d{2})(?:\.(\d+))?)?(Z|[+-]\d{2}:?\d{2})?$'
+)
+
+
+try:
+    UTC = datetime.timezone.utc
+    FixedOffset = datetime.timezone
+except AttributeError:  # pragma: no cover
+    class FixedOffset(datetime.tzinfo):
+        """Timezone with a fixed offset from UTC, for Python versions
+        without ``datetime.timezone``.
+        """
+
+        def __init__(self, offset):
+            self._offset = offset
+
+        def utcoffset(self, dt):
+            return self._offset
+
+        def dst(self, dt):
+            return datetime.timedelta(0)
+
+        def tzname(self, dt):
+            return None
+
+    UTC = FixedOffset(datetime.timedelta(0))
+
+
+def _parse_tz(value):
+    if not value:
+        return None
+
+    elif value == 'Z':
+        return UTC
+
+    sign = -1 if value[0] == '-' else 1
+    value = value[1:].replace(':', '')
+    offset = datetime.timedelta(hours=int(value[:2]), minutes=int(value[2:]))
+    return FixedOffset(sign * offset)
+
+
+def _parse_time_parts(hour, minute, second, fraction, tz):
+    return (
+        int(hour),
+        int(minute),
+        int(second or 0),
+        int((fraction or '0')[:6].ljust(6, '0')),
+        _parse_tz(tz),
+    )
+
+
+class TemporalType(ExpandedType):
+    """Abstract base type for the built-in date and time types, which isn't
+    registered itself. Subclasses set ``cls`` and implement
+    :meth:`parse_iso`.
+
+    Values are serialized in ISO 8601 form, unless ``format`` is set to a
+    ``strftime`` format, which is then used in both directions. A custom
+    format is set up by registering a subclass::
+
+        class DateTimeFormat(DateTimeType):
+            format = '%Y-%m-%d %H:%M:%S'
+
+        register_type(DateTimeFormat)
+
+    """
+    format = None
+
+    @classmethod
+    def serialize(cls, value):
+        if cls.format:
+            return value.strftime(cls.format)
+
+        return value.isoformat()
+
+    @classmethod
+    def deserialize(cls, attr_type, value):
+        if isinstance(value, cls.cls):
+            return value
+
+        # Other values aren't parsed, and can't be used as cache keys
+        if not isinstance(value, six.string_types):
+            raise ValueError('Invalid {0} value: {1!r}'.format(
+                cls.cls.__name__, value
+            ))
+
+        cache = PARSE_CACHES.get(cls)
+        if cache is None:
+            cache = PARSE_CACHES.setdefault(cls, {})
+
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+
+        result = cls.parse(value)
+
+        if len(cache) >= PARSE_CACHE_SIZE:
+            cache.clear()
+
+        cache[value] = result
+        return result
+
+    @classmethod
+    def parse(cls, value):
+        """Parses a value with the format of the type."""
+        if cls.format:
+            return cls.from_datetime(
+                datetime.datetime.strptime(value, cls.format)
+            )
+
+        return cls.parse_iso(value)
+
+    @classmethod
+    def from_datetime(cls, value):
+        return value
+
+    @classmethod
+    def parse_iso(cls, value):
+        """Parses a value in ISO 8601 form, which subclasses implement."""
+        raise NotImplementedError(
+            '{0} must implement parse_iso'.format(cls.__name__)
+        )
+
+
+class DateTimeType(TemporalType):
+    cls = datetime.datetime
+
+    @classmethod
+    def parse_iso(cls, value):
+        # PERF: fromisoformat is implemented in C, but older versions
+        # don't support all of the ISO 8601 variations.
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except (AttributeError, ValueError):
+            pass
+
+        match = ISO_DATETIME.match(value)
+        if not match:
+            raise ValueError('Invalid ISO 8601 datetime: {0}'.format(value))
+
+        parts = match.groups()
+        hour, minute, second, micro, tz = _parse_time_parts(*parts[3:])
+        return datetime.datetime(int(parts[0]), int(parts[1]), int(parts[2]),
+                                 hour, minute, second, micro, tz)
+
+
+class DateType(TemporalType):
+    cls = datetime.date
+
+    @classmethod
+    def from_datetime(cls, value):
+        return value.date()
+
+    @classmethod
+    def parse_iso(cls, value):
+        try:
+            return datetime.date.fromisoformat(value)
+        except (AttributeError, ValueError):
+            pass
+
+        match = ISO_DATE.match(value)
+        if not match:
+            raise ValueError('Invalid ISO 8601 date: {0}'.format(value))
+
+        return datetime.date(*[int(part) for part in match.groups()])
+
+
+class TimeType(TemporalType):
+    cls = datetime.time
+
+    @classmethod
+    def from_datetime(cls, value):
+        return value.time()
+
+    @classmethod
+    def parse_iso(cls, value):
+        try:
+            return datetime.time.fromisoformat(value)
+        except (AttributeError, ValueError):
+            pass
+
+        match = ISO_TIME.match(value)
+        if not match:
+            raise ValueError('Invalid ISO 8601 time: {0}'.format(value))
+
+        return datetime.time(*_parse_time_parts(*match.groups()))
+
+
+class DecimalType(ExpandedType):
+    """Decimals are serialized as strings to preserve their precision."""
+    cls = decimal.Decimal
+
+    @classmethod
+    def serialize(cls, value):
+        return str(value)
+
+    @classmethod
+    def deserialize(cls, attr_type, value):
+        # Floats go through their shortest representation (e.g. 0.1 instead
+        # of 0.1000000000000000055511151231257827...)
+        if isinstance(value, float):
+            value = repr(value)
+
+        return attr_type(value)
+
+
+# Datetimes are also dates, so the datetime type needs to be checked first.
+# The built-in types are fallbacks, so registered types take precedence.
+TYPE_REGISTRY.register(DateTimeType, fallback=True)
+TYPE_REGISTRY.register(DateType, fallback=True)
+TYPE_REGISTRY.register(TimeType, fallback=True)
+TYPE_REGISTRY.register(DecimalType, fallback=True)
+
+
+try:
+    import numpy
+
+    NDARRAY_TYPES = {}
+
+    def ndarray_type(dtype):
+        """Creates a mapping type for NumPy arrays of a specific dtype.
+
+        **Mapping Usage**::
+
+            'values': Attr('values', ndarray_type('float32'))
+
+        """
+        dtype = numpy.dtype(dtype)
+        array_type = NDARRAY_TYPES.get(dtype)
+
+        if array_type is None:
+            array_type = NDARRAY_TYPES[dtype] = type(
+                'ndarray[{0}]'.format(dtype.name),
+                (numpy.ndarray,),
+                {'__dtype__': dtype}
+            )
+
+        return array_type
+
+    class NDArrayType(ExpandedType):
+        cls = numpy.ndarray
+
+        @classmethod
+        def serialize(cls, value):
+            return value.tolist()
+
+        @classmethod
+        def deserialize(cls, attr_type, value):
+            # The conversion (and coercion) to the dtype happens in one step
+            dtype = getattr(attr_type, '__dtype__', None)
+            return numpy.asarray(value, dtype=dtype)
+
+    register_type(NDArrayType)
+except ImportError:  # pragma: no cover
+    pass
+
+
 class AlchemizeError(Exception):
     """Base Exception for all Alchemize errors."""
     pass
@@ -102,10 +584,37 @@ class RequiredAttributeError(AlchemizeError):
         )
 
 
+class SchemaMismatchError(AlchemizeError):
+    """Exception that is raised when compact data was encoded with a
+    different mapping than the one it's being decoded with.
+    """
+    def __init__(self, expected, actual):
+        super(SchemaMismatchError, self).__init__(
+            'Expected mapping fingerprint "{}", but got "{}"'.format(
+                expected,
+                actual
+            )
+        )
+
+
+ValidationIssue = collections.namedtuple('ValidationIssue',
+                                         ['path', 'message'])
+
+
 class AbstractBaseTransmuter(object):
-    """The abtract base class from which all Transmuters are built."""
+    """The abtract base class from which all Transmuters are built.
+
+    Expanded types are looked up in ``__type_registry__``, which defaults to
+    the global registry used by ``register_type()``. A transmuter can be
+    given its own registry to keep its types isolated::
+
+        class TenantTransmuter(JsonTransmuter):
+            __type_registry__ = TYPE_REGISTRY.derive()
+
+    """
     __metaclass__ = ABCMeta
     __supported_base_mappings__ = []
+    __type_registry__ = TYPE_REGISTRY
 
     @classmethod
     def _check_supported_mapping(cls, mapped_model, ignore_failure=False):
@@ -146,6 +655,243 @@ class AbstractBaseTransmuter(object):
         """
         cls._check_supported_mapping(mapped_model_type)
 
+    @classmethod
+    def get_model_plans(cls, compact=False):
+        """Returns the plan cache of the transmuter keyed by model type."""
+        return MODEL_PLANS.setdefault((cls, compact), {})
+
+    @classmethod
+    def clear_model_plans(cls, mapped_model_type=None):
+        """Removes the cached plans of a mapped model type, or of every
+        model type, so they're rebuilt from the current mappings.
+
+        The mapping fingerprints, key paths and other caches derived from
+        mappings are cleared for every model type, as they cover nested
+        models too (see :func:`alchemize.mapping.clear_mapping_caches`).
+        """
+        for plans in (cls.get_model_plans(), cls.get_model_plans(True)):
+            if mapped_model_type is None:
+                plans.clear()
+            else:
+                plans.pop(mapped_model_type, None)
+                plans.pop(FROZEN_TYPES.get(mapped_model_type), None)
+
+        clear_mapping_caches()
+
+    @classmethod
+    def get_model_plan(cls, mapped_model_type, compact=False):
+        """Returns the transmutation plan of a mapped model type.
+
+        A plan is the resolved mapping of the model with each attribute
+        classified up front, as a list of ``(key, attr, kind, bulk)`` tuples.
+        ``bulk`` determines if the attribute can be assigned directly through
+        the instance ``__dict__``. Plans are built once and cached on a per
+        transmuter basis. Changes to a ``__mapping__`` after a model type is
+        first transmuted aren't picked up, unless its plans are removed with
+        :meth:`clear_model_plans`.
+
+        Compact plans are ordered by key and use each attribute's position
+        in place of its key.
+        """
+        plans = cls.get_model_plans(compact)
+        plan = plans.get(mapped_model_type)
+
+        if plan is None and compact:
+            plan = plans[mapped_model_type] = [
+                (idx, attr, kind, bulk)
+                for idx, (_, attr, kind, bulk) in enumerate(sorted(
+                    cls.get_model_plan(mapped_model_type),
+                    key=lambda entry: entry[0]
+                ))
+            ]
+
+        elif plan is None:
+            plan = plans[mapped_model_type] = [
+                (
+                    key,
+                    attr,
+                    cls.classify_attr(attr),
+                    supports_bulk_assignment(mapped_model_type, attr.name)
+                )
+                for key, attr in get_normalized_map(mapped_model_type).items()
+            ]
+
+        return plan
+
+    @classmethod
+    def classify_attr(cls, attr):
+        """Determines how the transmuter needs to handle an attribute."""
+        attr_type = attr.type
+
+        if is_container_type(attr_type):
+            return ATTR_CONTAINER
+
+        elif attr_type is RawJson:
+            return ATTR_RAW
+
+        elif cls._check_supported_mapping(attr_type, True):
+            return ATTR_MODEL
+
+        elif cls.is_list_of_mapping_types(attr_type):
+            return ATTR_MODEL_LIST
+
+        elif isinstance(attr_type, TaggedUnion):
+            return ATTR_UNION
+
+        elif (isinstance(attr_type, list) and len(attr_type) == 1
+                and isinstance(attr_type[0], TaggedUnion)):
+            return ATTR_UNION_LIST
+
+        elif attr_type in NON_CONVERSION_TYPES:
+            return ATTR_STANDARD
+
+        elif isinstance(attr_type, list) and attr_type:
+            if attr_type[0] in NON_CONVERSION_TYPES:
+                return ATTR_STANDARD_LIST
+
+            return ATTR_EXPANDED_LIST
+
+        return ATTR_EXPANDED
+
+    @classmethod
+    def get_container_spec(cls, attr_type):
+        """Compiles a container type, such as ``{str: Model}`` or
+        ``[[Model]]``, into nested ``(kind, item)`` nodes. Nodes of lists and
+        dicts hold the node of their items, while leaf nodes hold a model
+        type, union, standard type or expanded type. Specs are cached on a
+        per transmuter basis.
+        """
+        key = (cls, id(attr_type))
+        cached = CONTAINER_SPECS.get(key)
+        if cached is not None and cached[0] is attr_type:
+            return cached[1]
+
+        if isinstance(attr_type, dict):
+            spec = (CONTAINER_DICT,
+                    cls.get_container_spec(get_item_type(attr_type)))
+
+        elif isinstance(attr_type, list) and len(attr_type) == 1:
+            spec = (CONTAINER_LIST, cls.get_container_spec(attr_type[0]))
+
+        elif cls._check_supported_mapping(attr_type, True):
+            spec = (ATTR_MODEL, attr_type)
+
+        elif isinstance(attr_type, TaggedUnion):
+            spec = (ATTR_UNION, attr_type)
+
+        elif attr_type is RawJson:
+            spec = (ATTR_RAW, attr_type)
+
+        elif attr_type in NON_CONVERSION_TYPES:
+            spec = (ATTR_STANDARD, attr_type)
+
+        else:
+            spec = (ATTR_EXPANDED, attr_type)
+
+        # The type is kept alive alongside its spec, so its id can't be reused
+        CONTAINER_SPECS[key] = (attr_type, spec)
+        return spec
+
+    @classmethod
+    def _encode_container(cls, spec, value, stack, lookup, coerce, compact):
+        """Builds the result of a container value. Child models are pushed
+        onto the stack along with the result that they populate.
+        """
+        if value is None:
+            return None
+
+        kind, item = spec
+
+        if kind == CONTAINER_LIST:
+            return [
+                cls._encode_container(item, child, stack, lookup, coerce,
+                                      compact)
+                for child in value
+            ]
+
+        elif kind == CONTAINER_DICT:
+            return dict(
+                (key, cls._encode_container(item, child, stack, lookup,
+                                            coerce, compact))
+                for key, child in value.items()
+            )
+
+        elif kind == ATTR_MODEL:
+            result = cls._new_result(value, compact)
+            stack.append((value, result))
+            return result
+
+        elif kind == ATTR_UNION:
+            result, child_result = cls._encode_union(item, value, compact)
+            stack.append((value, child_result))
+            return result
+
+        elif kind == ATTR_STANDARD:
+            return item(value) if coerce else value
+
+        # Documents inside of containers are encoded with the container
+        elif kind == ATTR_RAW:
+            return value.value if isinstance(value, RawJson) else value
+
+        expanded = lookup(value)
+        if expanded:
+            return expanded.serialize(value)
+
+    @classmethod
+    def _decode_container(cls, spec, val, stack, lookup, coerce, compact):
+        """Builds the value of a container from its data. Child models are
+        created right away and pushed onto the stack to be populated.
+        Data that doesn't match the shape of the container decodes to None.
+        """
+        if val is None:
+            return None
+
+        kind, item = spec
+
+        if kind == CONTAINER_LIST:
+            if not isinstance(val, list):
+                return None
+
+            return [
+                cls._decode_container(item, child, stack, lookup, coerce,
+                                      compact)
+                for child in val
+            ]
+
+        elif kind == CONTAINER_DICT:
+            if not isinstance(val, dict):
+                return None
+
+            return dict(
+                (key, cls._decode_container(item, child, stack, lookup,
+                                            coerce, compact))
+                for key, child in val.items()
+            )
+
+        elif kind == ATTR_MODEL:
+            obj = construct_model(item)
+            stack.append((val, item, obj, False))
+            return obj
+
+        elif kind == ATTR_UNION:
+            child_type, val = cls._decode_union(item, val, compact)
+            if child_type is None:
+                return None
+
+            obj = construct_model(child_type)
+            stack.append((val, child_type, obj, False))
+            return obj
+
+        elif kind == ATTR_STANDARD:
+            return item(val) if coerce else val
+
+        elif kind == ATTR_RAW:
+            return RawJson.from_value(val)
+
+        expanded = lookup(item)
+        if expanded:
+            return expanded.deserialize(item, val)
+
     @classmethod
     def is_list_of_mapping_types(cls, attr_type):
         if isinstance(attr_type, list) and len(attr_type) == 1:
@@ -169,13 +915,85 @@ class AbstractBaseTransmuter(object):
 
     @classmethod
     def get_expanded_type(cls, current_value):
-        find_exp_type = (
-            item
-            for item in EXPANDED_TYPES
-            if item.check_type(current_value)
-        )
+        return cls.__type_registry__.snapshot().lookup(current_value)
+
+    @staticmethod
+    def _serialize_expanded(lookup, attr, current_value, options):
+        if isinstance(attr.type, list) and attr.type:
+            item_type = lookup(attr.type[0])
+            if item_type:
+                return [item_type.serialize(item) for item in current_value]
+
+        item = lookup(current_value)
+        if item and item.transmute_options:
+            return item.serialize(current_value, **options)
+
+        elif item:
+            return item.serialize(current_value)
+
+    @staticmethod
+    def _deserialize_expanded(lookup, attr, value):
+        if isinstance(attr.type, list) and attr.type:
+            attr_type = attr.type[0]
+            item_type = lookup(attr_type)
+            if item_type:
+                return [item_type.deserialize(attr_type, item)
+                        for item in value]
+
+        item = lookup(attr.type)
+        if item:
+            return item.deserialize(attr.type, value)
 
-        return next(find_exp_type, None)
+    @classmethod
+    def _encode_union(cls, union, child, compact=False):
+        """Creates the result for a union member, which is returned along
+        with the part of the result that the child model populates.
+        """
+        tag = union.get_tag(child)
+        if tag is None:
+            raise UnsupportedMappedModelError(
+                '{0} is not part of the union'.format(type(child).__name__)
+            )
+
+        child_result = cls._new_result(child, compact)
+
+        if compact:
+            return [tag, child_result], child_result
+
+        if union.injects_tag(type(child)):
+            child_result[union.key] = tag
+
+        return child_result, child_result
+
+    @staticmethod
+    def _decode_union(union, val, compact=False):
+        """Returns the model type and data of a union member. The model type
+        is None for unknown tags of lenient unions.
+        """
+        if compact:
+            tag, val = val
+        else:
+            tag = val.get(union.key)
+
+        child_type = union.types.get(tag)
+        if child_type is None and union.strict:
+            raise AlchemizeError(
+                'Unknown type "{0}" for the "{1}" union'.format(tag, union.key)
+            )
+
+        return child_type, val
+
+    @classmethod
+    def _new_result(cls, mapped_model, compact=False):
+        if compact:
+            plan = cls.get_model_plan(type(mapped_model), compact=True)
+            return [None] * len(plan)
+
+        # Support Attribute Wrapping
+        if mapped_model.__wrapped_attr_name__:
+            return {mapped_model.__wrapped_attr_name__: {}}
+
+        return {}
 
     @classmethod
     def convert_standard_types(cls, attr, current_value, coerce_values):
@@ -202,7 +1020,7 @@ class JsonTransmuter(AbstractBaseTransmuter):
     @classmethod
     def transmute_to(cls, mapped_model, to_string=True, assign_all=False,
                      coerce_values=True, serialize_all=False, encoder=None,
-                     encoder_kwargs=None):
+                     encoder_kwargs=None, compact=False, omit_defaults=False):
         """Converts a model based off of a JsonMappedModel into JSON.
 
         :param mapped_model: An instance of a subclass of JsonMappedModel.
@@ -217,104 +1035,193 @@ class JsonTransmuter(AbstractBaseTransmuter):
         :param encoder: module that implements dumps(...).
         :param encoder_kwargs: A dictionary containing kwargs to be used
             with the encoder.
+        :param compact: Boolean value to encode models as positional arrays
+            instead of objects. See :ref:`compact-mode`.
+        :param omit_defaults: Boolean value to leave out values that are
+            equal to the class-level default of their attribute. This takes
+            precedence over assign_all.
         :returns: A string or dictionary containing the JSON form of your
             mapped model.
         """
         super(JsonTransmuter, cls).transmute_to(mapped_model)
-        result = {}
         encoder = encoder or json
         encoder_kwargs = encoder_kwargs or {}
 
         if not mapped_model:
             return None
 
-        for name, attr in get_normalized_map(mapped_model).items():
-            attr_value = None
-
-            # Make we ignore values that shouldn't be serialized
-            if not serialize_all and not attr.serialize:
-                continue
+        plans = cls.get_model_plans(compact)
+        convert = cls.convert_standard_types
+        lookup = cls.__type_registry__.snapshot().lookup
+        result = cls._new_result(mapped_model, compact)
+        stack = [(mapped_model, result)]
+        options = {
+            'serialize_all': serialize_all,
+            'assign_all': assign_all,
+            'coerce_values': coerce_values,
+            'compact': compact,
+        }
+        raw_texts = []
+        raw_token = None
+
+        # The model graph is walked with an explicit stack instead of
+        # recursion. Child results are attached to their parent right away
+        # and filled in once the child is popped off of the stack.
+        while stack:
+            model, model_result = stack.pop()
+            model_type = type(model)
+            plan = (plans.get(model_type)
+                    or cls.get_model_plan(model_type, compact))
+            defaults = get_model_defaults(model_type) if omit_defaults else {}
+
+            if model.__wrapped_attr_name__ and not compact:
+                model_result = model_result[model.__wrapped_attr_name__]
+
+            for name, attr, kind, _ in plan:
+                # Make we ignore values that shouldn't be serialized
+                if not serialize_all and not attr.serialize:
+                    continue
+
+                current_value = getattr(model, attr.name, MISSING)
+                if current_value is MISSING:
+                    if attr.required:
+                        raise RequiredAttributeError(attr.name)
+                    continue
+
+                default = defaults.get(attr.name, MISSING)
+                if (default is not MISSING
+                        and type(current_value) is type(default)
+                        and current_value == default):
+                    continue
+
+                attr_value = None
 
-            if hasattr(mapped_model, attr.name):
-                current_value = getattr(mapped_model, attr.name)
                 # Convert a single mapped object
-                if cls._check_supported_mapping(attr.type, True):
-                    attr_value = cls.transmute_to(
-                        mapped_model=current_value,
-                        to_string=False,
-                        assign_all=assign_all,
-                        coerce_values=coerce_values,
-                        serialize_all=serialize_all,
-                        encoder=encoder,
-                        encoder_kwargs=encoder_kwargs
-                    )
+                if kind == ATTR_MODEL:
+                    if current_value:
+                        attr_value = cls._new_result(current_value, compact)
+                        stack.append((current_value, attr_value))
 
                 # Converts lists of mapped objects
-                elif (cls.is_list_of_mapping_types(attr.type)
+                elif (kind == ATTR_MODEL_LIST
                       and isinstance(current_value, list)):
-                    attr_value = [
-                        cls.transmute_to(
-                            mapped_model=child,
-                            to_string=False,
-                            assign_all=assign_all,
-                            coerce_values=coerce_values,
-                            serialize_all=serialize_all,
-                            encoder=encoder,
-                            encoder_kwargs=encoder_kwargs
+                    attr_value = []
+                    children = []
+
+                    for child in current_value:
+                        child_result = None
+                        if child:
+                            child_result = cls._new_result(child, compact)
+                            children.append((child, child_result))
+
+                        attr_value.append(child_result)
+
+                    children.reverse()
+                    stack.extend(children)
+
+                # Convert a single member of a union
+                elif kind == ATTR_UNION:
+                    if current_value:
+                        attr_value, child_result = cls._encode_union(
+                            attr.type,
+                            current_value,
+                            compact
                         )
-                        for child in current_value
-                    ]
+                        stack.append((current_value, child_result))
 
-                # Converts all other objects (if possible)
-                elif attr.type in NON_CONVERSION_TYPES:
-                    attr_value = cls.convert_standard_types(
-                        attr,
+                # Converts lists of union members
+                elif (kind == ATTR_UNION_LIST
+                      and isinstance(current_value, list)):
+                    attr_value = []
+                    children = []
+
+                    for child in current_value:
+                        child_value = None
+                        if child:
+                            child_value, child_result = cls._encode_union(
+                                attr.type[0],
+                                child,
+                                compact
+                            )
+                            children.append((child, child_result))
+
+                        attr_value.append(child_value)
+
+                    children.reverse()
+                    stack.extend(children)
+
+                # Converts dicts and nested lists of values
+                elif kind == ATTR_CONTAINER:
+                    children = []
+                    attr_value = cls._encode_container(
+                        cls.get_container_spec(attr.type),
                         current_value,
-                        coerce_values
+                        children,
+                        lookup,
+                        coerce_values if attr.coerce is None else attr.coerce,
+                        compact
                     )
+                    children.reverse()
+                    stack.extend(children)
+
+                # Raw documents are replaced by placeholders, which are
+                # swapped for their text once the result is encoded.
+                elif kind == ATTR_RAW:
+                    if not isinstance(current_value, RawJson):
+                        current_value = RawJson.from_value(current_value)
+
+                    if to_string:
+                        raw_token = raw_token or uuid.uuid4().hex
+                        attr_value = '{0}:{1}'.format(raw_token,
+                                                      len(raw_texts))
+                        raw_texts.append(current_value.text)
+                    else:
+                        attr_value = current_value.value
+
+                # Converts all other objects (if possible)
+                elif kind == ATTR_STANDARD:
+                    attr_value = convert(attr, current_value, coerce_values)
 
                 # Convert lists of other objects (if possible)
-                elif cls.is_list_of_other_types(attr):
-                    attr_type = attr.type[0]
-                    if attr_type in NON_CONVERSION_TYPES:
-                        attr_value = [
-                            cls.convert_standard_types(
-                                attr,
-                                item,
-                                coerce_values
-                            )
-                            for item in current_value
-                        ]
-                    else:
-                        item_type = cls.get_expanded_type(attr_type)
-                        if item_type:
-                            attr_value = [
-                                item_type.serialize(item)
-                                for item in current_value
-                            ]
+                elif kind == ATTR_STANDARD_LIST:
+                    attr_value = [
+                        convert(attr, item, coerce_values)
+                        for item in current_value
+                    ]
 
                 # Support Expanded Types
                 else:
-                    item = cls.get_expanded_type(current_value)
-
-                    if item:
-                        attr_value = item.serialize(current_value)
+                    attr_value = cls._serialize_expanded(
+                        lookup,
+                        attr,
+                        current_value,
+                        options
+                    )
 
                 if assign_all or attr_value is not None:
-                    result[name] = attr_value
+                    model_result[name] = attr_value
 
-            elif attr.required:
-                raise RequiredAttributeError(attr.name)
+        if compact:
+            result = [get_mapping_fingerprint(type(mapped_model)), result]
 
-        # Support Attribute Wrapping
-        if mapped_model.__wrapped_attr_name__:
-            result = {mapped_model.__wrapped_attr_name__: result}
+        if not to_string:
+            return result
 
-        return encoder.dumps(result, **encoder_kwargs) if to_string else result
+        output = encoder.dumps(result, **encoder_kwargs)
+
+        if raw_texts:
+            output = re.sub(
+                '"{0}:(\\d+)"'.format(raw_token),
+                lambda match: raw_texts[int(match.group(1))],
+                output
+            )
+
+        return output
 
     @classmethod
     def transmute_from(cls, data, mapped_model_type, coerce_values=False,
-                       decoder=None, decoder_kwargs=None):
+                       decoder=None, decoder_kwargs=None, compact=False,
+                       cache=None):
         """Converts a JSON string or dict into a corresponding Mapping Object.
 
         :param data: JSON data in string or dictionary form.
@@ -324,89 +1231,528 @@ class JsonTransmuter(AbstractBaseTransmuter):
         :param decoder: A module that implements loads(...).
         :param decoder_kwargs: A dictionary containing kwargs to use
             with the decoder.
+        :param compact: Boolean value to decode data that was encoded with
+            the compact mode of transmute_to.
+        :param cache: An optional :class:`alchemize.DecodeCache` that
+            returns the model of a string that was decoded before.
         :returns: An instance of your mapped model type.
         """
         super(JsonTransmuter, cls).transmute_from(data, mapped_model_type)
+
+        if cache is not None:
+            return cache.decode(
+                cls,
+                data,
+                mapped_model_type,
+                coerce_values=coerce_values,
+                decoder=decoder,
+                decoder_kwargs=decoder_kwargs,
+                compact=compact
+            )
         decoder = decoder or json
         decoder_kwargs = decoder_kwargs or {}
 
-        json_dict = data
-        if isinstance(data, six.string_types):
-            json_dict = decoder.loads(data, **decoder_kwargs)
+        if compact:
+            data = cls._unwrap_compact(data, mapped_model_type, decoder,
+                                       decoder_kwargs)
 
-        mapped_obj = mapped_model_type()
+        mapped_obj = construct_model(mapped_model_type)
+        cls._decode(data, mapped_model_type, mapped_obj, False,
+                    coerce_values, decoder, decoder_kwargs, compact)
 
-        # Support Attribute Wrapping
-        if mapped_obj.__wrapped_attr_name__:
-            json_dict = json_dict.get(mapped_obj.__wrapped_attr_name__)
+        return mapped_obj
 
-        for name, attr in get_normalized_map(mapped_model_type).items():
-            val = json_dict.get(name)
-            attr_value = None
+    @classmethod
+    def transmute_into(cls, data, mapped_model, coerce_values=False,
+                       decoder=None, decoder_kwargs=None):
+        """Updates an existing Mapping Object with a JSON string or dict.
 
-            if attr.required and val is None:
-                raise RequiredAttributeError(name)
+        Only the attributes that are present in the data are updated. Child
+        models that already exist are updated in place instead of being
+        re-created. Items of lists of child models are matched up by their
+        position, or by the key that is declared with ``__merge_key__`` on
+        the child model type.
 
-            # PERF: If the value isn't there, lets just skip-on forward
-            elif val is None:
+        :param data: JSON data in string or dictionary form.
+        :param mapped_model: An instance of a subclass of JsonMappedModel.
+        :param coerce_values: Boolean value to allow for values with python
+            types to be coerced with their mapped type.
+        :param decoder: A module that implements loads(...).
+        :param decoder_kwargs: A dictionary containing kwargs to use
+            with the decoder.
+        :returns: The updated mapped model.
+        """
+        mapped_model_type = type(mapped_model)
+        super(JsonTransmuter, cls).transmute_from(data, mapped_model_type)
+
+        if mapped_model.__frozen__:
+            raise AlchemizeError('Unable to transmute into a frozen model')
+
+        cls._decode(data, mapped_model_type, mapped_model, True,
+                    coerce_values, decoder or json, decoder_kwargs or {},
+                    False)
+
+        return mapped_model
+
+    @classmethod
+    def _decode(cls, data, mapped_model_type, mapped_obj, merge,
+                coerce_values, decoder, decoder_kwargs, compact):
+        plans = cls.get_model_plans(compact)
+        convert = cls.convert_standard_types
+        lookup = cls.__type_registry__.snapshot().lookup
+        stack = [(data, mapped_model_type, mapped_obj, merge)]
+        fast_constructed = []
+
+        # Same as with transmute_to, child models are created when their
+        # parent is processed and populated once popped off of the stack.
+        # Existing models that are being merged into are flagged with merge.
+        # Attributes that hold child models are only assigned once all of
+        # the children are populated, through an entry without a model type
+        # that sits below the children on the stack.
+        while stack:
+            json_dict, model_type, obj, merge = stack.pop()
+
+            if model_type is None:
+                obj_dict = merge
+                for name, attr_value, bulk in json_dict:
+                    if obj_dict is not None and bulk:
+                        obj_dict[name] = attr_value
+                    else:
+                        setattr(obj, name, attr_value)
                 continue
 
-            # Convert a single mapped object
-            if cls._check_supported_mapping(attr.type, True):
-                attr_value = cls.transmute_from(
-                    val,
-                    attr.type,
-                    coerce_values=coerce_values,
-                    decoder=decoder,
-                    decoder_kwargs=decoder_kwargs
-                )
+            plan = (plans.get(model_type)
+                    or cls.get_model_plan(model_type, compact))
+            obj_dict = None
+            values = {}
+            pending = []
+            deferred = []
+
+            if model_type.__fast_construct__:
+                obj_dict = getattr(obj, '__dict__', None)
+                if not merge:
+                    fast_constructed.append(obj)
+
+            if isinstance(json_dict, six.string_types):
+                json_dict = decoder.loads(json_dict, **decoder_kwargs)
+
+            if compact:
+                get_value = json_dict.__getitem__
+            else:
+                # Support Attribute Wrapping
+                if obj.__wrapped_attr_name__:
+                    json_dict = json_dict.get(obj.__wrapped_attr_name__)
+
+                get_value = json_dict.get
+
+            for name, attr, kind, bulk in plan:
+                val = get_value(name)
+
+                if val is None:
+                    if attr.required and not merge:
+                        raise RequiredAttributeError(
+                            attr.name if compact else name
+                        )
+
+                    # PERF: If the value isn't there, lets just skip-on forward
+                    continue
+
+                # Convert a single mapped object
+                if kind == ATTR_MODEL:
+                    attr_value = None
+                    if merge:
+                        attr_value = cls._get_mergeable(obj, attr.name,
+                                                        attr.type)
+
+                    child_merge = attr_value is not None
+                    if not child_merge:
+                        attr_value = construct_model(attr.type)
+
+                    pending.append((val, attr.type, attr_value, child_merge))
+
+                # Converts lists of mapped objects
+                elif kind == ATTR_MODEL_LIST and isinstance(val, list):
+                    child_type = attr.type[0]
+
+                    if merge:
+                        attr_value, children = cls._merge_children(
+                            getattr(obj, attr.name, None),
+                            [(item, None if item is None else child_type)
+                             for item in val]
+                        )
+                        pending.extend(children)
+                    else:
+                        attr_value = [construct_model(child_type) for _ in val]
+                        pending.extend(
+                            (val[idx], child_type, attr_value[idx], False)
+                            for idx in range(len(val) - 1, -1, -1)
+                        )
+
+                # Convert a single member of a union
+                elif kind == ATTR_UNION:
+                    child_type, val = cls._decode_union(attr.type, val,
+                                                        compact)
+                    attr_value = None
+                    if child_type is not None:
+                        if merge:
+                            attr_value = cls._get_mergeable(obj, attr.name,
+                                                            child_type)
+
+                        child_merge = attr_value is not None
+                        if not child_merge:
+                            attr_value = construct_model(child_type)
+
+                        pending.append((val, child_type, attr_value,
+                                        child_merge))
+
+                # Converts lists of union members
+                elif kind == ATTR_UNION_LIST and isinstance(val, list):
+                    items = []
+
+                    for item in val:
+                        child_type = None
+                        if item is not None:
+                            child_type, item = cls._decode_union(
+                                attr.type[0],
+                                item,
+                                compact
+                            )
+
+                        items.append((item, child_type))
 
-            # Converts lists of mapped objects
-            elif (cls.is_list_of_mapping_types(attr.type)
-                  and isinstance(val, list)):
-                attr_value = [
-                    cls.transmute_from(
-                        child,
-                        attr.type[0],
-                        coerce_values=coerce_values,
-                        decoder=decoder,
-                        decoder_kwargs=decoder_kwargs
+                    attr_value, children = cls._merge_children(
+                        getattr(obj, attr.name, None) if merge else None,
+                        items
+                    )
+                    pending.extend(children)
+
+                # Converts dicts and nested lists of values. Containers
+                # are always rebuilt, even when merging.
+                elif kind == ATTR_CONTAINER:
+                    children = []
+                    attr_value = cls._decode_container(
+                        cls.get_container_spec(attr.type),
+                        val,
+                        children,
+                        lookup,
+                        coerce_values if attr.coerce is None else attr.coerce,
+                        compact
                     )
-                    for child in val
-                ]
+                    children.reverse()
+                    pending.extend(children)
 
-            # Converts all other objects (if possible)
-            elif attr.type in NON_CONVERSION_TYPES:
-                attr_value = cls.convert_standard_types(
-                    attr,
-                    val,
-                    coerce_values
-                )
+                elif kind == ATTR_RAW:
+                    attr_value = RawJson.from_value(val)
+
+                # Converts all other objects (if possible)
+                elif kind == ATTR_STANDARD:
+                    attr_value = convert(attr, val, coerce_values)
 
-            # Convert lists of other objects (if possible)
-            elif cls.is_list_of_other_types(attr):
-                attr_type = attr.type[0]
-                if attr_type in NON_CONVERSION_TYPES:
+                # Convert lists of other objects (if possible)
+                elif kind == ATTR_STANDARD_LIST:
                     attr_value = [
-                        cls.convert_standard_types(attr, item, coerce_values)
+                        convert(attr, item, coerce_values)
                         for item in val
                     ]
+
+                # Support Expanded Types
                 else:
-                    item_type = cls.get_expanded_type(attr_type)
-                    if item_type:
-                        attr_value = [
-                            item_type.deserialize(attr_type, item)
-                            for item in val
-                        ]
-
-            # Support Expanded Types
-            else:
-                item = cls.get_expanded_type(attr.type)
+                    attr_value = cls._deserialize_expanded(lookup, attr, val)
+
+                if kind in DEFERRED_KINDS:
+                    deferred.append((attr.name, attr_value, bulk))
 
-                if item:
-                    attr_value = item.deserialize(attr.type, val)
+                # Add mapped value to the new mapped_obj is possible
+                elif obj_dict is not None and bulk:
+                    values[attr.name] = attr_value
+                else:
+                    setattr(obj, attr.name, attr_value)
 
-            # Add mapped value to the new mapped_obj is possible
-            setattr(mapped_obj, attr.name, attr_value)
+            # PERF: Values that are stored directly in the instance __dict__
+            # are assigned in bulk with a single update.
+            if values:
+                obj_dict.update(values)
 
-        return mapped_obj
+            if deferred:
+                stack.append((deferred, None, obj, obj_dict))
+            stack.extend(pending)
+
+        # Children are always constructed after their parents, so walking
+        # backwards guarantees that children are ready before their parent.
+        for obj in reversed(fast_constructed):
+            obj.__post_decode__()
+
+    @classmethod
+    def validate(cls, data, mapped_model_type, decoder=None,
+                 decoder_kwargs=None):
+        """Checks JSON data against the mapping of a model type without
+        creating any models.
+
+        Required attributes, the shape of child models and lists, and if
+        values can be coerced into their mapped types are all checked.
+
+        :param data: JSON data in string or dictionary form.
+        :param mapped_model_type: A type that extends the JsonMappedModel base.
+        :param decoder: A module that implements loads(...).
+        :param decoder_kwargs: A dictionary containing kwargs to use
+            with the decoder.
+        :returns: A list of :class:`ValidationIssue` tuples with the key path
+            and message of each problem. The list is empty for valid data.
+        """
+        super(JsonTransmuter, cls).transmute_from(data, mapped_model_type)
+        decoder = decoder or json
+        decoder_kwargs = decoder_kwargs or {}
+
+        if isinstance(data, six.string_types):
+            try:
+                data = decoder.loads(data, **decoder_kwargs)
+            except ValueError as err:
+                return [ValidationIssue('', 'Invalid JSON: {0}'.format(err))]
+
+        plans = cls.get_model_plans()
+        lookup = cls.__type_registry__.snapshot().lookup
+        issues = []
+        # PERF: Paths are kept as (parent, key) pairs and only joined
+        # together for the paths of issues.
+        stack = [(data, mapped_model_type, None)]
+
+        while stack:
+            json_dict, model_type, path = stack.pop()
+            plan = plans.get(model_type) or cls.get_model_plan(model_type)
+
+            # Support Attribute Wrapping
+            wrapped_name = model_type.__wrapped_attr_name__
+            if wrapped_name and isinstance(json_dict, dict):
+                path = (path, wrapped_name)
+                json_dict = json_dict.get(wrapped_name)
+
+            if not isinstance(json_dict, dict):
+                issues.append((path, 'Expected an object'))
+                continue
+
+            for name, attr, kind, _ in plan:
+                val = json_dict.get(name)
+
+                if val is None:
+                    if attr.required:
+                        issues.append(((path, name), 'Attribute is required'))
+                    continue
+
+                if kind in LIST_KINDS and not isinstance(val, list):
+                    issues.append(((path, name), 'Expected a list'))
+                    continue
+
+                if kind == ATTR_MODEL:
+                    stack.append((val, attr.type, (path, name)))
+
+                elif kind == ATTR_MODEL_LIST:
+                    attr_path = (path, name)
+                    stack.extend(
+                        (item, attr.type[0], (attr_path, idx))
+                        for idx, item in enumerate(val)
+                        if item is not None
+                    )
+
+                elif kind == ATTR_UNION:
+                    cls._validate_union(attr.type, val, (path, name), stack,
+                                        issues)
+
+                elif kind == ATTR_UNION_LIST:
+                    attr_path = (path, name)
+                    for idx, item in enumerate(val):
+                        if item is not None:
+                            cls._validate_union(attr.type[0], item,
+                                                (attr_path, idx), stack,
+                                                issues)
+
+                elif kind == ATTR_CONTAINER:
+                    cls._validate_container(
+                        cls.get_container_spec(attr.type), val, (path, name),
+                        stack, issues, lookup
+                    )
+
+                # Raw documents are opaque, so any value is valid
+                elif kind == ATTR_RAW:
+                    continue
+
+                elif kind == ATTR_STANDARD:
+                    if type(val) is not attr.type:
+                        cls._validate_value(attr, val, (path, name), issues)
+
+                elif kind == ATTR_STANDARD_LIST:
+                    item_type = attr.type[0]
+                    for idx, item in enumerate(val):
+                        if type(item) is not item_type:
+                            cls._validate_value(attr, item,
+                                                ((path, name), idx), issues)
+
+                # Support Expanded Types
+                else:
+                    try:
+                        cls._deserialize_expanded(lookup, attr, val)
+                    except Exception as err:
+                        issues.append((
+                            (path, name),
+                            'Invalid value: {0}'.format(err)
+                        ))
+
+        return sorted(
+            ValidationIssue(cls._join_path(path), message)
+            for path, message in issues
+        )
+
+    @staticmethod
+    def _join_path(path):
+        keys = []
+        while path is not None:
+            path, key = path
+            keys.append(six.text_type(key))
+
+        keys.reverse()
+        return ''.join('/' + key for key in keys)
+
+    @classmethod
+    def _validate_value(cls, attr, val, path, issues):
+        try:
+            cls.convert_standard_types(attr, val, True)
+        except (TypeError, ValueError) as err:
+            issues.append((path, 'Invalid value: {0}'.format(err)))
+
+    @classmethod
+    def _validate_container(cls, spec, val, path, stack, issues, lookup):
+        if val is None:
+            return
+
+        kind, item = spec
+
+        if kind == CONTAINER_LIST:
+            if not isinstance(val, list):
+                issues.append((path, 'Expected a list'))
+                return
+
+            for idx, child in enumerate(val):
+                cls._validate_container(item, child, (path, idx), stack,
+                                        issues, lookup)
+
+        elif kind == CONTAINER_DICT:
+            if not isinstance(val, dict):
+                issues.append((path, 'Expected an object'))
+                return
+
+            for key, child in val.items():
+                cls._validate_container(item, child, (path, key), stack,
+                                        issues, lookup)
+
+        elif kind == ATTR_MODEL:
+            stack.append((val, item, path))
+
+        elif kind == ATTR_UNION:
+            cls._validate_union(item, val, path, stack, issues)
+
+        elif kind == ATTR_STANDARD:
+            if type(val) is not item:
+                try:
+                    item(val)
+                except (TypeError, ValueError) as err:
+                    issues.append((path, 'Invalid value: {0}'.format(err)))
+
+        else:
+            expanded = lookup(item)
+            try:
+                if expanded:
+                    expanded.deserialize(item, val)
+            except Exception as err:
+                issues.append((path, 'Invalid value: {0}'.format(err)))
+
+    @staticmethod
+    def _validate_union(union, val, path, stack, issues):
+        if not isinstance(val, dict):
+            issues.append((path, 'Expected an object'))
+            return
+
+        child_type = union.types.get(val.get(union.key))
+        if child_type is None:
+            if not union.strict:
+                return
+
+            issues.append((
+                (path, union.key),
+                'Unknown type "{0}"'.format(val.get(union.key))
+            ))
+            return
+
+        stack.append((val, child_type, path))
+
+    @staticmethod
+    def _get_mergeable(obj, attr_name, model_type):
+        """Returns the existing child model of an attribute if it can be
+        updated in place.
+        """
+        child = getattr(obj, attr_name, None)
+        return child if type(child) is model_type else None
+
+    @staticmethod
+    def _merge_children(existing, items):
+        """Matches decoded list items, as ``(data, model_type)`` pairs, up
+        with the models of an existing list. Returns the list of models along
+        with the stack entries that populate them.
+        """
+        if not isinstance(existing, list):
+            existing = None
+
+        old_models = existing or []
+        indexes = {}
+        models = []
+        children = []
+
+        for idx, (item, child_type) in enumerate(items):
+            child = None
+
+            if child_type is not None:
+                merge_key = child_type.__merge_key__
+
+                if merge_key:
+                    index = indexes.get(child_type)
+                    if index is None:
+                        name = get_normalized_map(child_type)[merge_key].name
+                        index = indexes[child_type] = dict(
+                            (getattr(model, name, None), model)
+                            for model in old_models
+                            if type(model) is child_type
+                        )
+
+                    child = index.get(item.get(merge_key))
+
+                elif idx < len(old_models):
+                    child = old_models[idx]
+
+                child_merge = type(child) is child_type
+                if not child_merge:
+                    child = construct_model(child_type)
+
+                children.append((item, child_type, child, child_merge))
+
+            models.append(child)
+
+        # Lists are updated in place, so references to them stay valid
+        if existing is not None:
+            existing[:] = models
+            models = existing
+
+        children.reverse()
+        return models, children
+
+    @classmethod
+    def _unwrap_compact(cls, data, mapped_model_type, decoder,
+                        decoder_kwargs):
+        if isinstance(data, six.string_types):
+            data = decoder.loads(data, **decoder_kwargs)
+
+        expected = get_mapping_fingerprint(mapped_model_type)
+        if not isinstance(data, list) or len(data) != 2:
+            raise SchemaMismatchError(expected, None)
+
+        if data[0] != expected:
+            raise SchemaMismatchError(expected, data[0])
+
+        return data[1]
@@ -0,0 +1,255 @@
+"""
+Copyright 2014 John Vrbanac
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+Memory footprint benchmarks for transmuting representative models.
+
+Each scenario is measured with tracemalloc through
+:func:`alchemize.profile.measure_allocations`, reporting the peak and
+retained memory of an operation along with the retained bytes and memory
+blocks per record. Parsing the payload on its own is measured as well, as
+a baseline for decoding it. Run it from the repository root with alchemize
+installed (e.g. ``pip install -e .``). Results can be saved and compared
+against a previous run::
+
+    python benchmarks/memory.py --save before.json
+    python benchmarks/memory.py --compare before.json
+"""
+import argparse
+import enum
+import json
+import sys
+import uuid
+
+from alchemize import Attr, JsonListModel, JsonMappedModel, JsonTransmuter
+from alchemize.profile import measure_allocations
+
+
+class Color(enum.Enum):
+    red = 'red'
+    green = 'green'
+    blue = 'blue'
+
+
+class FlatRecord(JsonMappedModel):
+    __mapping__ = {
+        'id': Attr('record_id', int),
+        'name': Attr('name', str),
+        'email': Attr('email', str),
+        'score': Attr('score', float),
+        'active': Attr('active', bool),
+        'tags': Attr('tags', [str]),
+    }
+
+
+class Address(JsonMappedModel):
+    __mapping__ = {
+        'street': Attr('street', str),
+        'city': Attr('city', str),
+        'zip': Attr('zip_code', str),
+    }
+
+
+class NestedRecord(JsonMappedModel):
+    __mapping__ = {
+        'id': Attr('record_id', int),
+        'address': Attr('address', Address),
+        'previous': Attr('previous_addresses', [Address]),
+        'profile': Attr('profile', FlatRecord),
+    }
+
+
+class TypedRecord(JsonMappedModel):
+    __mapping__ = {
+        'id': Attr('record_id', uuid.UUID),
+        'owner': Attr('owner_id', uuid.UUID),
+        'color': Attr('color', Color),
+        'related': Attr('related', [uuid.UUID]),
+    }
+
+
+class FlatList(JsonListModel):
+    __mapping__ = {
+        'items': Attr('collection', [FlatRecord]),
+    }
+
+
+class NestedList(JsonListModel):
+    __mapping__ = {
+        'items': Attr('collection', [NestedRecord]),
+    }
+
+
+class TypedList(JsonListModel):
+    __mapping__ = {
+        'items': Attr('collection', [TypedRecord]),
+    }
+
+
+def flat_record(idx):
+    return {
+        'id': idx,
+        'name': 'Person {0}'.format(idx),
+        'email': 'person.{0}@example.com'.format(idx),
+        'score': idx * 0.5,
+        'active': idx % 2 == 0,
+        'tags': ['tag-{0}'.format(idx % 10), 'common'],
+    }
+
+
+def nested_record(idx):
+    address = {'street': '{0} Main St'.format(idx), 'city': 'Springfield',
+               'zip': '{0:05d}'.format(idx)}
+
+    return {
+        'id': idx,
+        'address': address,
+        'previous': [dict(address), dict(address)],
+        'profile': flat_record(idx),
+    }
+
+
+def typed_record(idx):
+    return {
+        'id': str(uuid.UUID(int=idx)),
+        'owner': str(uuid.UUID(int=idx + 1)),
+        'color': list(Color)[idx % 3].value,
+        'related': [str(uuid.UUID(int=idx + n)) for n in range(4)],
+    }
+
+
+SCENARIOS = [
+    ('flat', FlatList, flat_record),
+    ('nested', NestedList, nested_record),
+    ('typed', TypedList, typed_record),
+]
+
+
+def measure(func, records):
+    """Runs the function while tracing allocations and returns the peak
+    and retained memory of its result.
+    """
+    peak, retained, blocks = measure_allocations(func)
+
+    return {
+        'peak': peak,
+        'retained': retained,
+        'bytes_per_record': retained / float(records),
+        'blocks_per_record': blocks / float(records),
+    }
+
+
+def run(records, names=None):
+    results = {}
+
+    for name, list_type, make_record in SCENARIOS:
+        if names and name not in names:
+            continue
+
+        data = {'items': [make_record(idx) for idx in range(records)]}
+        payload = json.dumps(data)
+
+        # The memory that the decoder needs on its own is the floor for
+        # any decode of the payload.
+        results['parse-' + name] = measure(lambda: json.loads(payload),
+                                           records)
+
+        results['decode-' + name] = measure(
+            lambda: JsonTransmuter.transmute_from(payload, list_type),
+            records
+        )
+
+        model = JsonTransmuter.transmute_from(payload, list_type)
+        results['encode-' + name] = measure(
+            lambda: JsonTransmuter.transmute_to(model, to_string=False),
+            records
+        )
+
+    return results
+
+
+def _format_bytes(value):
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(value) < 1024:
+            return '{0:.1f} {1}'.format(value, unit)
+        value /= 1024.0
+
+    return '{0:.1f} GiB'.format(value)
+
+
+def _format_change(value, baseline):
+    if not baseline:
+        return ''
+
+    return ' ({0:+.1f}%)'.format((value - baseline) * 100.0 / baseline)
+
+
+def report(results, baseline=None, out=sys.stdout):
+    baseline = baseline or {}
+    columns = ('peak', 'retained', 'bytes_per_record', 'blocks_per_record')
+
+    out.write('{0:<16}{1:>24}{2:>24}{3:>24}{4:>24}\n'.format(
+        'scenario', 'peak', 'retained', 'bytes/record', 'blocks/record'
+    ))
+
+    for name in sorted(results):
+        cells = []
+
+        for column in columns:
+            value = results[name][column]
+            base = baseline.get(name, {}).get(column)
+
+            if column in ('peak', 'retained'):
+                text = _format_bytes(value)
+            else:
+                text = '{0:.1f}'.format(value)
+
+            cells.append(text + _format_change(value, base))
+
+        out.write('{0:<16}{1:>24}{2:>24}{3:>24}{4:>24}\n'.format(
+            name, *cells
+        ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Measures the memory footprint of transmuting models.'
+    )
+    parser.add_argument('--records', type=int, default=10000,
+                        help='Number of records per scenario')
+    parser.add_argument('--scenario', action='append', dest='scenarios',
+                        choices=[name for name, _, _ in SCENARIOS],
+                        help='Only run the specified scenario(s)')
+    parser.add_argument('--save', metavar='PATH',
+                        help='Save the results as JSON for later comparison')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='Compare the results against a saved run')
+    args = parser.parse_args(argv)
+
+    results = run(args.records, args.scenarios)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    report(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as results_file:
+            json.dump(results, results_file, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -28,11 +28,17 @@ setup(
         'Operating System :: POSIX :: Linux'
     ],
     keywords='model serialize deserialize transmute',
-    packages=find_packages(exclude=['contrib', 'docs', 'spec*']),
+    packages=find_packages(
+        exclude=['benchmarks*', 'contrib', 'docs', 'spec*']
+    ),
     install_requires=requirements,
     package_data={},
     data_files=[
         ('', ['LICENSE'])
     ],
-    entry_points={}
+    entry_points={
+        'console_scripts': [
+            'alchemize-profile = alchemize.profile:main',
+        ],
+    }
 )
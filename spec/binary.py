@@ -0,0 +1,143 @@
+from specter import Spec, DataSpec, expect
+
+from alchemize import Attr, JsonModel, JsonMappedModel, MsgPackTransmuter
+from alchemize.binary import MsgPackError, dumps, loads
+
+
+class TestChildModel(JsonMappedModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+    }
+
+
+class TestMappedModel(JsonMappedModel):
+    __mapping__ = {
+        'id': Attr('id', int),
+        'score': Attr('score', float),
+        'active': Attr('active', bool),
+        'child': Attr('child', TestChildModel),
+        'children': Attr('children', [TestChildModel]),
+    }
+
+
+class TestHelperModel(JsonModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+    }
+
+
+PACKED_VALUES_DATASET = {
+    'nil': {'value': None, 'packed': b'\xc0'},
+    'true': {'value': True, 'packed': b'\xc3'},
+    'false': {'value': False, 'packed': b'\xc2'},
+    'positive_fixint': {'value': 5, 'packed': b'\x05'},
+    'negative_fixint': {'value': -1, 'packed': b'\xff'},
+    'uint8': {'value': 200, 'packed': b'\xcc\xc8'},
+    'uint16': {'value': 1000, 'packed': b'\xcd\x03\xe8'},
+    'int8': {'value': -100, 'packed': b'\xd0\x9c'},
+    'int64': {
+        'value': -2 ** 40,
+        'packed': b'\xd3\xff\xff\xff\x00\x00\x00\x00\x00'
+    },
+    'float32': {'value': 1.5, 'packed': b'\xca\x3f\xc0\x00\x00'},
+    'float64': {
+        'value': 1.1,
+        'packed': b'\xcb\x3f\xf1\x99\x99\x99\x99\x99\x9a'
+    },
+    'fixstr': {'value': u'abc', 'packed': b'\xa3abc'},
+    'bin8': {'value': b'\x00\x01', 'packed': b'\xc4\x02\x00\x01'},
+    'fixarray': {'value': [1, 2], 'packed': b'\x92\x01\x02'},
+    'fixmap': {'value': {u'a': 1}, 'packed': b'\x81\xa1a\x01'},
+}
+
+
+class MsgPackCodec(Spec):
+
+    class PackingValues(DataSpec):
+        DATASET = PACKED_VALUES_DATASET
+
+        def can_pack_and_unpack(self, value, packed):
+            expect(dumps(value)).to.equal(packed)
+            expect(loads(packed)).to.equal(value)
+
+    def can_round_trip_large_containers(self):
+        value = {
+            u'text': u'x' * 70000,
+            u'items': list(range(20)),
+            u'nested': dict((u'k{0}'.format(i), i) for i in range(20)),
+        }
+
+        expect(loads(dumps(value))).to.equal(value)
+
+    def can_round_trip_arrays_of_numbers(self):
+        value = [
+            [0.1 * i for i in range(50)],
+            [0.5, 1.5, 2.5],
+            list(range(100, 150)),
+            list(range(10)),
+            [1, 1.5, u'a', None, 300],
+        ]
+
+        expect(loads(dumps(value))).to.equal(value)
+
+    def can_round_trip_arrays_of_mixed_numbers(self):
+        value = [
+            list(range(-100, 70000, 7)),
+            [i * 0.5 if i % 40 < 20 else i for i in range(200)],
+            list(range(-40, 40)) + [0.1] * 20 + list(range(20)),
+            [5, 200, -3, 40000, -200, 70000, 2 ** 40, -2 ** 40] * 10,
+            list(range(100)) + [u'a', [1, 2], {u'b': 3}, 4],
+        ]
+
+        result = loads(dumps(value))
+
+        expect(result).to.equal(value)
+        expect([type(item) for item in result[1]]).to.equal(
+            [type(item) for item in value[1]]
+        )
+
+    def can_unpack_deeply_nested_arrays(self):
+        value = loads(b'\x91' * 5000 + b'\x01')
+
+        for _ in range(5000):
+            value = value[0]
+
+        expect(value).to.equal(1)
+
+    def raises_on_unsupported_values(self):
+        expect(dumps, [object()]).to.raise_a(MsgPackError)
+
+    def raises_on_truncated_data(self):
+        expect(loads, [b'\x92\x01']).to.raise_a(MsgPackError)
+        expect(loads, [b'\x93\x01\x02']).to.raise_a(MsgPackError)
+        expect(loads, [b'\x92\xcb\x00']).to.raise_a(MsgPackError)
+
+
+class TransmutingMsgPackContent(Spec):
+    def can_transmute_to_and_from(self):
+        model = TestMappedModel()
+        model.id = 10
+        model.score = 0.5
+        model.active = True
+        model.child = TestChildModel()
+        model.child.name = 'child'
+        model.children = [TestChildModel()]
+        model.children[0].name = 'item'
+
+        packed = MsgPackTransmuter.transmute_to(model)
+        expect(packed).to.be_an_instance_of(bytes)
+
+        result = MsgPackTransmuter.transmute_from(packed, TestMappedModel)
+
+        expect(result.id).to.equal(10)
+        expect(result.score).to.equal(0.5)
+        expect(result.active).to.be_true()
+        expect(result.child.name).to.equal('child')
+        expect(result.children[0].name).to.equal('item')
+
+    def helpers_can_transmute_to_and_from(self):
+        packed = TestHelperModel(name='bam').as_msgpack()
+
+        result = TestHelperModel.from_msgpack(packed)
+
+        expect(result.name).to.equal('bam')
@@ -0,0 +1,131 @@
+import json
+
+from specter import Spec, expect
+
+from alchemize import Attr, DecodeCache, JsonModel, JsonTransmuter
+from alchemize.helpers import (
+    ColumnarCollection,
+    JsonColumnarListModel,
+    JsonLazyListModel,
+    LazyCollection,
+)
+
+
+class TestChildModel(JsonModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+    }
+
+
+class TestCachedModel(JsonModel):
+    __mapping__ = {
+        'id': Attr('id', int),
+        'children': Attr('children', [TestChildModel]),
+    }
+
+
+class TestLazyCachedModel(JsonLazyListModel):
+    __mapping__ = {
+        'children': Attr('collection', [TestChildModel]),
+    }
+
+
+class TestColumnarCachedModel(JsonColumnarListModel):
+    __mapping__ = {
+        'children': Attr('collection', [TestChildModel]),
+    }
+
+
+def make_payload(model_id):
+    return json.dumps({'id': model_id, 'children': [{'name': 'child'}]})
+
+
+class DecodingThroughACache(Spec):
+    def before_each(self):
+        self.cache = DecodeCache()
+        self.payload = make_payload(1)
+
+    def returns_copies_of_cached_models(self):
+        first = JsonTransmuter.transmute_from(self.payload, TestCachedModel,
+                                              cache=self.cache)
+        second = JsonTransmuter.transmute_from(self.payload, TestCachedModel,
+                                               cache=self.cache)
+
+        expect(first is second).to.be_false()
+        expect(first.children[0] is second.children[0]).to.be_false()
+        expect(second.as_dict()).to.equal(first.as_dict())
+        expect(self.cache.stats.hits).to.equal(1)
+        expect(self.cache.stats.misses).to.equal(1)
+
+    def returns_shared_frozen_models(self):
+        cache = DecodeCache(frozen=True)
+
+        first = TestCachedModel.from_json(self.payload, cache=cache)
+        second = TestCachedModel.from_json(self.payload, cache=cache)
+
+        expect(first is second).to.be_true()
+        expect(first.children[0].__frozen__).to.be_true()
+        expect(setattr, [first, 'id', 2]).to.raise_a(AttributeError)
+        expect(first.children.append, [None]).to.raise_a(TypeError)
+
+    def isolates_the_copies_of_cached_models(self):
+        first = self.cache.decode(JsonTransmuter, self.payload,
+                                  TestCachedModel)
+        first.children.append(TestChildModel())
+        first.children[0].name = 'changed'
+
+        second = self.cache.decode(JsonTransmuter, self.payload,
+                                   TestCachedModel)
+
+        expect(len(second.children)).to.equal(1)
+        expect(second.children[0].name).to.equal('child')
+
+    def caches_list_model_helpers(self):
+        for model_type, collection_type in (
+                (TestLazyCachedModel, LazyCollection),
+                (TestColumnarCachedModel, ColumnarCollection)):
+            cache = DecodeCache()
+
+            for _ in range(3):
+                result = model_type.from_json(self.payload, cache=cache)
+
+            expect(cache.stats.misses).to.equal(1)
+            expect(cache.stats.hits).to.equal(2)
+            expect(result.collection).to.be_an_instance_of(collection_type)
+            expect(result[0].name).to.equal('child')
+
+    def keys_entries_by_options(self):
+        self.cache.decode(JsonTransmuter, self.payload, TestCachedModel)
+        self.cache.decode(JsonTransmuter, self.payload, TestCachedModel,
+                          coerce_values=True)
+
+        expect(self.cache.stats.misses).to.equal(2)
+        expect(self.cache.stats.entries).to.equal(2)
+
+    def evicts_the_least_recently_used_entries(self):
+        cache = DecodeCache(max_entries=2)
+        first, second, third = [make_payload(idx) for idx in range(3)]
+
+        cache.decode(JsonTransmuter, first, TestCachedModel)
+        cache.decode(JsonTransmuter, second, TestCachedModel)
+        cache.decode(JsonTransmuter, first, TestCachedModel)
+        cache.decode(JsonTransmuter, third, TestCachedModel)
+        cache.decode(JsonTransmuter, first, TestCachedModel)
+
+        expect(cache.stats.hits).to.equal(2)
+        expect(cache.stats.evictions).to.equal(1)
+        expect(cache.stats.entries).to.equal(2)
+
+    def evicts_entries_by_size(self):
+        cache = DecodeCache(max_size=len(self.payload) * 2)
+
+        for idx in range(3):
+            cache.decode(JsonTransmuter, make_payload(idx), TestCachedModel)
+
+        expect(cache.stats.entries).to.equal(2)
+        expect(cache.stats.size).to.equal(len(self.payload) * 2)
+
+    def does_not_cache_dictionaries(self):
+        self.cache.decode(JsonTransmuter, {'id': 1}, TestCachedModel)
+
+        expect(self.cache.stats.entries).to.equal(0)
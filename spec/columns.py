@@ -0,0 +1,127 @@
+import array
+import uuid
+
+from specter import Spec, expect
+
+from alchemize import Attr, JsonMappedModel, JsonTransmuter
+from alchemize.columns import from_columns, pluck
+from alchemize.mapping import get_key_paths
+from alchemize.transmute import AlchemizeError
+
+
+class TestChildModel(JsonMappedModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+        'score': Attr('score', float),
+    }
+
+
+class TestRecordModel(JsonMappedModel):
+    __fast_construct__ = True
+    __mapping__ = {
+        'id': Attr('record_id', int),
+        'child': Attr('child', TestChildModel),
+        'children': Attr('children', [TestChildModel]),
+    }
+
+    def __post_decode__(self):
+        self.post_decoded = True
+
+
+class TestTypedModel(JsonMappedModel):
+    __mapping__ = {
+        'uuid': Attr('uuid', uuid.UUID),
+        'score': Attr('score', float),
+        'children': Attr('children', [TestChildModel]),
+    }
+
+
+class PluckingColumns(Spec):
+    def before_each(self):
+        self.rows = [
+            {'id': 1, 'child': {'name': 'a', 'score': 1.5},
+             'children': [{'name': 'b'}, {'name': 'c'}]},
+            {'id': 2, 'children': []},
+        ]
+        self.models = [
+            JsonTransmuter.transmute_from(row, TestRecordModel)
+            for row in self.rows
+        ]
+        self.paths = get_key_paths(TestRecordModel)
+
+    def plucks_columns_from_models(self):
+        columns = pluck(self.models, TestRecordModel, self.paths)
+
+        expect(list(columns)).to.equal(self.paths)
+        expect(columns['/id']).to.equal([1, 2])
+        expect(columns['/child/name']).to.equal(['a', None])
+        expect(columns['/children/name']).to.equal([['b', 'c'], []])
+
+    def plucks_the_same_columns_from_rows(self):
+        columns = pluck(self.rows, TestRecordModel, self.paths)
+
+        expect(columns).to.equal(
+            pluck(self.models, TestRecordModel, self.paths)
+        )
+
+    def plucks_numeric_columns_as_arrays(self):
+        columns = pluck(self.models, TestRecordModel,
+                        ['/id', '/child/score'], arrays=True)
+
+        expect(columns['/id']).to.be_an_instance_of(array.array)
+        expect(list(columns['/id'])).to.equal([1, 2])
+        expect(columns['/child/score']).to.equal([1.5, None])
+
+    def plucks_whole_numbers_into_float_arrays(self):
+        columns = pluck([{'score': 1.5}, {'score': 2}], TestTypedModel,
+                        ['/score'], arrays=True)
+
+        expect(columns['/score']).to.be_an_instance_of(array.array)
+        expect(columns['/score'].tolist()).to.equal([1.5, 2.0])
+
+
+class BuildingModelsFromColumns(Spec):
+    def builds_models_and_their_children(self):
+        models = from_columns({
+            '/id': array.array('l', [1, 2]),
+            '/child/name': ['a', None],
+            '/children/name': [['b', 'c'], None],
+            '/children/score': [[None, 2.5], None],
+        }, TestRecordModel)
+
+        expect(models[0].record_id).to.equal(1)
+        expect(models[0].child.name).to.equal('a')
+        expect(models[0].children[1].name).to.equal('c')
+        expect(models[0].children[1].score).to.equal(2.5)
+        expect(models[0].post_decoded).to.be_true()
+        expect(hasattr(models[1], 'child')).to.be_false()
+
+    def round_trips_plucked_columns(self):
+        rows = [
+            {'id': 1, 'child': {'name': 'a'}, 'children': [{'name': 'b'}]},
+        ]
+        paths = get_key_paths(TestRecordModel)
+
+        models = from_columns(pluck(rows, TestRecordModel, paths),
+                              TestRecordModel)
+        result = JsonTransmuter.transmute_to(models[0], to_string=False)
+
+        expect(result).to.equal(rows[0])
+
+    def converts_values_in_their_json_form(self):
+        value = uuid.uuid4()
+        rows = [{'uuid': str(value), 'score': 2,
+                 'children': [{'score': 3}]}]
+
+        models = from_columns(
+            pluck(rows, TestTypedModel, get_key_paths(TestTypedModel)),
+            TestTypedModel
+        )
+
+        expect(models[0].uuid).to.equal(value)
+        expect(type(models[0].score)).to.equal(float)
+        expect(type(models[0].children[0].score)).to.equal(float)
+
+    def raises_for_columns_of_different_lengths(self):
+        expect(from_columns, [{'/id': [1], '/child/name': []},
+                              TestRecordModel]).to.raise_a(AlchemizeError)
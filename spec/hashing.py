@@ -0,0 +1,111 @@
+import uuid
+
+from specter import Spec, expect
+
+from alchemize import Attr, JsonModel, JsonTransmuter
+from alchemize.hashing import FROZEN_FINGERPRINTS, fingerprint
+from alchemize.mapping import clone, freeze
+
+
+class TestChildModel(JsonModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+    }
+
+
+class TestChainModel(JsonModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+    }
+
+
+TestChainModel.__mapping__['next'] = Attr('next', TestChainModel)
+
+
+class TestHashedModel(JsonModel):
+    __mapping__ = {
+        'id': Attr('id', int),
+        'uid': Attr('uid', uuid.UUID),
+        'meta': Attr('meta', dict),
+        'child': Attr('child', TestChildModel),
+        'children': Attr('children', {str: TestChildModel}),
+    }
+
+
+class FingerprintingModels(Spec):
+    def before_each(self):
+        self.data = {
+            'id': 1,
+            'uid': str(uuid.UUID(int=1)),
+            'meta': {'a': 1, 'b': [1, 2]},
+            'child': {'name': 'child'},
+            'children': {'x': {'name': 'x'}},
+        }
+        self.model = JsonTransmuter.transmute_from(self.data,
+                                                   TestHashedModel)
+
+    def matches_for_equal_content(self):
+        self.data['meta'] = {'b': [1, 2], 'a': 1}
+        other = JsonTransmuter.transmute_from(self.data, TestHashedModel)
+
+        expect(fingerprint(other)).to.equal(fingerprint(self.model))
+        expect(fingerprint(clone(self.model, deep=True))).to.equal(
+            fingerprint(self.model)
+        )
+
+    def changes_with_the_content(self):
+        result = fingerprint(self.model)
+
+        self.model.children['x'].name = 'y'
+        expect(fingerprint(self.model)).not_to.equal(result)
+
+        self.model.children['x'].name = 'x'
+        self.model.id = '1'
+        expect(fingerprint(self.model)).not_to.equal(result)
+
+    def differs_between_model_types(self):
+        child = TestChildModel()
+        other = TestHashedModel()
+
+        expect(fingerprint(child)).not_to.equal(fingerprint(other))
+
+    def memoizes_frozen_models(self):
+        result = fingerprint(self.model)
+        freeze(self.model)
+
+        expect(fingerprint(self.model)).to.equal(result)
+        expect(id(self.model) in FROZEN_FINGERPRINTS).to.be_true()
+        expect(id(self.model.child) in FROZEN_FINGERPRINTS).to.be_true()
+
+    def handles_deeply_nested_models(self):
+        head = TestChainModel()
+        current = head
+        for idx in range(5000):
+            current.name = str(idx)
+            current.next = TestChainModel()
+            current = current.next
+
+        expect(fingerprint(head)).to.equal(fingerprint(clone(head,
+                                                             deep=True)))
+
+    def matches_for_shared_and_separate_children(self):
+        shared = TestHashedModel()
+        shared.children = {'a': self.model.child, 'b': self.model.child}
+        separate = TestHashedModel()
+        separate.children = {
+            'a': clone(self.model.child),
+            'b': clone(self.model.child),
+        }
+
+        expect(fingerprint(shared)).to.equal(fingerprint(separate))
+
+    def handles_models_that_contain_themselves(self):
+        head = TestChainModel()
+        head.name = 'head'
+        head.next = head
+
+        other = TestChainModel()
+        other.name = 'head'
+        other.next = other
+
+        expect(fingerprint(head)).to.equal(fingerprint(other))
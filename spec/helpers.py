@@ -1,9 +1,15 @@
+import array
 import json
+import pickle
 import six
 
 from specter import Spec, expect
 
-from alchemize import Attr, JsonModel, JsonListModel
+from alchemize import (
+    Attr, JsonModel, JsonListModel, JsonColumnarListModel, JsonLazyListModel,
+    JsonTransmuter,
+)
+from alchemize.helpers import ColumnarCollection, LazyCollection
 
 
 class TestModel(JsonModel):
@@ -55,6 +61,14 @@ class TestJsonHelperModel(Spec):
         model = TestModel(thing='bam')
         expect(model.thing).to.equal('bam')
 
+    def can_clone(self):
+        model = TestModel(thing='bam')
+
+        result = model.clone()
+
+        expect(result is model).to.be_false()
+        expect(result.thing).to.equal('bam')
+
 
 class TestJsonHelperListModel(Spec):
     if six.PY3:
@@ -136,3 +150,354 @@ class TestJsonHelperListModel(Spec):
         model.extend([child])
 
         expect(model[0]).to.equal(child)
+
+
+class TestNumericModel(JsonModel):
+    __mapping__ = {
+        'id': Attr('id', int),
+        'score': Attr('score', float),
+        'name': Attr('name', str),
+    }
+
+
+class TestListModelOfNumbers(JsonListModel):
+    __mapping__ = {
+        'items': Attr('collection', [TestNumericModel]),
+    }
+
+
+class TestColumnarListModel(JsonColumnarListModel):
+    __mapping__ = {
+        'items': Attr('collection', [TestNumericModel]),
+        'total': Attr('total', int),
+    }
+
+
+class TestHiddenModel(JsonModel):
+    __mapping__ = {
+        'id': Attr('id', int),
+        'secret': Attr('secret', str, serialize=False),
+    }
+
+
+class TestHiddenColumnarListModel(JsonColumnarListModel):
+    __mapping__ = {
+        'items': Attr('collection', [TestHiddenModel]),
+        'total': Attr('total', int),
+    }
+
+
+class TestWrappedModel(JsonModel):
+    __wrapped_attr_name__ = 'w'
+    __mapping__ = {
+        'n': Attr('n', int),
+    }
+
+
+class TestWrappedListModel(JsonListModel):
+    __mapping__ = {
+        'items': Attr('collection', [TestWrappedModel]),
+    }
+
+
+class TestWrappedColumnarListModel(JsonColumnarListModel):
+    __mapping__ = {
+        'items': Attr('collection', [TestWrappedModel]),
+    }
+
+
+class TestColumnarParentModel(JsonModel):
+    __mapping__ = {
+        'page': Attr('page', TestColumnarListModel),
+    }
+
+
+class TestJsonHelperColumnarListModel(Spec):
+    def can_transmute_from_into_columns(self):
+        model = TestColumnarListModel.from_dict({
+            'total': 2,
+            'items': [
+                {'id': 1, 'score': 1.5, 'name': 'one'},
+                {'id': 2, 'score': 2.5, 'name': 'two'},
+            ]
+        })
+
+        expect(model.total).to.equal(2)
+        expect(len(model)).to.equal(2)
+        expect(model[1].name).to.equal('two')
+        expect(model[-1].score).to.equal(2.5)
+        expect(model.collection.column('id')).to.be_an_instance_of(
+            array.array
+        )
+
+    def can_transmute_to_from_columns(self):
+        data = {
+            'items': [
+                {'id': 1, 'score': 1.5, 'name': 'one'},
+                {'id': 2, 'name': 'two'},
+            ]
+        }
+        model = TestColumnarListModel.from_json(json.dumps(data))
+
+        expect(model.as_dict()).to.equal(data)
+
+    def falls_back_to_list_column_on_mismatched_value(self):
+        model = TestColumnarListModel.from_dict({
+            'items': [{'id': 1}, {'id': 'two'}]
+        })
+
+        expect(model.collection.column('id')).to.equal([1, 'two'])
+        expect(model[1].id).to.equal('two')
+
+    def can_use_list_operations(self):
+        model = TestColumnarListModel()
+        model.append(TestNumericModel(id=1, score=1.0))
+        model.extend([TestNumericModel(id=2), TestNumericModel(id=3)])
+        model[0] = TestNumericModel(id=10)
+        del model[1]
+
+        expect([item.id for item in model]).to.equal([10, 3])
+        expect([item.id for item in model[0:1]]).to.equal([10])
+
+    def can_assign_a_list_of_models(self):
+        model = TestColumnarListModel()
+        model.collection = [TestNumericModel(id=1)]
+
+        expect(model.collection).to.be_an_instance_of(ColumnarCollection)
+        expect(model[0].id).to.equal(1)
+
+    def falls_back_to_list_column_on_out_of_range_ints(self):
+        model = TestColumnarListModel.from_dict({
+            'items': [{'id': 1}, {'id': 2 ** 64}]
+        })
+
+        expect(model.collection.column('id')).to.equal([1, 2 ** 64])
+        expect(model[1].id).to.equal(2 ** 64)
+
+    def stores_whole_numbers_in_float_columns(self):
+        model = TestColumnarListModel.from_dict({
+            'items': [{'score': 1.5}, {'score': 2}]
+        })
+
+        column = model.collection.column('score')
+        expect(column).to.be_an_instance_of(array.array)
+        expect(column.tolist()).to.equal([1.5, 2.0])
+
+    def serializes_with_the_transmute_options(self):
+        model = TestHiddenColumnarListModel.from_dict({
+            'items': [{'id': 1, 'secret': 'a'}]
+        })
+
+        expect(model.as_dict()).to.equal({'items': [{'id': 1}]})
+        expect(model.as_dict(serialize_all=True)).to.equal(
+            {'items': [{'id': 1, 'secret': 'a'}]}
+        )
+
+        model = TestHiddenColumnarListModel.from_dict({
+            'items': [{'secret': 'a'}]
+        })
+
+        expect(
+            JsonTransmuter.transmute_to(model, to_string=False,
+                                        assign_all=True)
+        ).to.equal({'items': [{'id': None}]})
+
+    def can_transmute_in_compact_mode(self):
+        model = TestColumnarListModel.from_dict({
+            'total': 2,
+            'items': [{'id': 1, 'score': 1.5}, {'id': 2, 'name': 'two'}],
+        })
+
+        data = model.transmute_to(to_string=True, compact=True)
+        result = TestColumnarListModel.from_json(data, compact=True)
+
+        expect(json.loads(data)[1][0]).to.equal(
+            [[1, None, 1.5], [2, 'two', None]]
+        )
+        expect(result.as_dict()).to.equal(model.as_dict())
+
+    def clones_get_a_copy_of_the_collection(self):
+        model = TestColumnarListModel.from_dict({'items': [{'id': 1}]})
+
+        result = model.clone()
+        result.append(TestNumericModel(id=2))
+
+        expect(result.collection is model.collection).to.be_false()
+        expect(len(model)).to.equal(1)
+        expect([item.id for item in result]).to.equal([1, 2])
+
+    def can_be_nested_in_compact_mode(self):
+        model = TestColumnarParentModel.from_dict({
+            'page': {'items': [{'id': 1}]}
+        })
+
+        data = model.transmute_to(compact=True)
+        result = TestColumnarParentModel.from_dict(data, compact=True)
+
+        expect(data[1]).to.equal([[[[1, None, None]], None]])
+        expect(result.as_dict()).to.equal(model.as_dict())
+
+    def can_transmute_from_through_the_transmuter(self):
+        data = {'items': [{'id': 1}, {'id': 2}]}
+
+        model = JsonTransmuter.transmute_from(data, TestColumnarListModel)
+
+        expect(model.as_dict()).to.equal(data)
+
+    def can_be_nested_in_another_model(self):
+        data = {'page': {'items': [{'id': 1, 'name': 'one'}, {'id': 2}]}}
+
+        model = TestColumnarParentModel.from_dict(data)
+
+        expect(model.page[0].name).to.equal('one')
+        expect(model.as_dict()).to.equal(data)
+
+    def unwraps_and_wraps_the_rows_of_wrapped_models(self):
+        data = {'items': [{'w': {'n': 1}}, {'w': {'n': 2}}]}
+
+        model = TestWrappedColumnarListModel.from_dict(data)
+        model.append(TestWrappedModel(n=3))
+
+        expect([item.n for item in model]).to.equal([1, 2, 3])
+        expect(list(model.collection.column('n'))).to.equal([1, 2, 3])
+
+        data['items'].append({'w': {'n': 3}})
+        expect(model.as_dict()).to.equal(data)
+        expect(TestWrappedListModel.from_dict(data).as_dict()).to.equal(data)
+
+
+class TestLazyListModel(JsonLazyListModel):
+    __mapping__ = {
+        'items': Attr('collection', [TestModel]),
+        'total': Attr('total', int),
+    }
+
+
+class TestJsonHelperLazyListModel(Spec):
+    def before_each(self):
+        self.data = {
+            'total': 3,
+            'items': [{'thing': 'a'}, {'thing': 'b'}, {'thing': 'c'}],
+        }
+
+    def can_get_length_without_decoding(self):
+        model = TestLazyListModel.from_dict(self.data)
+
+        expect(model.total).to.equal(3)
+        expect(len(model)).to.equal(3)
+        expect(model.collection.is_decoded(0)).to.be_false()
+
+    def decodes_and_memoizes_on_access(self):
+        model = TestLazyListModel.from_json(json.dumps(self.data))
+
+        item = model[1]
+
+        expect(item.thing).to.equal('b')
+        expect(model[1]).to.equal(item)
+        expect(model.collection.is_decoded(0)).to.be_false()
+        expect(model.collection.is_decoded(1)).to.be_true()
+
+    def can_decode_a_slice(self):
+        model = TestLazyListModel.from_dict(self.data)
+
+        items = model[1:]
+
+        expect([item.thing for item in items]).to.equal(['b', 'c'])
+        expect(model.collection.is_decoded(0)).to.be_false()
+
+    def can_iterate(self):
+        model = TestLazyListModel.from_dict(self.data)
+
+        expect([item.thing for item in model]).to.equal(['a', 'b', 'c'])
+
+    def can_transmute_to_without_decoding(self):
+        model = TestLazyListModel.from_dict(self.data)
+        model.append(TestModel(thing='d'))
+
+        result = model.as_dict()
+
+        expect(result['items'][3]).to.equal({'thing': 'd'})
+        expect(result['items'][0]).to.equal({'thing': 'a'})
+        expect(model.collection.is_decoded(0)).to.be_false()
+
+    def can_transmute_in_compact_mode(self):
+        model = TestLazyListModel.from_dict(self.data)
+
+        data = model.transmute_to(compact=True)
+        result = TestLazyListModel.from_dict(data, compact=True)
+
+        expect(data[1]).to.equal([[['a'], ['b'], ['c']], 3])
+        expect(result.collection.is_decoded(0)).to.be_false()
+        expect(result[2].thing).to.equal('c')
+        expect(result.as_dict()).to.equal(self.data)
+
+    def clones_get_a_copy_of_the_collection(self):
+        model = TestLazyListModel.from_dict(self.data)
+
+        result = model.clone()
+        del result[0]
+
+        expect(result.collection is model.collection).to.be_false()
+        expect(len(model)).to.equal(3)
+        expect(result[0].thing).to.equal('b')
+        expect(model.collection.is_decoded(1)).to.be_false()
+
+    def can_be_pickled_with_pending_items(self):
+        model = TestLazyListModel.from_dict(self.data)
+        model[0]
+
+        result = pickle.loads(pickle.dumps(model))
+
+        expect(result.collection.is_decoded(1)).to.be_false()
+        expect(result.as_dict()).to.equal(self.data)
+
+    def transmutes_to_like_a_list_model(self):
+        data = {'items': [{'id': 2, 'score': 2}]}
+        model = TestLazyNumericListModel.from_dict(data)
+
+        row = model.as_dict()['items'][0]
+        expected = TestListModelOfNumbers.from_dict(data).as_dict()
+        expected = expected['items'][0]
+
+        expect(row).to.equal(expected)
+        expect(type(row['score'])).to.equal(type(expected['score']))
+
+    def can_be_nested_in_another_model(self):
+        data = {'page': self.data}
+
+        model = TestLazyParentModel.from_dict(data)
+
+        expect(model.page.collection).to.be_an_instance_of(LazyCollection)
+        expect(model.page[0].thing).to.equal('a')
+        expect(model.as_dict()).to.equal(data)
+
+
+class TestLazyNumericListModel(JsonLazyListModel):
+    __mapping__ = {
+        'items': Attr('collection', [TestNumericModel]),
+    }
+
+
+class TestLazyParentModel(JsonModel):
+    __mapping__ = {
+        'page': Attr('page', TestLazyListModel),
+    }
+
+
+class TestFastListModel(JsonListModel):
+    __fast_construct__ = True
+    __mapping__ = {
+        'items': Attr('collection', [TestModel]),
+    }
+
+
+class TestJsonHelperFastListModel(Spec):
+    def can_transmute_from(self):
+        model = TestFastListModel.from_dict({'items': [{'thing': 'bam'}]})
+
+        expect(model[0].thing).to.equal('bam')
+
+    def initializes_collection_when_missing(self):
+        model = TestFastListModel.from_dict({})
+
+        expect(len(model)).to.equal(0)
@@ -1,3 +1,6 @@
+import datetime
+import decimal
+import functools
 import json
 import uuid
 import six
@@ -6,7 +9,28 @@ from specter import Spec, DataSpec, expect, require
 
 import alchemize
 from alchemize import ExpandedType, JsonTransmuter, JsonMappedModel, Attr
-from alchemize.transmute import RequiredAttributeError
+from alchemize import RawJson, TaggedUnion
+from alchemize.mapping import get_key_paths, get_mapping_fingerprint
+from alchemize.transmute import (
+    EXPANDED_TYPES,
+    AlchemizeError,
+    TYPE_REGISTRY,
+    UTC,
+    DateTimeType,
+    DateType,
+    DecimalType,
+    RequiredAttributeError,
+    SchemaMismatchError,
+    TypeRegistry,
+    TypeSnapshot,
+    UnsupportedMappedModelError,
+)
+
+try:
+    import numpy
+    from alchemize.transmute import ndarray_type
+except ImportError:
+    numpy = None
 
 
 class TestWrappedModel(JsonMappedModel):
@@ -678,3 +702,940 @@ class TransmutingJsonContent(Spec):
         result = JsonTransmuter.transmute_to(model, to_string=False)
 
         expect(result.get('child')).to.be_none()
+
+    def transmute_to_and_from_deeply_nested_models(self):
+        class TreeNode(JsonMappedModel):
+            pass
+
+        TreeNode.__mapping__ = {
+            'name': Attr('name', str),
+            'children': Attr('children', [TreeNode]),
+        }
+
+        depth = 5000
+        root = node = TreeNode()
+        for idx in range(depth):
+            node.name = str(idx)
+            node.children = [TreeNode()]
+            node = node.children[0]
+
+        node.name = 'leaf'
+
+        result = JsonTransmuter.transmute_to(root, to_string=False)
+        model = JsonTransmuter.transmute_from(result, TreeNode)
+
+        names = []
+        node = model
+        while getattr(node, 'children', None):
+            names.append(node.name)
+            node = node.children[0]
+
+        expect(names).to.equal([str(idx) for idx in range(depth)])
+        expect(node.name).to.equal('leaf')
+
+    def transmute_to_keeps_list_order_of_child_mappings(self):
+        mapping = TestListChildMapping()
+        mapping.children = [TestMappedModel(), None, TestMappedModel()]
+        mapping.children[0].test = 'first'
+        mapping.children[2].test = 'last'
+
+        result = JsonTransmuter.transmute_to(mapping, to_string=False)
+
+        expect(result['children']).to.equal(
+            [{'test': 'first'}, None, {'test': 'last'}]
+        )
+
+    def caches_model_plans(self):
+        plan = JsonTransmuter.get_model_plan(TestChildMapping)
+
+        expect(JsonTransmuter.get_model_plan(TestChildMapping)).to.equal(plan)
+        expect(plan[0][0]).to.equal('child')
+
+    def clear_model_plans_picks_up_mapping_changes(self):
+        class ChangingMapping(JsonMappedModel):
+            __mapping__ = {
+                'test': Attr('test', str),
+            }
+
+        JsonTransmuter.transmute_from({'test': 'a'}, ChangingMapping)
+        ChangingMapping.__mapping__ = {'other': Attr('test', str)}
+        JsonTransmuter.clear_model_plans(ChangingMapping)
+
+        result = JsonTransmuter.transmute_from({'other': 'b'},
+                                               ChangingMapping)
+
+        expect(result.test).to.equal('b')
+
+    def clear_model_plans_picks_up_fingerprint_changes(self):
+        class ChangingChild(JsonMappedModel):
+            __mapping__ = {
+                'b': Attr('b', int),
+            }
+
+        class ChangingParent(JsonMappedModel):
+            __mapping__ = {
+                'child': Attr('child', ChangingChild),
+            }
+
+        model = ChangingParent()
+        model.child = ChangingChild()
+        model.child.b = 1
+
+        before = JsonTransmuter.transmute_to(model, compact=True,
+                                             to_string=False)
+        paths = get_key_paths(ChangingParent)
+
+        ChangingChild.__mapping__ = {
+            'a': Attr('a', int),
+            'b': Attr('b', int),
+        }
+        JsonTransmuter.clear_model_plans(ChangingChild)
+
+        after = JsonTransmuter.transmute_to(model, compact=True,
+                                            to_string=False)
+
+        expect(after[0]).not_to.equal(before[0])
+        expect(after[0]).to.equal(get_mapping_fingerprint(ChangingParent))
+        expect(get_key_paths(ChangingParent)).not_to.equal(paths)
+
+    def transmute_from_with_fast_construction(self):
+        calls = []
+
+        class FastChild(JsonMappedModel):
+            __fast_construct__ = True
+            __mapping__ = {
+                'test': Attr('test', str),
+            }
+
+            def __init__(self):
+                calls.append('child init')
+
+            def __post_decode__(self):
+                calls.append('child ' + self.test)
+
+        class FastParent(JsonMappedModel):
+            __fast_construct__ = True
+            __mapping__ = {
+                'child': Attr('child', FastChild),
+                'children': Attr('children', [FastChild]),
+            }
+
+            def __post_decode__(self):
+                calls.append('parent')
+
+        result = JsonTransmuter.transmute_from(
+            {
+                'child': {'test': 'a'},
+                'children': [{'test': 'b'}, {'test': 'c'}],
+            },
+            FastParent
+        )
+
+        expect(result.child.test).to.equal('a')
+        expect(len(result.children)).to.equal(2)
+        expect(calls[-1]).to.equal('parent')
+        expect('child init').not_to.be_in(calls)
+        expect(sorted(calls[:-1])).to.equal(['child a', 'child b', 'child c'])
+
+    def transmute_from_with_fast_construction_and_slots(self):
+        class SlotsModel(JsonMappedModel):
+            __slots__ = ('test', 'other')
+            __fast_construct__ = True
+            __mapping__ = {
+                'test': Attr('test', str),
+                'other': Attr('other', int),
+            }
+
+        result = JsonTransmuter.transmute_from(
+            '{"test": "bam", "other": 1}',
+            SlotsModel
+        )
+
+        expect(result.test).to.equal('bam')
+        expect(result.other).to.equal(1)
+
+    if numpy:
+        def transmute_to_and_from_supports_ndarrays(self):
+            class ArrayMappedModel(JsonMappedModel):
+                __mapping__ = {
+                    'values': Attr('values', ndarray_type('float32')),
+                    'any': Attr('any', numpy.ndarray),
+                }
+
+            result = JsonTransmuter.transmute_from(
+                '{"values": [1, "2.5", 3], "any": [1, 2]}',
+                ArrayMappedModel
+            )
+
+            expect(result.values.dtype).to.equal(numpy.dtype('float32'))
+            expect(result.values.tolist()).to.equal([1.0, 2.5, 3.0])
+            expect(result.any.tolist()).to.equal([1, 2])
+
+            serialized = JsonTransmuter.transmute_to(result, to_string=False)
+            expect(serialized['values']).to.equal([1.0, 2.5, 3.0])
+            expect(serialized['any']).to.equal([1, 2])
+
+    def transmute_to_and_from_in_compact_mode(self):
+        mapping = TestListChildMapping()
+        mapping.children = [TestMappedModel(), TestMappedModel()]
+        mapping.children[0].test = 'first'
+
+        result = JsonTransmuter.transmute_to(
+            mapping,
+            to_string=False,
+            compact=True
+        )
+
+        expect(result[0]).to.equal(
+            get_mapping_fingerprint(TestListChildMapping)
+        )
+        expect(result[1]).to.equal([[['first'], [None]]])
+
+        model = JsonTransmuter.transmute_from(
+            json.dumps(result),
+            TestListChildMapping,
+            compact=True
+        )
+
+        expect(model.children[0].test).to.equal('first')
+        expect(hasattr(model.children[1], 'test')).to.be_false()
+
+    def transmute_to_in_compact_mode_orders_by_key(self):
+        class OrderedModel(JsonMappedModel):
+            __mapping__ = {
+                'b': Attr('b', int),
+                'a': Attr('a', int),
+                'c': Attr('c', TestMappedModel),
+            }
+
+        model = OrderedModel()
+        model.a = 1
+        model.b = 2
+
+        result = JsonTransmuter.transmute_to(model, compact=True)
+
+        expect(json.loads(result)[1]).to.equal([1, 2, None])
+
+    def transmute_from_in_compact_mode_rejects_other_mappings(self):
+        data = JsonTransmuter.transmute_to(
+            TestChildMapping(),
+            compact=True
+        )
+
+        expect(
+            functools.partial(JsonTransmuter.transmute_from, compact=True),
+            [data, TestListChildMapping]
+        ).to.raise_a(SchemaMismatchError)
+
+    def mapping_fingerprints_follow_nested_mappings(self):
+        class Node(JsonMappedModel):
+            pass
+
+        Node.__mapping__ = {
+            'children': Attr('children', [Node]),
+        }
+
+        class OtherNode(JsonMappedModel):
+            pass
+
+        OtherNode.__mapping__ = {
+            'children': Attr('children', [OtherNode]),
+        }
+
+        expect(get_mapping_fingerprint(Node)).to.equal(
+            get_mapping_fingerprint(OtherNode)
+        )
+        expect(get_mapping_fingerprint(TestChildMapping)).not_to.equal(
+            get_mapping_fingerprint(TestListChildMapping)
+        )
+
+    def mapping_fingerprints_support_deep_nesting(self):
+        model_type = None
+        for _ in range(2000):
+            model_type = type('Nested', (JsonMappedModel,), {
+                '__mapping__': {
+                    'a': Attr('a', model_type or int),
+                    'b': Attr('b', model_type or str),
+                },
+            })
+
+        expect(len(get_mapping_fingerprint(model_type))).to.equal(16)
+
+    def mapping_fingerprints_of_cycles_are_order_independent(self):
+        def create_models():
+            class Left(JsonMappedModel):
+                pass
+
+            class Right(JsonMappedModel):
+                __mapping__ = {
+                    'left': Attr('left', [Left]),
+                }
+
+            class Outer(JsonMappedModel):
+                __mapping__ = {
+                    'left': Attr('left', Left),
+                    'right': Attr('right', Right),
+                }
+
+            Left.__mapping__ = {
+                'right': Attr('right', Right),
+                'count': Attr('count', int),
+            }
+            return Left, Right, Outer
+
+        first = [get_mapping_fingerprint(model_type)
+                 for model_type in create_models()]
+        second = [get_mapping_fingerprint(model_type)
+                  for model_type in reversed(create_models())]
+
+        expect(first).to.equal(list(reversed(second)))
+
+
+class CustomType(object):
+    def __init__(self, something):
+        self.something = something
+
+
+class CustomDefinition(ExpandedType):
+    cls = CustomType
+
+    @classmethod
+    def serialize(cls, value):
+        return value.something
+
+    @classmethod
+    def deserialize(cls, attr_type, value):
+        return attr_type(value)
+
+
+class LaterType(object):
+    pass
+
+
+class LaterDefinition(ExpandedType):
+    cls = LaterType
+
+    @classmethod
+    def serialize(cls, value):
+        return None
+
+    @classmethod
+    def deserialize(cls, attr_type, value):
+        return attr_type()
+
+
+class CustomMappedModel(JsonMappedModel):
+    __mapping__ = {
+        'test': Attr('test', CustomType),
+    }
+
+
+class ScopedTypeRegistries(Spec):
+    def transmuter_registry_is_isolated(self):
+        class TenantTransmuter(JsonTransmuter):
+            __type_registry__ = TYPE_REGISTRY.derive()
+
+        TenantTransmuter.__type_registry__.register(CustomDefinition)
+
+        model = CustomMappedModel()
+        model.test = CustomType('thing')
+
+        expect(TenantTransmuter.transmute_to(model)).to.equal(
+            '{"test": "thing"}'
+        )
+        expect(JsonTransmuter.transmute_to(model)).to.equal('{}')
+
+        result = TenantTransmuter.transmute_from(
+            '{"test": "thing"}',
+            CustomMappedModel
+        )
+        expect(result.test.something).to.equal('thing')
+
+    def copied_registry_keeps_the_default_types(self):
+        registry = TYPE_REGISTRY.copy()
+
+        expect(registry.snapshot().lookup(uuid.UUID)).not_to.be_none()
+
+    def derived_registry_keeps_types_registered_later(self):
+        registry = TYPE_REGISTRY.derive()
+        registry.register(CustomDefinition)
+
+        alchemize.register_type(LaterDefinition)
+        try:
+            snapshot = registry.snapshot()
+            expect(snapshot.lookup(LaterType)).to.equal(LaterDefinition)
+            expect(snapshot.lookup(CustomType)).to.equal(CustomDefinition)
+            expect(snapshot.lookup(uuid.UUID)).not_to.be_none()
+            expect(TYPE_REGISTRY.snapshot().lookup(CustomType)).to.be_none()
+        finally:
+            alchemize.remove_type(LaterDefinition)
+
+        expect(registry.snapshot().lookup(LaterType)).to.be_none()
+
+    def expanded_types_is_a_read_only_view_of_the_registry(self):
+        expect(list(EXPANDED_TYPES)).to.equal(list(TYPE_REGISTRY.types))
+
+        alchemize.register_type(LaterDefinition)
+        try:
+            expect(LaterDefinition).to.be_in(EXPANDED_TYPES)
+        finally:
+            alchemize.remove_type(LaterDefinition)
+
+        expect(hasattr(EXPANDED_TYPES, 'append')).to.be_false()
+
+    def snapshots_are_not_affected_by_registration(self):
+        registry = TypeRegistry()
+        snapshot = registry.snapshot()
+
+        registry.register(CustomDefinition)
+
+        expect(snapshot.lookup(CustomType)).to.be_none()
+        expect(registry.snapshot().lookup(CustomType)).to.equal(
+            CustomDefinition
+        )
+
+        registry.remove(CustomDefinition)
+        expect(registry.types).to.equal(())
+
+    def snapshot_lookups_handle_types_and_instances(self):
+        snapshot = TypeSnapshot([CustomDefinition])
+
+        expect(snapshot.lookup(CustomType)).to.equal(CustomDefinition)
+        expect(snapshot.lookup(CustomType('a'))).to.equal(CustomDefinition)
+        expect(snapshot.lookup(CustomDefinition)).to.be_none()
+
+
+class ClickEvent(JsonMappedModel):
+    __mapping__ = {
+        'x': Attr('x', int),
+    }
+
+
+class ViewEvent(JsonMappedModel):
+    __mapping__ = {
+        'type': Attr('event_type', str),
+        'page': Attr('page', str),
+    }
+
+
+EVENT_UNION = TaggedUnion('type', {'click': ClickEvent, 'view': ViewEvent})
+
+
+class EventsModel(JsonMappedModel):
+    __mapping__ = {
+        'event': Attr('event', EVENT_UNION),
+        'events': Attr('events', [EVENT_UNION]),
+    }
+
+
+class TransmutingTaggedUnions(Spec):
+    def before_each(self):
+        self.data = {
+            'event': {'type': 'click', 'x': 1},
+            'events': [
+                {'type': 'view', 'page': 'home'},
+                {'type': 'click', 'x': 2},
+            ],
+        }
+
+    def transmute_from_dispatches_on_the_discriminator(self):
+        model = JsonTransmuter.transmute_from(self.data, EventsModel)
+
+        expect(model.event).to.be_an_instance_of(ClickEvent)
+        expect(model.event.x).to.equal(1)
+        expect(model.events[0]).to.be_an_instance_of(ViewEvent)
+        expect(model.events[0].event_type).to.equal('view')
+        expect(model.events[1].x).to.equal(2)
+
+    def transmute_from_raises_for_unknown_discriminators(self):
+        self.data['events'].append({'type': 'unknown'})
+
+        expect(JsonTransmuter.transmute_from, [self.data, EventsModel]).to \
+            .raise_a(AlchemizeError)
+
+        self.data['events'].pop()
+        self.data['event'] = {'type': 'unknown'}
+
+        expect(JsonTransmuter.transmute_from, [self.data, EventsModel]).to \
+            .raise_a(AlchemizeError)
+
+    def transmute_from_decodes_unknown_discriminators_of_lenient_unions(self):
+        union = TaggedUnion('type', {'click': ClickEvent}, strict=False)
+        model_type = type('LenientEventsModel', (JsonMappedModel,), {
+            '__mapping__': {
+                'event': Attr('event', union),
+                'events': Attr('events', [union]),
+            },
+        })
+        data = {
+            'event': {'type': 'unknown'},
+            'events': [{'type': 'unknown'}, {'type': 'click', 'x': 1}],
+        }
+
+        model = JsonTransmuter.transmute_from(data, model_type)
+
+        expect(model.event).to.be_none()
+        expect(model.events[0]).to.be_none()
+        expect(model.events[1].x).to.equal(1)
+        expect(JsonTransmuter.validate(data, model_type)).to.equal([])
+
+    def transmute_to_adds_the_discriminator(self):
+        model = JsonTransmuter.transmute_from(self.data, EventsModel)
+
+        result = JsonTransmuter.transmute_to(model, to_string=False)
+
+        expect(result['event']).to.equal({'type': 'click', 'x': 1})
+        expect(result['events'][:2]).to.equal(self.data['events'][:2])
+
+    def transmute_to_and_from_in_compact_mode(self):
+        model = JsonTransmuter.transmute_from(self.data, EventsModel)
+
+        result = JsonTransmuter.transmute_to(model, compact=True)
+        model = JsonTransmuter.transmute_from(result, EventsModel,
+                                              compact=True)
+
+        expect(model.event.x).to.equal(1)
+        expect(model.events[0].page).to.equal('home')
+
+    def transmute_to_raises_for_types_outside_of_the_union(self):
+        model = EventsModel()
+        model.event = TestMappedModel()
+
+        expect(JsonTransmuter.transmute_to, [model]).to.raise_a(
+            UnsupportedMappedModelError
+        )
+
+
+class DefaultsModel(JsonMappedModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+        'retries': Attr('retries', int),
+        'enabled': Attr('enabled', bool),
+        'tags': Attr('tags', [str]),
+        'child': Attr('child', TestChildMapping),
+    }
+
+    name = None
+    retries = 3
+    enabled = True
+    tags = []
+
+    @property
+    def child(self):
+        return getattr(self, '_child', None)
+
+    @child.setter
+    def child(self, value):
+        self._child = value
+
+
+class TransmutingWithOmittedDefaults(Spec):
+    def omits_values_equal_to_the_class_defaults(self):
+        model = DefaultsModel()
+        model.name = 'thing'
+        model.tags = []
+
+        result = JsonTransmuter.transmute_to(
+            model,
+            to_string=False,
+            assign_all=True,
+            omit_defaults=True
+        )
+
+        expect(result).to.equal({'name': 'thing', 'child': None})
+
+    def keeps_values_that_differ_from_the_class_defaults(self):
+        model = DefaultsModel()
+        model.retries = 5
+        model.enabled = 1
+        model.tags = ['a']
+
+        result = JsonTransmuter.transmute_to(
+            model,
+            to_string=False,
+            omit_defaults=True
+        )
+
+        expect(result).to.equal({'retries': 5, 'enabled': 1, 'tags': ['a']})
+
+    def round_trips_omitted_defaults(self):
+        model = DefaultsModel()
+        model.retries = 3
+
+        result = JsonTransmuter.transmute_to(model, omit_defaults=True)
+        model = JsonTransmuter.transmute_from(result, DefaultsModel)
+
+        expect(result).to.equal('{}')
+        expect(model.retries).to.equal(3)
+        expect(model.enabled).to.be_true()
+
+    def leaves_gaps_for_omitted_defaults_in_compact_mode(self):
+        model = DefaultsModel()
+        model.name = 'thing'
+
+        result = JsonTransmuter.transmute_to(
+            model,
+            to_string=False,
+            compact=True,
+            omit_defaults=True
+        )
+        model = JsonTransmuter.transmute_from(result, DefaultsModel,
+                                              compact=True)
+
+        expect(result[1]).to.equal([None, None, 'thing', None, None])
+        expect(model.retries).to.equal(3)
+
+
+class MergeChild(JsonMappedModel):
+    __mapping__ = {
+        'value': Attr('value', str),
+    }
+
+
+class MergeItem(JsonMappedModel):
+    __merge_key__ = 'id'
+    __mapping__ = {
+        'id': Attr('item_id', int),
+        'value': Attr('value', str),
+    }
+
+
+class MergeModel(JsonMappedModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+        'required': Attr('required', str, required=True),
+        'child': Attr('child', MergeChild),
+        'children': Attr('children', [MergeChild]),
+        'items': Attr('items', [MergeItem]),
+    }
+
+
+class TransmutingIntoExistingModels(Spec):
+    def before_each(self):
+        self.model = JsonTransmuter.transmute_from({
+            'name': 'name',
+            'required': 'thing',
+            'child': {'value': 'child'},
+            'children': [{'value': 'a'}, {'value': 'b'}],
+            'items': [{'id': 1, 'value': 'a'}, {'id': 2, 'value': 'b'}],
+        }, MergeModel)
+
+    def only_updates_attributes_in_the_data(self):
+        result = JsonTransmuter.transmute_into('{"name": "other"}',
+                                               self.model)
+
+        expect(result is self.model).to.be_true()
+        expect(result.name).to.equal('other')
+        expect(result.required).to.equal('thing')
+        expect(result.child.value).to.equal('child')
+
+    def updates_existing_child_models_in_place(self):
+        child = self.model.child
+
+        JsonTransmuter.transmute_into({'child': {'value': 'new'}},
+                                      self.model)
+
+        expect(self.model.child is child).to.be_true()
+        expect(child.value).to.equal('new')
+
+    def reconciles_lists_by_position(self):
+        children = self.model.children
+        first = children[0]
+
+        JsonTransmuter.transmute_into({
+            'children': [{'value': 'c'}, None, {'value': 'd'}],
+        }, self.model)
+
+        expect(self.model.children is children).to.be_true()
+        expect(children[0] is first).to.be_true()
+        expect(children[0].value).to.equal('c')
+        expect(children[1]).to.be_none()
+        expect(children[2].value).to.equal('d')
+
+    def reconciles_lists_by_merge_key(self):
+        first, second = self.model.items
+
+        JsonTransmuter.transmute_into({
+            'items': [{'id': 2, 'value': 'c'}, {'id': 3, 'value': 'd'}],
+        }, self.model)
+
+        items = self.model.items
+        expect(len(items)).to.equal(2)
+        expect(items[0] is second).to.be_true()
+        expect(second.value).to.equal('c')
+        expect(items[1] is first).to.be_false()
+        expect(items[1].item_id).to.equal(3)
+
+
+class ValidatedChild(JsonMappedModel):
+    __mapping__ = {
+        'name': Attr('name', str, required=True),
+    }
+
+
+class ValidatedModel(JsonMappedModel):
+    __mapping__ = {
+        'id': Attr('model_id', int, required=True),
+        'uuid': Attr('uuid', uuid.UUID),
+        'scores': Attr('scores', [float]),
+        'child': Attr('child', ValidatedChild),
+        'children': Attr('children', [ValidatedChild]),
+        'event': Attr('event', EVENT_UNION),
+    }
+
+
+class ValidatingJsonContent(Spec):
+    def returns_nothing_for_valid_data(self):
+        issues = JsonTransmuter.validate(json.dumps({
+            'id': '1',
+            'uuid': str(uuid.uuid4()),
+            'scores': [1, 2.5],
+            'child': {'name': 'child'},
+            'children': [{'name': 'a'}, None],
+            'event': {'type': 'click', 'x': 1},
+        }), ValidatedModel)
+
+        expect(issues).to.equal([])
+
+    def returns_all_issues_with_their_key_paths(self):
+        issues = JsonTransmuter.validate({
+            'uuid': 'not-a-uuid',
+            'scores': [1, 'bad'],
+            'child': 'not-an-object',
+            'children': [{'name': 'a'}, {}],
+            'event': {'type': 'other'},
+        }, ValidatedModel)
+
+        expect([issue.path for issue in issues]).to.equal([
+            '/child',
+            '/children/1/name',
+            '/event/type',
+            '/id',
+            '/scores/1',
+            '/uuid',
+        ])
+
+    def reports_list_shapes(self):
+        issues = JsonTransmuter.validate({'id': 1, 'children': {}},
+                                         ValidatedModel)
+
+        expect(issues).to.equal([('/children', 'Expected a list')])
+
+    def reports_invalid_json(self):
+        issues = JsonTransmuter.validate('{', ValidatedModel)
+
+        expect(len(issues)).to.equal(1)
+        expect(issues[0].path).to.equal('')
+
+
+BUILTIN_TYPES_DATASET = {
+    'datetime': {
+        'attr_type': datetime.datetime,
+        'attr_data': '2020-01-02T03:04:05.123456+00:00',
+        'attr_value': datetime.datetime(2020, 1, 2, 3, 4, 5, 123456,
+                                        UTC),
+    },
+    'naive_datetime': {
+        'attr_type': datetime.datetime,
+        'attr_data': '2020-01-02T03:04:05',
+        'attr_value': datetime.datetime(2020, 1, 2, 3, 4, 5),
+    },
+    'date': {
+        'attr_type': datetime.date,
+        'attr_data': '2020-01-02',
+        'attr_value': datetime.date(2020, 1, 2),
+    },
+    'time': {
+        'attr_type': datetime.time,
+        'attr_data': '03:04:05',
+        'attr_value': datetime.time(3, 4, 5),
+    },
+    'decimal': {
+        'attr_type': decimal.Decimal,
+        'attr_data': '1.10',
+        'attr_value': decimal.Decimal('1.10'),
+    },
+}
+
+
+class TransmutingBuiltinTypes(Spec):
+    class TransmutesBuiltinTypes(DataSpec):
+        DATASET = BUILTIN_TYPES_DATASET
+
+        def round_trips_type(self, attr_type, attr_data, attr_value):
+            class FlexMapping(JsonMappedModel):
+                __mapping__ = {
+                    'test': Attr('test', attr_type)
+                }
+
+            result = JsonTransmuter.transmute_from({'test': attr_data},
+                                                   FlexMapping)
+            data = JsonTransmuter.transmute_to(result, to_string=False)
+
+            expect(result.test).to.equal(attr_value)
+            expect(data).to.equal({'test': attr_data})
+
+    def parses_zulu_and_extended_timestamps(self):
+        parse = DateTimeType.parse_iso
+
+        expect(parse('2020-01-02T03:04:05Z')).to.equal(
+            datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=UTC)
+        )
+        expect(parse('2020-01-02T03:04:05.1234567-0130')).to.equal(
+            datetime.datetime(2020, 1, 2, 4, 34, 5, 123456, tzinfo=UTC)
+        )
+
+    def caches_parsed_values(self):
+        first = DateTimeType.deserialize(datetime.datetime,
+                                         '2021-05-06T07:08:09')
+        second = DateTimeType.deserialize(datetime.datetime,
+                                          '2021-05-06T07:08:09')
+
+        expect(first is second).to.be_true()
+
+    def raises_value_errors_for_values_that_are_not_strings(self):
+        for value in (['2021-05-06'], {'date': '2021-05-06'}, 20210506):
+            expect(DateType.deserialize, [datetime.date, value]).to.raise_a(
+                ValueError
+            )
+
+    def decodes_decimal_floats_by_their_representation(self):
+        result = DecimalType.deserialize(decimal.Decimal, 0.1)
+
+        expect(result).to.equal(decimal.Decimal('0.1'))
+
+    def registered_types_take_precedence(self):
+        class DateFormat(DateType):
+            format = '%d/%m/%Y'
+
+        class FormatMapping(JsonMappedModel):
+            __mapping__ = {
+                'date': Attr('date', datetime.date),
+            }
+
+        class FormatTransmuter(JsonTransmuter):
+            __type_registry__ = TYPE_REGISTRY.derive()
+
+        FormatTransmuter.__type_registry__.register(DateFormat)
+
+        result = FormatTransmuter.transmute_from({'date': '02/01/2020'},
+                                                 FormatMapping)
+        data = FormatTransmuter.transmute_to(result, to_string=False)
+
+        expect(result.date).to.equal(datetime.date(2020, 1, 2))
+        expect(data).to.equal({'date': '02/01/2020'})
+
+
+class ContainersModel(JsonMappedModel):
+    __mapping__ = {
+        'by_name': Attr('by_name', {str: TestMappedModel}),
+        'counts': Attr('counts', {str: int}),
+        'ids': Attr('ids', {str: uuid.UUID}),
+        'grid': Attr('grid', [[TestMappedModel]]),
+        'events': Attr('events', {str: [EVENT_UNION]}),
+    }
+
+
+class TransmutingContainers(Spec):
+    def before_each(self):
+        self.data = {
+            'by_name': {'a': {'test': 'first'}, 'b': None},
+            'counts': {'a': 1, 'b': 2},
+            'ids': {'a': '00000000-0000-0000-0000-000000000001'},
+            'grid': [[{'test': 'x'}, {'test': 'y'}], [], [{'test': 'z'}]],
+            'events': {'home': [{'type': 'view', 'page': 'home'}]},
+        }
+
+    def transmute_from_with_containers(self):
+        model = JsonTransmuter.transmute_from(self.data, ContainersModel)
+
+        expect(model.by_name['a']).to.be_an_instance_of(TestMappedModel)
+        expect(model.by_name['a'].test).to.equal('first')
+        expect(model.by_name['b']).to.be_none()
+        expect(model.counts).to.equal({'a': 1, 'b': 2})
+        expect(model.ids['a']).to.equal(uuid.UUID(int=1))
+        expect(model.grid[0][1].test).to.equal('y')
+        expect(model.grid[1]).to.equal([])
+        expect(model.grid[2][0].test).to.equal('z')
+        expect(model.events['home'][0]).to.be_an_instance_of(ViewEvent)
+
+    def transmute_to_with_containers(self):
+        model = JsonTransmuter.transmute_from(self.data, ContainersModel)
+
+        result = JsonTransmuter.transmute_to(model, to_string=False)
+
+        expect(result).to.equal(self.data)
+
+    def transmute_to_and_from_in_compact_mode(self):
+        model = JsonTransmuter.transmute_from(self.data, ContainersModel)
+
+        result = JsonTransmuter.transmute_to(model, compact=True)
+        model = JsonTransmuter.transmute_from(result, ContainersModel,
+                                              compact=True)
+
+        expect(model.by_name['a'].test).to.equal('first')
+        expect(model.grid[2][0].test).to.equal('z')
+        expect(model.events['home'][0].page).to.equal('home')
+
+    def transmute_from_can_coerce_container_values(self):
+        model = JsonTransmuter.transmute_from(
+            {'counts': {'a': '1'}},
+            ContainersModel,
+            coerce_values=True
+        )
+
+        expect(model.counts).to.equal({'a': 1})
+
+    def validate_reports_container_paths(self):
+        issues = JsonTransmuter.validate({
+            'by_name': {'a': []},
+            'counts': {'a': 'one'},
+            'grid': [{'test': 'x'}],
+        }, ContainersModel)
+
+        expect([issue.path for issue in issues]).to.equal(
+            ['/by_name/a', '/counts/a', '/grid/0']
+        )
+
+
+class RawJsonModel(JsonMappedModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+        'payload': Attr('payload', RawJson),
+        'payloads': Attr('payloads', {str: RawJson}),
+    }
+
+
+class TransmutingRawJson(Spec):
+    def transmute_to_splices_the_text_verbatim(self):
+        model = RawJsonModel()
+        model.name = 'name'
+        model.payload = RawJson('{"b":  [1, 2],"a": null}')
+
+        result = JsonTransmuter.transmute_to(model)
+
+        expect(result).to.contain('"payload": {"b":  [1, 2],"a": null}')
+        expect(json.loads(result)['name']).to.equal('name')
+
+    def transmute_to_and_from_keeps_the_document(self):
+        data = {'payload': {'a': [1, {'b': 'c'}]}, 'payloads': {'x': [1]}}
+
+        model = JsonTransmuter.transmute_from(json.dumps(data), RawJsonModel)
+        result = JsonTransmuter.transmute_to(model)
+
+        expect(model.payload).to.be_an_instance_of(RawJson)
+        expect(model.payload.value).to.equal(data['payload'])
+        expect(json.loads(result)).to.equal(data)
+        expect(JsonTransmuter.transmute_to(model, to_string=False)).to.equal(
+            data
+        )
+
+    def transmute_to_and_from_in_compact_mode(self):
+        model = RawJsonModel()
+        model.payload = RawJson('[1,2]')
+
+        result = JsonTransmuter.transmute_to(model, compact=True)
+        model = JsonTransmuter.transmute_from(result, RawJsonModel,
+                                              compact=True)
+
+        expect(model.payload).to.equal(RawJson('[1, 2]'))
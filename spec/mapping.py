@@ -1,6 +1,21 @@
+import copy
+import pickle
+
 from specter import Spec, expect
-from alchemize import Attr, JsonMappedModel
-from alchemize.mapping import get_key_paths, get_normalized_map
+from alchemize import Attr, JsonMappedModel, TaggedUnion
+from alchemize.mapping import (
+    FrozenDict,
+    FrozenList,
+    _restore_model,
+    clone,
+    freeze,
+    get_key_path_index,
+    get_key_paths,
+    get_normalized_map,
+    get_path,
+    set_path,
+)
+from alchemize.transmute import SchemaMismatchError
 
 
 class TestModel(JsonMappedModel):
@@ -30,3 +45,318 @@ class TestMapping(Spec):
     def can_have_handle_model_being_none(self):
         ret = get_normalized_map(None)
         expect(ret).to.equal({})
+
+    def can_get_key_paths_with_a_prefix(self):
+        key_list = get_key_paths(TestModel, sep='.', prefix='root')
+
+        expect(sorted(key_list)).to.equal(['root.old_style', 'root.thing'])
+
+    def can_get_key_paths_of_recursive_mappings(self):
+        class Node(JsonMappedModel):
+            pass
+
+        Node.__mapping__ = {
+            'name': Attr('name', str),
+            'child': Attr('child', Node),
+            'children': Attr('children', [Node]),
+        }
+
+        expect(sorted(get_key_paths(Node))).to.equal([
+            '/child/child',
+            '/child/children',
+            '/child/name',
+            '/children/child',
+            '/children/children',
+            '/children/name',
+            '/name',
+        ])
+
+        model = Node()
+        model.child = Node()
+        model.child.name = 'child'
+
+        expect(get_path(model, '/child/name')).to.equal('child')
+        expect(get_path(model, '/child/child')).to.be_none()
+
+    def can_get_key_path_index(self):
+        index = get_key_path_index(SampleMapping)
+
+        expect(index).to.equal(get_key_path_index(SampleMapping()))
+        expect([attr.name for attr in index['/model/thing']]).to.equal(
+            ['model', 'thing']
+        )
+
+    def can_get_path(self):
+        model = SampleMapping()
+        model.model = TestModel()
+        model.model.thing = 'bam'
+        model.model_list = [TestModel(), TestModel()]
+        model.model_list[0].thing = 'first'
+
+        expect(get_path(model, '/model/thing')).to.equal('bam')
+        expect(get_path(model, '/top_lvl', default='')).to.equal('')
+        expect(get_path(model, '/model_list/thing')).to.equal(
+            ['first', None]
+        )
+
+    def can_set_path(self):
+        model = SampleMapping()
+        model.model_list = [TestModel(), TestModel()]
+
+        set_path(model, '/model/thing', 'bam')
+        set_path(model, '/model_list/thing', 'item')
+
+        expect(model.model.thing).to.equal('bam')
+        expect(get_path(model, '/model_list/thing')).to.equal(
+            ['item', 'item']
+        )
+
+    def get_path_raises_for_unknown_paths(self):
+        expect(get_path, [SampleMapping(), '/nope']).to.raise_a(KeyError)
+
+    def can_get_key_paths_of_tagged_unions(self):
+        class OtherModel(JsonMappedModel):
+            __mapping__ = {
+                'thing': Attr('thing', str),
+                'other': Attr('other', int),
+            }
+
+        class UnionMapping(JsonMappedModel):
+            __mapping__ = {
+                'item': Attr('item', TaggedUnion('type', {
+                    'a': TestModel,
+                    'b': OtherModel,
+                })),
+            }
+
+        expect(sorted(get_key_paths(UnionMapping))).to.equal(
+            ['/item/old_style', '/item/other', '/item/thing']
+        )
+
+
+class FastSampleMapping(JsonMappedModel):
+    __fast_construct__ = True
+    __mapping__ = {
+        'name': Attr('name', str),
+        'tags': Attr('tags', [str]),
+        'meta': Attr('meta', dict),
+        'child': Attr('child', TestModel),
+        'children': Attr('children', [TestModel]),
+    }
+
+    def __post_decode__(self):
+        self.post_decoded = True
+
+
+class CloningModels(Spec):
+    def before_each(self):
+        self.child = TestModel()
+        self.child.thing = 'child'
+        self.model = FastSampleMapping()
+        self.model.name = 'name'
+        self.model.tags = ['a', 'b']
+        self.model.meta = {'key': ['value']}
+        self.model.child = self.child
+        self.model.children = [self.child, None]
+        self.model.unmapped = True
+
+    def copies_only_the_mapped_attributes(self):
+        result = clone(self.model)
+
+        expect(result is self.model).to.be_false()
+        expect(result.name).to.equal('name')
+        expect(hasattr(result, 'unmapped')).to.be_false()
+        expect(result.post_decoded).to.be_true()
+
+    def shares_child_models_in_a_shallow_clone(self):
+        result = clone(self.model)
+
+        expect(result.tags).to.equal(self.model.tags)
+        expect(result.tags is self.model.tags).to.be_false()
+        expect(result.meta['key'] is self.model.meta['key']).to.be_true()
+        expect(result.child is self.child).to.be_true()
+        expect(result.children is self.model.children).to.be_false()
+        expect(result.children[0] is self.child).to.be_true()
+
+    def copies_child_models_in_a_deep_clone(self):
+        result = clone(self.model, deep=True)
+
+        expect(result.meta).to.equal(self.model.meta)
+        expect(result.meta['key'] is self.model.meta['key']).to.be_false()
+        expect(result.child is self.child).to.be_false()
+        expect(result.child.thing).to.equal('child')
+        expect(result.children[0].thing).to.equal('child')
+        expect(result.children[1]).to.be_none()
+
+    def shares_frozen_child_models_in_a_deep_clone(self):
+        self.child.__frozen__ = True
+
+        result = clone(self.model, deep=True)
+
+        expect(result.child is self.child).to.be_true()
+
+
+class StatefulMapping(JsonMappedModel):
+    __mapping__ = {
+        'top_lvl': Attr('top_lvl', str),
+        'model_list': Attr('model_list', [TestModel]),
+    }
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['extra'] = 'added'
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.restored = True
+
+
+class PicklingModels(Spec):
+    def before_each(self):
+        self.model = SampleMapping()
+        self.model.top_lvl = 'top'
+        self.model.model_list = [TestModel(), None, TestModel()]
+        self.model.model_list[0].thing = 'first'
+        self.model.unmapped = 'extra'
+
+    def can_round_trip_a_model(self):
+        data = pickle.dumps(self.model, pickle.HIGHEST_PROTOCOL)
+        result = pickle.loads(data)
+
+        expect(result.top_lvl).to.equal('top')
+        expect(result.unmapped).to.equal('extra')
+        expect(hasattr(result, 'model')).to.be_false()
+        expect(result.model_list[0].thing).to.equal('first')
+        expect(result.model_list[1]).to.be_none()
+        expect(hasattr(result.model_list[2], 'thing')).to.be_false()
+
+    def keeps_the_custom_state_of_models(self):
+        model = StatefulMapping()
+        model.top_lvl = 'top'
+        model.model_list = [StatefulMapping()]
+
+        for result in (pickle.loads(pickle.dumps(model)),
+                       copy.deepcopy(model)):
+            expect(result.top_lvl).to.equal('top')
+            expect(result.extra).to.equal('added')
+            expect(result.restored).to.be_true()
+            expect(result.model_list[0].extra).to.equal('added')
+
+    def leaves_out_mapped_attribute_names(self):
+        data = pickle.dumps(self.model, pickle.HIGHEST_PROTOCOL)
+
+        expect(b'top_lvl' in data).to.be_false()
+        expect(b'thing' in data).to.be_false()
+
+    def raises_on_a_different_mapping(self):
+        expect(_restore_model, [SampleMapping, 'other', (), None]).to.raise_a(
+            SchemaMismatchError
+        )
+
+    def shares_values_in_a_shallow_copy(self):
+        result = copy.copy(self.model)
+
+        expect(result.model_list is self.model.model_list).to.be_true()
+        expect(result.unmapped).to.equal('extra')
+
+
+class FreezingModels(Spec):
+    def before_each(self):
+        self.model = SampleMapping()
+        self.model.model = TestModel()
+        self.model.model_list = [TestModel()]
+        freeze(self.model)
+
+    def freezes_the_model_and_its_children(self):
+        expect(self.model.__frozen__).to.be_true()
+        expect(self.model.model.__frozen__).to.be_true()
+        expect(self.model.model_list[0].__frozen__).to.be_true()
+        expect(setattr, [self.model, 'top_lvl', 'a']).to.raise_a(
+            AttributeError
+        )
+        expect(delattr, [self.model, 'model']).to.raise_a(AttributeError)
+
+    def keeps_the_model_type(self):
+        expect(self.model).to.be_an_instance_of(SampleMapping)
+        expect(get_key_paths(self.model)).to.equal(
+            get_key_paths(SampleMapping)
+        )
+
+    def pickles_frozen_models_as_regular_models(self):
+        result = pickle.loads(pickle.dumps(self.model))
+
+        expect(type(result) is SampleMapping).to.be_true()
+        expect(type(result.model_list[0]) is TestModel).to.be_true()
+
+    def freezes_lists_and_dicts(self):
+        model = SampleMapping()
+        model.model_list = [TestModel()]
+        model.top_lvl = {'tags': ['a']}
+        freeze(model)
+
+        expect(model.model_list).to.be_an_instance_of(FrozenList)
+        expect(model.top_lvl).to.be_an_instance_of(FrozenDict)
+        expect(model.model_list.append, [TestModel()]).to.raise_a(TypeError)
+        expect(model.top_lvl['tags'].append, ['b']).to.raise_a(TypeError)
+        expect(model.top_lvl.__setitem__, ['tags', []]).to.raise_a(
+            TypeError
+        )
+
+        result = pickle.loads(pickle.dumps(model))
+        expect(type(result.model_list) is list).to.be_true()
+        expect(type(result.top_lvl) is dict).to.be_true()
+        expect(type(result.top_lvl['tags']) is list).to.be_true()
+
+
+class ContainerMapping(JsonMappedModel):
+    __mapping__ = {
+        'by_name': Attr('by_name', {str: TestModel}),
+        'grid': Attr('grid', [[TestModel]]),
+    }
+
+
+class MappingContainers(Spec):
+    def before_each(self):
+        self.first = TestModel()
+        self.first.thing = 'first'
+        self.second = TestModel()
+        self.second.thing = 'second'
+        self.model = ContainerMapping()
+        self.model.by_name = {'a': self.first, 'b': None}
+        self.model.grid = [[self.first], [self.second]]
+
+    def can_get_key_paths_through_containers(self):
+        key_list = get_key_paths(ContainerMapping)
+
+        expect('/by_name/thing').to.be_in(key_list)
+        expect('/grid/thing').to.be_in(key_list)
+
+    def can_get_paths_through_containers(self):
+        expect(get_path(self.model, '/by_name/thing')).to.equal(
+            {'a': 'first', 'b': None}
+        )
+        expect(get_path(self.model, '/grid/thing')).to.equal(
+            [['first'], ['second']]
+        )
+
+    def can_set_paths_through_containers(self):
+        set_path(self.model, '/grid/thing', 'changed')
+
+        expect(self.first.thing).to.equal('changed')
+        expect(self.second.thing).to.equal('changed')
+
+    def copies_models_of_containers_in_a_deep_clone(self):
+        result = clone(self.model, deep=True)
+
+        expect(result.by_name['a'] is self.first).to.be_false()
+        expect(result.by_name['a'].thing).to.equal('first')
+        expect(result.by_name['b']).to.be_none()
+        expect(result.grid[1][0].thing).to.equal('second')
+        expect(result.grid[1][0] is self.second).to.be_false()
+
+    def freezes_models_of_containers(self):
+        freeze(self.model)
+
+        expect(self.first.__frozen__).to.be_true()
+        expect(self.second.__frozen__).to.be_true()
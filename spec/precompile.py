@@ -0,0 +1,46 @@
+from specter import Spec, expect
+
+from alchemize import Attr, JsonMappedModel, JsonTransmuter
+from alchemize.mapping import MAPPING_FINGERPRINTS
+from alchemize.precompile import precompile_models
+
+
+class TestChildModel(JsonMappedModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+    }
+
+
+class TestParentModel(JsonMappedModel):
+    __mapping__ = {
+        'child': Attr('child', TestChildModel),
+        'children': Attr('children', [TestChildModel]),
+    }
+
+
+def clear_prepared(*models):
+    for model_type in models:
+        JsonTransmuter.get_model_plans().pop(model_type, None)
+        JsonTransmuter.get_model_plans(compact=True).pop(model_type, None)
+        MAPPING_FINGERPRINTS.pop(model_type, None)
+
+
+class PrecompilingModels(Spec):
+    def before_each(self):
+        clear_prepared(TestChildModel, TestParentModel)
+
+    def prepares_all_loaded_models_by_default(self):
+        models = precompile_models()
+
+        expect(TestParentModel).to.be_in(models)
+        expect(TestChildModel).to.be_in(
+            JsonTransmuter.get_model_plans(compact=True)
+        )
+        expect(TestParentModel).to.be_in(MAPPING_FINGERPRINTS)
+
+    def prepares_the_specified_models(self):
+        models = precompile_models(models=[TestParentModel])
+
+        expect(models).to.equal([TestParentModel])
+        expect(TestParentModel).to.be_in(JsonTransmuter.get_model_plans())
+        expect(TestChildModel).not_to.be_in(JsonTransmuter.get_model_plans())
@@ -0,0 +1,52 @@
+import json
+
+from six import StringIO
+from specter import Spec, expect
+
+from alchemize import Attr, JsonMappedModel, JsonTransmuter
+from alchemize.mapping import get_key_paths
+from alchemize.profile import import_object, measure_breakdown, profile
+
+
+class TestChildModel(JsonMappedModel):
+    __mapping__ = {
+        'name': Attr('name', str),
+    }
+
+
+class TestProfiledModel(JsonMappedModel):
+    __mapping__ = {
+        'id': Attr('id', int),
+        'children': Attr('children', [TestChildModel]),
+    }
+
+
+PAYLOAD = json.dumps({'id': 1, 'children': [{'name': 'a'}, {'name': 'b'}]})
+
+
+class ProfilingTransmuters(Spec):
+    def imports_objects_by_dotted_path(self):
+        expect(import_object('alchemize.JsonTransmuter') is JsonTransmuter)\
+            .to.be_true()
+        expect(import_object('alchemize.mapping:get_key_paths') is
+               get_key_paths).to.be_true()
+        expect(import_object, ['JsonTransmuter']).to.raise_a(ImportError)
+
+    def measures_the_time_per_model_and_attribute(self):
+        timings = measure_breakdown(JsonTransmuter, TestProfiledModel,
+                                    PAYLOAD, 'from', 3)
+
+        expect(timings[(TestProfiledModel, 'id')][0]).to.equal(3)
+        expect(timings[(TestChildModel, 'name')][0]).to.equal(6)
+
+    def writes_a_report_of_each_operation(self):
+        out = StringIO()
+
+        profile(TestProfiledModel, PAYLOAD, JsonTransmuter, iterations=2,
+                top=5, out=out)
+
+        report = out.getvalue()
+        expect(report).to.contain('== transmute_from')
+        expect(report).to.contain('== transmute_to')
+        expect(report).to.contain('TestChildModel')
+        expect(report).to.contain('throughput')